@@ -0,0 +1,248 @@
+# alerts.py
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import requests
+
+from metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# 1) RULES  (thresholds from signal_guide.SIGNAL_GUIDE_TEXT)
+# ----------------------------------------------------------
+# source: "level" (raw levels, incl. HYG/LQD and FRED macro),
+#         "zscore" (rolling / macro z-scores) or "stress" (Stress Score)
+# op:     ">" or "<";  hold: consecutive bars before firing;
+# cooldown: minimum time between two alerts of the same rule
+DEFAULT_RULES = [
+    {"name": "HY OAS above 5%", "source": "level", "series": "HY_OAS", "op": ">", "threshold": 5.0},
+    {"name": "NFCI tighter than average", "source": "level", "series": "NFCI", "op": ">", "threshold": 0.0},
+    {"name": "VIX stressed", "source": "zscore", "series": "^VIX", "op": ">", "threshold": 1.0},
+    {"name": "HYG/LQD risk-off", "source": "zscore", "series": "HYG/LQD", "op": "<", "threshold": -1.0,
+     "hold": 2},
+    {"name": "HY OAS stressed", "source": "zscore", "series": "HY_OAS", "op": ">", "threshold": 1.0},
+    {"name": "Stress Score risk-off", "source": "stress", "series": "Stress Score", "op": ">",
+     "threshold": 55.0, "hold": 2},
+    {"name": "Stress Score severe", "source": "stress", "series": "Stress Score", "op": ">",
+     "threshold": 70.0},
+]
+
+DEFAULT_COOLDOWN = "1D"
+
+# JSON file with a list of rules replacing DEFAULT_RULES
+RULES_PATH = os.environ.get("ALERT_RULES")
+
+# Graph node prefixes each source reads from
+SOURCE_NODES = {
+    "level": ("levels:", "fred_levels"),
+    "zscore": ("zscore:", "fred_zscore"),
+    "stress": ("stress_score",),
+}
+
+
+def load_rules(path=RULES_PATH):
+    if not path:
+        return DEFAULT_RULES
+    with open(path) as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------
+# 2) SINKS
+# ----------------------------------------------------------
+class LogSink:
+    def __call__(self, alerts):
+        for a in alerts:
+            log.warning("ALERT %s", format_alert(a))
+
+
+class ListSink:
+    """Keeps every alert in memory (tests, local runs)."""
+
+    def __init__(self):
+        self.alerts = []
+
+    def __call__(self, alerts):
+        self.alerts.extend(alerts)
+
+
+class TelegramSink:
+    """Bot API sendMessage; base_url can point at standin_server.py."""
+
+    def __init__(self, token, chat_id, base_url=None, timeout=10):
+        self.url = f"{(base_url or 'https://api.telegram.org').rstrip('/')}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def __call__(self, alerts):
+        text = "\n".join(format_alert(a) for a in alerts)
+        resp = self._session.post(self.url, json={"chat_id": self.chat_id, "text": text},
+                                  timeout=self.timeout)
+        resp.raise_for_status()
+
+
+def default_sinks():
+    sinks = [LogSink()]
+    token, chat_id = os.environ.get("TELEGRAM_BOT_TOKEN"), os.environ.get("TELEGRAM_CHAT_ID")
+    if token and chat_id:
+        sinks.append(TelegramSink(token, chat_id, os.environ.get("TELEGRAM_BASE_URL")))
+    return sinks
+
+
+def format_alert(a):
+    return (f"{a['rule']}: {a['series']} {a['value']:.2f} {a['op']} {a['threshold']:g} "
+            f"({a['source']}, {pd.Timestamp(a['time']):%Y-%m-%d %H:%M})")
+
+
+# ----------------------------------------------------------
+# 3) COMPILED RULE GROUP (one graph node, one calendar)
+# ----------------------------------------------------------
+class _RuleGroup:
+    """
+    Rules over the columns of one frame as arrays: column positions,
+    signed thresholds, hold counts and cooldowns. A batch of m new rows
+    is one (m x rules) comparison; run lengths carry across refreshes.
+    """
+
+    def __init__(self, node, rules, columns):
+        self.node = node
+        self.rules = rules
+        self.columns = columns
+        self.cols = np.array([columns.get_loc(r["series"]) for r in rules])
+        self.sign = np.array([1.0 if r["op"] == ">" else -1.0 for r in rules])
+        self.level = self.sign * np.array([float(r["threshold"]) for r in rules])
+        self.hold = np.array([int(r.get("hold", 1)) for r in rules])
+        self.cooldown = np.array([pd.Timedelta(r.get("cooldown", DEFAULT_COOLDOWN)).to_timedelta64()
+                                  for r in rules], dtype="m8[ns]")
+
+        self.run = np.zeros(len(rules), dtype="int64")          # consecutive bars past threshold
+        self.last_fired = np.full(len(rules), np.datetime64("1900-01-01", "ns"))
+        self.last_time = None                                   # datetime64 of the last evaluated bar
+
+    def update(self, frame, notify=True):
+        """Evaluate rows after last_time; returns alerts for rules that just fired."""
+        stamps = frame.index.values                             # datetime64, no copy
+        if self.last_time is not None and stamps[-1] <= self.last_time:
+            return []                                           # no new bar
+        k = 0 if self.last_time is None else np.searchsorted(stamps, self.last_time, side="right")
+
+        X = frame.to_numpy(dtype="float64")[k:, self.cols]      # copies the new rows only
+        times = stamps[k:]
+        with np.errstate(invalid="ignore"):
+            past = X * self.sign > self.level                   # NaN -> False
+
+        alerts = []
+        for i in range(len(times)):
+            self.run = np.where(past[i], self.run + 1, 0)
+            fire = (self.run == self.hold) & (times[i] - self.last_fired >= self.cooldown)
+            if fire.any():
+                self.last_fired = np.where(fire, times[i], self.last_fired)
+                if notify:
+                    alerts += [self._alert(j, times[i], X[i, j]) for j in np.flatnonzero(fire)]
+
+        self.last_time = stamps[-1]
+        return alerts
+
+    def state(self):
+        """Rule name -> (run length, last fired), to carry into a recompiled group."""
+        return {r["name"]: (self.run[j], self.last_fired[j]) for j, r in enumerate(self.rules)}
+
+    def restore(self, state, last_time):
+        for j, r in enumerate(self.rules):
+            if r["name"] in state:
+                self.run[j], self.last_fired[j] = state[r["name"]]
+        self.last_time = last_time
+
+    def _alert(self, j, t, value):
+        r = self.rules[j]
+        return {"rule": r["name"], "source": r["source"], "series": r["series"], "op": r["op"],
+                "threshold": float(r["threshold"]), "value": float(value),
+                "time": pd.Timestamp(t).isoformat(), "node": self.node}
+
+
+# ----------------------------------------------------------
+# 4) ENGINE
+# ----------------------------------------------------------
+class AlertEngine:
+    """
+    Declarative threshold rules evaluated on each refresh's graph values
+    (panel_graph node -> frame). Only bars newer than the last evaluated
+    one are checked. A rule fires once when its condition has held for
+    `hold` bars, re-arms when the condition clears, and is muted for
+    `cooldown` after firing. Rules are rebound whenever a node or column
+    appears or disappears; run lengths, cooldowns and the last evaluated
+    bar carry over. A node seen for the first time only primes the state
+    (no alerts for history).
+    """
+
+    def __init__(self, rules=None, sinks=None):
+        self.rules = load_rules() if rules is None else rules
+        self.sinks = default_sinks() if sinks is None else sinks
+        self.groups = {}
+        self.layout = None                  # node -> columns the groups were compiled for
+        self.rule_state = {}                # rule name -> (run, last fired), across recompiles
+        self.node_time = {}                 # node -> last evaluated bar, across recompiles
+        self._lock = threading.Lock()
+
+    def compile(self, values):
+        """Bind each rule to the first graph node holding its series; unbound rules are skipped."""
+        by_node, missing = {}, []
+        for rule in self.rules:
+            node = next((name for name, v in values.items()
+                         if name.startswith(SOURCE_NODES[rule["source"]])
+                         and isinstance(v, pd.DataFrame) and rule["series"] in v.columns), None)
+            if node is None:
+                missing.append(rule["name"])
+            else:
+                by_node.setdefault(node, []).append(rule)
+        if missing:
+            log.warning("alert rules without data: %s", ", ".join(missing))
+        return {node: _RuleGroup(node, rules, values[node].columns) for node, rules in by_node.items()}
+
+    def rebind(self, values):
+        """Recompile when the rule nodes or their columns changed, keeping per-rule state."""
+        prefixes = sum(SOURCE_NODES.values(), ())
+        layout = {name: tuple(v.columns) for name, v in values.items()
+                  if name.startswith(prefixes) and isinstance(v, pd.DataFrame)}
+        if layout == self.layout:
+            return
+
+        for node, group in self.groups.items():
+            self.rule_state.update(group.state())
+            self.node_time[node] = group.last_time
+        self.groups = self.compile(values)
+        for node, group in self.groups.items():
+            group.restore(self.rule_state, self.node_time.get(node))
+        self.layout = layout
+
+    def update(self, values):
+        with self._lock:
+            self.rebind(values)
+
+            with METRICS.timer("stage_seconds", stage="alerts", node="evaluate"):
+                alerts = []
+                for node, group in self.groups.items():
+                    frame = values.get(node)
+                    if frame is None or not len(frame.index):
+                        continue
+                    alerts += group.update(frame, notify=group.last_time is not None)
+
+        for a in alerts:
+            METRICS.inc("alerts_fired_total", rule=a["rule"])
+        if alerts:
+            self.send(alerts)
+        return alerts
+
+    def send(self, alerts):
+        for sink in self.sinks:
+            try:
+                sink(alerts)
+            except Exception:
+                METRICS.inc("alert_sink_failures_total", sink=type(sink).__name__)
+                log.exception("alert sink %s failed", type(sink).__name__)
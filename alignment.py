@@ -0,0 +1,109 @@
+# alignment.py
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+# Median spacing (calendar days) -> native frequency label
+FREQUENCIES = [(1.5, "D"), (8, "W"), (35, "M"), (100, "Q"), (np.inf, "A")]
+
+# Days since the last observation before a series counts as stale.
+# Monthly FRED releases lag their observation date by 4-8 weeks.
+STALE_AFTER_DAYS = {"D": 5, "W": 14, "M": 100, "Q": 200, "A": 550}
+
+
+# ----------------------------------------------------------
+# 1) NATIVE FREQUENCY
+# ----------------------------------------------------------
+def native(frame):
+    """Column -> its own observations (NaN gaps from an outer join removed)."""
+    return {c: frame[c].dropna().sort_index() for c in frame.columns}
+
+
+def infer_frequency(series):
+    """'D' / 'W' / 'M' / 'Q' / 'A' from the median gap between observations."""
+    index = series.dropna().index
+    if len(index) < 2:
+        return "D"
+    gap = np.median(np.diff(index.as_unit("ns").asi8)) / pd.Timedelta(days=1).value
+    return next(label for limit, label in FREQUENCIES if gap <= limit)
+
+
+def trading_days(start, end):
+    """
+    Weekdays minus US federal holidays (the Treasury / FRED daily
+    calendar) in [start, end]. Holidays are generated for that span only.
+    """
+    holidays = USFederalHolidayCalendar().holidays(start, end)
+    return pd.bdate_range(start, end, freq="C", holidays=holidays, name="date")
+
+
+# ----------------------------------------------------------
+# 2) AS-OF JOIN
+# ----------------------------------------------------------
+def asof_join(frame, calendar=None, max_age=None):
+    """
+    Each column sampled onto `calendar` from its own observations:
+    the value on a date is the latest observation at or before it.
+    Dates before a series starts (or older than `max_age`) are NaN.
+    Defaults to the trading days spanned by the frame.
+    """
+    if calendar is None:
+        calendar = trading_days(frame.index.min(), frame.index.max())
+    cal = pd.DatetimeIndex(calendar).as_unit("ns").asi8
+
+    out = {}
+    for col, s in native(frame).items():
+        obs = s.index.as_unit("ns").asi8
+        pos = np.searchsorted(obs, cal, side="right") - 1
+        values = np.where(pos >= 0, s.to_numpy(dtype="float64")[np.maximum(pos, 0)], np.nan)
+        if max_age is not None:
+            age = cal - obs[np.maximum(pos, 0)]
+            values[age > pd.Timedelta(max_age).value] = np.nan
+        out[col] = values
+
+    return pd.DataFrame(out, index=pd.DatetimeIndex(calendar), columns=frame.columns)
+
+
+def zscore_native(frame):
+    """Full-sample z-score of each column over its own observations only."""
+    out = {}
+    for col, s in native(frame).items():
+        out[col] = (s - s.mean()) / s.std()
+    return pd.DataFrame(out, columns=frame.columns).sort_index()
+
+
+def sample(frame, freq="ME"):
+    """
+    As-of values at each period end, plus the latest observation date,
+    so no value is labelled with a date before it was observed.
+    """
+    frame = frame.dropna(how="all").sort_index()
+    if frame.empty:
+        return frame
+    ends = pd.date_range(frame.index.min(), frame.index.max(), freq=freq)
+    return asof_join(frame, ends.union(frame.index[-1:]))
+
+
+# ----------------------------------------------------------
+# 3) STALENESS
+# ----------------------------------------------------------
+def staleness_report(frame, asof=None):
+    """
+    One row per series:
+    frequency, observations, last_observation, age_days, stale
+    (stale: older than STALE_AFTER_DAYS for its frequency).
+    """
+    asof = pd.Timestamp.now().normalize() if asof is None else pd.Timestamp(asof)
+    rows = {}
+    for col, s in native(frame).items():
+        freq = infer_frequency(s)
+        last = s.index.max() if len(s) else pd.NaT
+        age = (asof - last).days if len(s) else np.nan
+        rows[col] = {
+            "frequency": freq,
+            "observations": len(s),
+            "last_observation": last,
+            "age_days": age,
+            "stale": not len(s) or age > STALE_AFTER_DAYS[freq],
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
@@ -1,25 +1,108 @@
 # app.py
+import logging
+import os
+import threading
+import time
+
 from dash import Dash
+from flask import Response, request, g
 from layout import build_layout
 from callbacks import register_callbacks
+from precompute import SnapshotWorker
+from figure_cache import FIGURE_CACHE
+from metrics import METRICS
+from settings import INTRADAY_ENABLED, DEFER_IMPORT_SECONDS
+from startup import STARTUP, ImportGate
+from tickers import RISK_TICKERS
+
+STARTUP.mark("imports")
+
+log = logging.getLogger(__name__)
 
-# Working tickers only
-RISK_TICKERS = {
-    "Signal Guide": [],
-    "FRED Macro": [],
-    "Recession Risk": [],  
-    "Volatility": ["^VIX", "^VIX3M", "^VIX6M", "^VXN", "^SKEW"],
-    "Credit Risk": ["HYG", "JNK", "LQD"],
-    "Treasury Yields": ["^FVX", "^TNX", "^TYX"],
-    "Liquidity": ["UUP", "SHY", "IEI"],
-    "Global Risk": ["EEM"],
-    "Stress Score": [],
-}
+# The data / figure stack, imported after the first layout has been served
+# (or up front by preload() in a forking master)
+STACK = ImportGate(["pandas", "data_fetching", "recession_model", "panel_graph", "market_matrix",
+                    "panels", "patches", "figures", "client_store", "alerts"])
 
 app = Dash(__name__)
 app.layout = build_layout(RISK_TICKERS)
+# WSGI entry point: gunicorn -c gunicorn.conf.py app:server
+server = app.server
+
+# Background pipeline: fetch -> indicators -> figures, published as snapshots
+# (SHARED_MATRIX=1: one process fetches, all build from the shared matrix)
+worker = SnapshotWorker(RISK_TICKERS)
+
+# 1-minute bars into fixed-size buffers (INTRADAY_MODE=1)
+if INTRADAY_ENABLED:
+    from intraday import IntradayStream
+    intraday = IntradayStream(RISK_TICKERS)
+else:
+    intraday = None
+
+register_callbacks(app, RISK_TICKERS, worker, intraday)
+
+
+def preload():
+    """Import the data / figure stack now, so forked workers share it."""
+    STACK.load()
+
+
+def start_background():
+    """Start this process's refresh threads (after fork when preloading)."""
+    def run():
+        if not STACK.ready.is_set():
+            STARTUP.wait("first_layout", DEFER_IMPORT_SECONDS)
+            try:
+                STACK.load()
+            except Exception:
+                log.exception("importing the data stack failed")
+        worker.start()
+        if intraday is not None:
+            intraday.start()
+
+    threading.Thread(target=run, name="startup", daemon=True).start()
+
+
+# Threads do not survive fork: a preloading master leaves them to post_fork
+if os.environ.get("APP_PRELOAD") == "1":
+    preload()
+else:
+    start_background()
+
+STARTUP.mark("app_ready")
+
+
+@server.before_request
+def wait_for_stack():
+    g.stack_entered = STACK.enter()
+
+
+@server.teardown_request
+def leave_stack(exc=None):
+    if g.pop("stack_entered", False):
+        STACK.leave()
+
+
+@server.after_request
+def mark_first_layout(response):
+    if response.status_code == 200 and request.path.endswith("/_dash-layout"):
+        STARTUP.mark("first_layout")
+    return response
+
+
+@app.server.route("/metrics")
+def metrics():
+    # point-in-time gauges are sampled on scrape
+    snap = worker.snapshot
+    if snap is not None:
+        METRICS.set("snapshot_version", snap.version)
+        METRICS.set("snapshot_age_seconds", round(time.time() - snap.created_at, 3))
+        METRICS.set("snapshot_panel_errors", len(snap.errors))
+    METRICS.set("figure_cache_bytes", FIGURE_CACHE.bytes)
+    METRICS.set("figure_cache_entries", len(FIGURE_CACHE))
+    return Response(METRICS.render(), mimetype="text/plain; version=0.0.4")
 
-register_callbacks(app, RISK_TICKERS)
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0",port=8050, debug=True)
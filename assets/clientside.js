@@ -0,0 +1,55 @@
+// assets/clientside.js
+// Client-side tab rendering from the columnar market-store payload.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    panels: {
+        // Only tabs that need the server are forwarded to update_panel;
+        // client tabs return no_update, so switching costs no round trip.
+        route_tab: function (tab, clientTabs) {
+            if (clientTabs && clientTabs.indexOf(tab) !== -1) {
+                return window.dash_clientside.no_update;
+            }
+            return tab;
+        },
+
+        // The intraday stream is only polled while its tab is open
+        intraday_poll: function (tab, intradayTab) {
+            return tab !== intradayTab;
+        },
+
+        render: function (tab, store, clientTabs) {
+            var noUpdate = window.dash_clientside.no_update;
+            var isClient = clientTabs && clientTabs.indexOf(tab) !== -1;
+            var show = {display: "block"}, hide = {display: "none"};
+
+            if (!isClient) {
+                return [noUpdate, noUpdate, hide, show];
+            }
+            if (!store || !store.groups || !store.groups[tab]) {
+                return [noUpdate, noUpdate, hide, show];
+            }
+
+            var group = store.groups[tab];
+            var figure = function (frame, title) {
+                var traces = Object.keys(frame.columns).map(function (col) {
+                    return {
+                        type: "scatter", mode: "lines", name: col,
+                        x: frame.index, y: frame.columns[col]
+                    };
+                });
+                var layout = Object.assign({}, store.layout, {
+                    title: {text: title},
+                    xaxis: Object.assign({}, store.layout.xaxis, {type: "date"}),
+                    uirevision: title
+                });
+                return {data: traces, layout: layout};
+            };
+
+            return [
+                figure(group.levels, tab + " — Levels"),
+                figure(group.zscores, tab + " — Z-Scores"),
+                show,
+                hide
+            ];
+        }
+    }
+});
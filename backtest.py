@@ -0,0 +1,209 @@
+# backtest.py
+import numpy as np
+import pandas as pd
+
+from indicators import add_credit_ratio
+from recession_model import RecessionRiskModel2026, CAPE_PROXY
+from stress_engine import StressEngine, STRESS_SCENARIOS
+from zscore_engine import RollingZScore, DEFAULT_MIN_PERIODS
+from alignment import sample
+
+# Signals crossing a threshold this long before a recession start count as hits
+DEFAULT_HORIZON = pd.Timedelta(days=365)
+
+
+# ----------------------------------------------------------
+# 1) POINT-IN-TIME Z-SCORES (no lookahead)
+# ----------------------------------------------------------
+def expanding_zscore(df, min_periods=DEFAULT_MIN_PERIODS):
+    """
+    z[t] uses only observations up to and including t.
+    Vectorized with cumulative sums over all columns at once.
+    """
+    X = df.to_numpy(dtype="float64")
+    valid = ~np.isnan(X)
+
+    # shift by the first valid value per column for numerical stability
+    first = pd.DataFrame(X).bfill().to_numpy()[0]
+    Xs = np.where(valid, X - np.nan_to_num(first), 0.0)
+
+    n = np.cumsum(valid, axis=0)
+    s = np.cumsum(Xs, axis=0)
+    q = np.cumsum(Xs ** 2, axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s / n
+        std = np.sqrt(np.maximum((q - s * mean) / (n - 1), 0.0))
+        z = (Xs - mean) / std
+    z[(n < min_periods) | (std == 0) | ~valid] = np.nan
+
+    return pd.DataFrame(z, index=df.index, columns=df.columns)
+
+
+def point_in_time_zscore(df, window=None, min_periods=DEFAULT_MIN_PERIODS):
+    """Expanding (window=None) or rolling point-in-time z-scores."""
+    if window is None:
+        return expanding_zscore(df, min_periods)
+    return RollingZScore(window, min_periods).update(df)
+
+
+# ----------------------------------------------------------
+# 2) SIGNAL SERIES
+# ----------------------------------------------------------
+def stress_signals(levels, scenarios=STRESS_SCENARIOS, window=252):
+    """Daily stress score for every weighting scenario, replayed without lookahead."""
+    levels = add_credit_ratio(levels.copy())
+    z = point_in_time_zscore(levels, window)
+    return StressEngine(scenarios).compute(z).dropna(how="all")
+
+
+def recession_signal(spread, hy, delta_u, cape, freq="ME"):
+    """
+    Monthly RecessionRiskModel2026 probability with expanding z-scores,
+    i.e. what the model would have said on each date at the time.
+    CAPE enters at a neutral z of 0 until it has history of its own
+    (the fallback proxy only starts in 2019), so 2001 / 2008 are scored.
+    """
+    z = pd.concat({
+        "yc": expanding_zscore(spread.to_frame())[spread.name],
+        "hy": expanding_zscore(hy.to_frame())[hy.name],
+        "u": expanding_zscore(delta_u.to_frame())[delta_u.name],
+        "cape": expanding_zscore(cape.to_frame(), min_periods=2)[cape.name],
+    }, axis=1)
+    z = sample(z, freq)
+    z["cape"] = z["cape"].fillna(0.0)
+    z = z.dropna()
+
+    p = RecessionRiskModel2026().predict_batch(z["yc"], z["hy"], z["u"], z["cape"])
+    return pd.Series(p, index=z.index, name="Recession Probability")
+
+
+# ----------------------------------------------------------
+# 3) THRESHOLD CROSSINGS
+# ----------------------------------------------------------
+def crossing_matrix(signals, thresholds):
+    """
+    Upward crossings for every (date, signal, threshold):
+    previous value below the threshold, current value at or above.
+    Returns a bool array of shape (dates, signals, thresholds).
+    """
+    S = signals.to_numpy(dtype="float64")[:, :, None]
+    thr = np.asarray(thresholds, dtype="float64")[None, None, :]
+    prev = np.vstack([np.full((1,) + S.shape[1:], np.nan), S[:-1]])
+    return (prev < thr) & (S >= thr)
+
+
+def crossing_events(signals, thresholds):
+    """Long-form table of crossing events: date, signal, threshold, value."""
+    C = crossing_matrix(signals, thresholds)
+    t, k, m = np.nonzero(C)
+    return pd.DataFrame({
+        "date": signals.index[t],
+        "signal": np.asarray(signals.columns)[k],
+        "threshold": np.asarray(thresholds)[m],
+        "value": signals.to_numpy()[t, k],
+    })
+
+
+def recession_starts(usrec):
+    """Dates where the FRED USREC indicator turns from 0 to 1."""
+    usrec = usrec.dropna().astype(int)
+    return usrec.index[(usrec.diff() == 1).to_numpy()]
+
+
+# ----------------------------------------------------------
+# 4) HIT RATE / LEAD TIME
+# ----------------------------------------------------------
+def evaluate(signals, thresholds, usrec, horizon=DEFAULT_HORIZON):
+    """
+    One row per (signal, threshold):
+    - crossings        number of upward crossings
+    - hit_rate         share of crossings followed by a recession start within horizon
+    - recall           share of recession starts preceded by a crossing within horizon
+    - mean_lead_days   first crossing -> recession start, averaged over detected recessions
+    """
+    starts = recession_starts(usrec)
+    starts = starts[(starts >= signals.index[0]) & (starts <= signals.index[-1] + horizon)]
+    start_ns = starts.as_unit("ns").asi8
+    h = horizon.value
+
+    C = crossing_matrix(signals, thresholds)
+    dates_ns = signals.index.as_unit("ns").asi8
+
+    rows = []
+    for k, name in enumerate(signals.columns):
+        for m, thr in enumerate(thresholds):
+            cross = dates_ns[C[:, k, m]]
+
+            # next recession start at or after each crossing
+            nxt = np.searchsorted(start_ns, cross, side="left")
+            has_next = nxt < len(start_ns)
+            gap = np.where(has_next, start_ns[np.minimum(nxt, len(start_ns) - 1)] - cross, np.inf)
+            hits = gap <= h
+
+            # first crossing inside [start - horizon, start] for each recession
+            lo = np.searchsorted(cross, start_ns - h, side="left")
+            hi = np.searchsorted(cross, start_ns, side="right")
+            detected = hi > lo
+            lead = (start_ns[detected] - cross[lo[detected]]) / 86_400e9
+
+            rows.append({
+                "signal": name,
+                "threshold": thr,
+                "crossings": len(cross),
+                "hit_rate": hits.mean() if len(cross) else np.nan,
+                "recall": detected.mean() if len(start_ns) else np.nan,
+                "mean_lead_days": lead.mean() if len(lead) else np.nan,
+            })
+
+    return pd.DataFrame(rows)
+
+
+def run_backtest(levels, usrec, thresholds=(55, 60, 65, 70), scenarios=STRESS_SCENARIOS,
+                 recession_inputs=None, recession_thresholds=(0.3, 0.5, 0.7),
+                 horizon=DEFAULT_HORIZON):
+    """
+    Replay stress scenarios (and optionally the recession model) over
+    stored history. `recession_inputs` is a dict with spread, hy,
+    delta_u and cape series. Returns signals, events and statistics.
+    """
+    signals = stress_signals(levels, scenarios)
+    result = {
+        "signals": signals,
+        "events": crossing_events(signals, thresholds),
+        "stats": evaluate(signals, list(thresholds), usrec, horizon),
+    }
+
+    if recession_inputs is not None:
+        prob = recession_signal(**recession_inputs).to_frame()
+        result["recession_signal"] = prob
+        result["recession_events"] = crossing_events(prob, recession_thresholds)
+        result["recession_stats"] = evaluate(prob, list(recession_thresholds), usrec, horizon)
+
+    return result
+
+
+def load_backtest_inputs(ticker_groups, start="1990-01-01"):
+    """Full stored history for a replay: Yahoo closes, USREC and recession inputs."""
+    from data_fetching import fetch_yahoo_prices
+    from fred_client import FRED_CLIENT
+    from price_store import PRICE_STORE
+
+    levels = fetch_yahoo_prices(ticker_groups, period="max")
+    levels = levels[levels.index >= pd.Timestamp(start)]
+
+    frames, errors = FRED_CLIENT.fetch_many(
+        ["USREC", "DGS10", "DGS3MO", "BAMLH0A0HYM2", "UNRATE"],
+        start=start, store=PRICE_STORE,
+    )
+    if errors:
+        raise RuntimeError(f"Backtest inputs unavailable: {errors}")
+
+    yc = pd.concat([frames["DGS10"], frames["DGS3MO"]], axis=1).dropna()
+    recession_inputs = {
+        "spread": (yc["DGS10"] - yc["DGS3MO"]).rename("spread"),
+        "hy": frames["BAMLH0A0HYM2"]["BAMLH0A0HYM2"].dropna(),
+        "delta_u": frames["UNRATE"]["UNRATE"].diff(12).dropna(),
+        "cape": CAPE_PROXY,                           # not on FRED
+    }
+    return levels, frames["USREC"]["USREC"], recession_inputs
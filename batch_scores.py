@@ -0,0 +1,111 @@
+# batch_scores.py
+"""
+Stress Score and recession probability without the dashboard (cron / batch).
+
+    python batch_scores.py                                   # latest trading day, CSV to stdout
+    python batch_scores.py --end 2025-03-14                  # that trading day only
+    python batch_scores.py --start 2025-01-01 --out scores.parquet
+    python batch_scores.py --start 2025-01-01 --end 2025-06-30 --out scores.csv
+
+Uses the same panel graph as the app (rolling z-scores, HYG/LQD, baseline
+weights) but imports only the numeric stack: no Dash, Plotly or signal
+guide. Output is one row per trading day; values are as of that day:
+the Stress Score uses rolling z-scores and, for any historical date
+(--start and / or --end), Recession Probability uses expanding z-scores
+(backtest.recession_signal) instead of the dashboard's full-sample ones,
+which would see the future.
+"""
+import argparse
+import logging
+import math
+import sys
+
+import pandas as pd
+
+from tickers import RISK_TICKERS
+from panel_graph import build_graph, Resolver, ZSCORE_WINDOW
+from market_matrix import LiveSource
+from recession_model import compute_recession_probability
+from backtest import recession_signal
+from alignment import asof_join, trading_days
+
+log = logging.getLogger("batch_scores")
+
+
+def history_period(start, now=None):
+    """Yahoo period covering `start` plus one z-score window of warm-up."""
+    now = pd.Timestamp.now().normalize() if now is None else now
+    if start is None:
+        return "1y"                                     # same history as the dashboard
+    warmup = pd.Timedelta(days=int(ZSCORE_WINDOW * 365 / 252))
+    return f"{math.ceil((now - start + warmup).days / 365)}y"
+
+
+def last_trading_day(date):
+    """Latest trading day at or before `date` (weekends / holidays step back)."""
+    return trading_days(date - pd.Timedelta(days=10), date)[-1]
+
+
+def point_in_time_recession():
+    """Business-day recession probability using only data available on each day."""
+    raw = compute_recession_probability()["raw"]
+    return recession_signal(raw["spread"], raw["hy"], raw["unrate"].diff(12).dropna(),
+                            raw["cape"], freq="B")
+
+
+def compute_scores(start=None, end=None, now=None):
+    """
+    Frame indexed by date with "Stress Score" and "Recession Probability".
+    Without start / end: a single row for the latest trading day, with the
+    same recession probability as the dashboard. With only end: a single
+    row for the latest trading day at or before it, scored point-in-time.
+    """
+    today = pd.Timestamp.now().normalize() if now is None else now
+    live = start is None and end is None
+    end = today if end is None else pd.Timestamp(end)
+    start = last_trading_day(end) if start is None else pd.Timestamp(start)
+    calendar = trading_days(start, end)
+
+    period = history_period(None if live else start, today)
+    resolver = Resolver(build_graph(RISK_TICKERS, LiveSource(period)))
+    stress = resolver.get("stress_score")["Stress Score"]
+    if live:
+        recession = compute_recession_probability(freq="B")["history"]
+    else:
+        recession = point_in_time_recession()
+
+    scores = pd.concat({"Stress Score": stress, "Recession Probability": recession}, axis=1, sort=True)
+    return asof_join(scores, calendar)
+
+
+def write(df, out):
+    if out is None:
+        df.to_csv(sys.stdout, float_format="%.6f")
+    elif out.endswith(".parquet"):
+        df.to_parquet(out)
+    else:
+        df.to_csv(out, float_format="%.6f")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", help="first date (YYYY-MM-DD); default: --end only. "
+                        "Historical dates score the recession model point-in-time (expanding z-scores)")
+    parser.add_argument("--end", help="last date (YYYY-MM-DD); default: the latest trading day")
+    parser.add_argument("--out", help="output .csv or .parquet; default: CSV on stdout")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s", stream=sys.stderr)
+    scores = compute_scores(args.start, args.end)
+    write(scores, args.out)
+
+    missing = [c for c in scores.columns if scores[c].isna().all()]
+    if missing:
+        log.error("no values for %s", ", ".join(missing))
+        return 1
+    log.info("%d rows, %s to %s", len(scores), scores.index[0].date(), scores.index[-1].date())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
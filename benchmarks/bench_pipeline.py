@@ -0,0 +1,177 @@
+# benchmarks/bench_pipeline.py
+"""
+Offline benchmark of the update_panel pipeline on synthetic market data.
+
+    python benchmarks/bench_pipeline.py --tickers 15,60 --years 1,5 --intervals 1d,1h
+    python benchmarks/bench_pipeline.py --compare <commit>
+
+Each run appends one JSON line per (parameters, stage) to
+benchmarks/results/results.jsonl, tagged with the current git commit.
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+import synthetic
+from data_fetching import _close_frame
+from alignment import asof_join
+from indicators import add_credit_ratio, compute_zscore, compute_stress_score
+from recession_model import compute_recession_probability
+from zscore_engine import RollingZScore
+from correlation_engine import RollingCorrelation
+from panels import build_panel
+
+RESULTS = os.path.join(ROOT, "benchmarks", "results", "results.jsonl")
+
+
+# ----------------------------------------------------------
+# 1) STAGES
+# ----------------------------------------------------------
+def run_pipeline(n_tickers, years, interval, timer):
+    """One pass through every stage; timer(stage, fn) runs and records fn."""
+    symbols = synthetic.tickers(n_tickers)
+    history = synthetic.yahoo_history(symbols, years, interval)
+    macro = synthetic.fred_macro(years)
+    recession_inputs = synthetic.recession_inputs()
+
+    def fetch_stub():
+        prices = _close_frame(history, symbols)
+        prices.index = pd.to_datetime(prices.index, utc=True).tz_convert(None)
+        return prices.join(asof_join(macro, prices.index))
+
+    raw = timer("fetch_stub", fetch_stub)
+    raw = timer("add_credit_ratio", lambda: add_credit_ratio(raw))
+    z = timer("compute_zscore", lambda: compute_zscore(raw))
+    timer("rolling_zscore", lambda: RollingZScore(252).update(raw))
+    timer("rolling_correlation", lambda: RollingCorrelation().update(raw.pct_change(fill_method=None)))
+    mss = timer("compute_stress_score", lambda: compute_stress_score(z))
+    timer("compute_recession_probability",
+          lambda: compute_recession_probability(recession_inputs))
+    rec = timer("recession_bands_10k",
+                lambda: compute_recession_probability(recession_inputs, draws=10000))
+
+    group = raw[symbols[:5]].dropna()
+
+    def figures():
+        return [
+            build_panel("Volatility", {"levels:Volatility": group,
+                                       "zscore:Volatility": z[group.columns]}),
+            build_panel("Stress Score", {"stress_score": mss, "stress_scenarios": mss}),
+            build_panel("Recession Risk", {"recession": rec}),
+        ]
+
+    panels = timer("figure_build", figures)
+    timer("json_serialization", lambda: [to_json_plotly(p) for p in panels])
+    return raw.shape
+
+
+def bench(n_tickers, years, interval, repeat):
+    best = {}
+
+    def timer(stage, fn):
+        t0 = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t0
+        best[stage] = min(best.get(stage, float("inf")), elapsed)
+        return out
+
+    for _ in range(repeat):
+        shape = run_pipeline(n_tickers, years, interval, timer)
+    return best, shape
+
+
+# ----------------------------------------------------------
+# 2) RESULTS
+# ----------------------------------------------------------
+def git_commit():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+        dirty = bool(subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"],
+                                             cwd=ROOT, text=True).strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", True
+
+
+def save(records):
+    os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+    with open(RESULTS, "a") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+
+def load():
+    if not os.path.exists(RESULTS):
+        return pd.DataFrame()
+    with open(RESULTS) as f:
+        return pd.DataFrame([json.loads(line) for line in f if line.strip()])
+
+
+def compare(base, head=None):
+    """Per (parameters, stage): latest seconds at base vs head, and the ratio."""
+    df = load()
+    if df.empty:
+        print("No stored results.")
+        return
+    head = head or df["commit"].iloc[-1]
+    keys = ["tickers", "years", "interval", "stage"]
+
+    def latest(commit):
+        sub = df[df["commit"] == commit]
+        return sub.groupby(keys)["seconds"].last()
+
+    table = pd.concat({"base": latest(base), "head": latest(head)}, axis=1).dropna()
+    table["ratio"] = table["head"] / table["base"]
+    print(f"{base} -> {head}")
+    print(table.to_string(float_format=lambda v: f"{v:.4f}"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", default="15,60", help="comma-separated ticker counts")
+    parser.add_argument("--years", default="1,5", help="comma-separated years of history")
+    parser.add_argument("--intervals", default="1d", help="comma-separated bar intervals")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best is kept)")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--compare", metavar="BASE", help="compare stored results of BASE commit to the latest")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(args.compare)
+        return
+
+    commit, dirty = git_commit()
+    records = []
+    cases = itertools.product(
+        [int(v) for v in args.tickers.split(",")],
+        [float(v) for v in args.years.split(",")],
+        args.intervals.split(","),
+    )
+    for n_tickers, years, interval in cases:
+        best, shape = bench(n_tickers, years, interval, args.repeat)
+        print(f"\ntickers={n_tickers} years={years:g} interval={interval} rows={shape[0]} cols={shape[1]}")
+        for stage, seconds in best.items():
+            print(f"  {stage:<32}{seconds * 1000:>10.2f} ms")
+            records.append({
+                "commit": commit, "dirty": dirty, "timestamp": time.time(),
+                "tickers": n_tickers, "years": years, "interval": interval,
+                "rows": shape[0], "stage": stage, "seconds": seconds,
+            })
+
+    if not args.no_save:
+        save(records)
+        print(f"\nSaved {len(records)} results to {os.path.relpath(RESULTS, ROOT)} ({commit}{'+dirty' if dirty else ''})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_startup.py
+"""
+Cold start of the dashboard: spawn a fresh server process and time how long
+it takes until /_dash-layout is served. Fails when over the budget.
+
+    python benchmarks/bench_startup.py --budget 3
+    python benchmarks/bench_startup.py --runs 5 --no-save
+
+The server runs with the current environment (point FRED_BASE_URL /
+YAHOO_BASE_URL at standin_server.py to keep upstream out of the picture).
+Results are appended to benchmarks/results/results.jsonl like bench_pipeline.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from bench_pipeline import ROOT, RESULTS, git_commit, save
+
+SERVE = "import app; app.server.run(host='127.0.0.1', port={port}, threaded=True)"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def cold_start(timeout=60):
+    """Seconds from spawning the server to the first 200 on /_dash-layout."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/_dash-layout"
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", SERVE.format(port=port)], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.02)
+        raise RuntimeError(f"no layout within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="cold starts (best and worst are reported)")
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("STARTUP_BUDGET_SECONDS", 0)),
+                        help="fail if the best cold start exceeds this many seconds (0 = report only)")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    times = [cold_start() for _ in range(args.runs)]
+    best, worst = min(times), max(times)
+    print(f"cold start to first layout: best {best:.3f}s  worst {worst:.3f}s  ({args.runs} runs)")
+
+    if not args.no_save:
+        commit, dirty = git_commit()
+        save([{"commit": commit, "dirty": dirty, "timestamp": time.time(),
+               "stage": "cold_start_first_layout", "seconds": best}])
+        print(f"Saved to {os.path.relpath(RESULTS, ROOT)} ({commit}{'+dirty' if dirty else ''})")
+
+    if args.budget and best > args.budget:
+        print(f"over budget: {best:.3f}s > {args.budget:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# benchmarks/synthetic.py
+import numpy as np
+import pandas as pd
+
+# Bars per trading day for each yahooquery interval
+BARS_PER_DAY = {"1d": 1, "1h": 7, "30m": 13, "15m": 26, "5m": 78, "1m": 390}
+
+BASE_TICKERS = [
+    "^VIX", "^VIX3M", "^VIX6M", "^VXN", "^SKEW",
+    "HYG", "JNK", "LQD",
+    "^FVX", "^TNX", "^TYX",
+    "UUP", "SHY", "IEI",
+    "EEM",
+]
+
+
+def tickers(n):
+    """The real RISK_TICKERS universe first, then SYN001, SYN002, ..."""
+    extra = [f"SYN{i:03d}" for i in range(1, max(0, n - len(BASE_TICKERS)) + 1)]
+    return (BASE_TICKERS + extra)[:n]
+
+
+def bar_index(years, interval="1d", end="2025-06-30"):
+    days = pd.bdate_range(end=end, periods=int(252 * years))
+    per_day = BARS_PER_DAY[interval]
+    if per_day == 1:
+        return days
+    step = pd.Timedelta(minutes=390 // per_day)
+    offsets = pd.timedelta_range(pd.Timedelta(hours=13, minutes=30), periods=per_day, freq=step)
+    return pd.DatetimeIndex((days.values[:, None] + offsets.values[None, :]).ravel(), tz="UTC")
+
+
+def yahoo_history(symbols, years, interval="1d", seed=0):
+    """
+    Frame shaped like yahooquery Ticker.history(): MultiIndex (symbol, date)
+    with open / high / low / close / volume / adjclose columns.
+    """
+    rng = np.random.default_rng(seed)
+    idx = bar_index(years, interval)
+    n = len(idx)
+
+    frames = []
+    for sym in symbols:
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        spread = np.abs(rng.normal(0, 0.005, n)) * close
+        frames.append(pd.DataFrame({
+            "open": close + rng.normal(0, 0.002, n) * close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 1_000_000, n),
+            "adjclose": close,
+        }, index=pd.MultiIndex.from_arrays([[sym] * n, idx], names=["symbol", "date"])))
+
+    return pd.concat(frames)
+
+
+def fred_series(code, start="1990-01-01", end="2025-06-30", freq="B", level=2.0, seed=0):
+    """Single-column FRED-style frame (DATE index)."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(start, end, freq=freq, name="DATE")
+    values = level + np.cumsum(rng.normal(0, 0.05, len(idx)))
+    return pd.DataFrame({code: values}, index=idx)
+
+
+def fred_macro(years):
+    """Shape of fetch_fred(): daily / weekly / monthly columns outer-joined, not filled."""
+    start = pd.Timestamp("2025-06-30") - pd.Timedelta(days=int(365 * years))
+    parts = [
+        fred_series("HY_OAS", start, freq="B", level=4.0, seed=1),
+        fred_series("NFCI", start, freq="W-FRI", level=-0.4, seed=2),
+        fred_series("TOTALSL", start, freq="MS", level=4500, seed=3),
+        fred_series("DGS2", start, freq="B", level=4.0, seed=4),
+        fred_series("DGS10", start, freq="B", level=4.2, seed=5),
+        fred_series("DGS30", start, freq="B", level=4.5, seed=6),
+    ]
+    return pd.concat(parts, axis=1)
+
+
+def recession_inputs():
+    """Inputs for compute_recession_probability(inputs=...) since 1990."""
+    return {
+        "DGS10": fred_series("DGS10", level=4.5, seed=11),
+        "DGS3MO": fred_series("DGS3MO", level=3.0, seed=12),
+        "BAMLH0A0HYM2": fred_series("BAMLH0A0HYM2", level=4.5, seed=13),
+        "UNRATE": fred_series("UNRATE", freq="MS", level=5.0, seed=14),
+        "CAPE": fred_series("CAPE", freq="MS", level=25.0, seed=15),
+    }
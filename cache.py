@@ -0,0 +1,55 @@
+# cache.py
+import threading
+
+from metrics import METRICS
+
+
+class RefreshMemo:
+    """
+    Inputs loaded during one refresh, shared by every panel-graph node
+    that asks for the same key. Entries do not expire: the SnapshotWorker
+    calls invalidate() at the start of each cycle, so every refresh loads
+    current data once (one-shot runs such as batch_scores never invalidate).
+
+    - cached entry  -> served from memory
+    - missing entry -> loaded in the calling thread (one loader per key)
+    """
+
+    def __init__(self, name="data"):
+        self.name = name
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader, valid=None):
+        """
+        Return the memoized value for key, calling loader() on a miss.
+        `valid(value)` decides whether a loaded value may be kept
+        (e.g. skip empty frames when Yahoo is rate limiting).
+        """
+        # serialize loaders per key so concurrent callers wait for the
+        # first load instead of hitting upstream again
+        with self._key_lock(key):
+            with self._lock:
+                hit = key in self._entries
+                value = self._entries.get(key)
+            METRICS.inc("cache_requests_total", cache=self.name, result="hit" if hit else "miss")
+            if hit:
+                return value
+
+            value = loader()
+            if valid is None or valid(value):
+                with self._lock:
+                    self._entries[key] = value
+            return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
@@ -1,179 +1,189 @@
 # callbacks.py
-import pandas as pd
-from dash import html, dcc, Output, Input
-import plotly.graph_objects as go
-from data_fetching import fetch_data
-from recession_model import compute_recession_probability
-from indicators import compute_zscore, add_credit_ratio, compute_stress_score
-from figures import make_timeseries_panel, make_stress_gauge
-from signal_guide import SIGNAL_GUIDE_TEXT
+import json
 
-def register_callbacks(app, RISK_TICKERS):
+from dash import Output, Input, State, MATCH, ALL, no_update, html, ctx, ClientsideFunction
+from settings import INTRADAY_TAB
+from figure_cache import FIGURE_CACHE
+from metrics import METRICS, BYTES_BUCKETS, timed_callback
+
+# pandas-backed modules (patches, panels, figures) are imported inside the
+# callbacks, so registering them does not load the data stack at startup.
+
+
+def register_callbacks(app, RISK_TICKERS, worker, intraday=None):
+
+    # Panels whose history only grows at the end; refreshes send appended bars
+    PATCHABLE = {"Stress Score"} | {k for k, v in RISK_TICKERS.items() if v}
+
+    # Tabs listed in the client-tabs store never reach the server
+    app.clientside_callback(
+        ClientsideFunction(namespace="panels", function_name="route_tab"),
+        Output("server-tab", "data"),
+        Input("tabs", "value"),
+        State("client-tabs", "data"),
+    )
 
     @app.callback(
         Output("panel-output", "children"),
-        
+        Output("snapshot-poll", "disabled"),
+        Output("panel-state", "data"),
+
+        Input("server-tab", "data"),
+        Input("refresh", "n_intervals"),
+        Input("snapshot-poll", "n_intervals"),
+        State("panel-state", "data"),
+    )
+    @timed_callback("update_panel")
+    def update_panel(selected_group, n, n_poll, state):
+        # Snapshot lookup only: the SnapshotWorker does all fetching / compute.
+        # Fast polling stops once the first snapshot has been published.
+        from patches import panel_state, refresh_patch
+        from panels import build_intraday_panel
+
+        snap = worker.snapshot
+        if selected_group is None:
+            return html.Div(), snap is not None, no_update
+        if selected_group == INTRADAY_TAB and intraday is not None:
+            # rendered from the live buffers; stream_intraday extends it afterwards
+            if ctx.triggered_id != "server-tab":
+                return no_update, True, no_update
+            z, score = intraday.frames()
+            return build_intraday_panel(z, score, intraday.version), True, None
+        if snap is None:
+            return worker.panel(selected_group), False, None
+
+        version = snap.panel_versions.get(selected_group)
+        is_refresh = ctx.triggered_id != "server-tab"
+        same_panel = state is not None and state["panel"] == selected_group
+
+        # ---------- REFRESH: client already holds this version ----------
+        if is_refresh and same_panel and version is not None and state["version"] == version:
+            METRICS.inc("panel_updates_total", mode="unchanged")
+            return no_update, True, no_update
+
+        # ---------- REFRESH: send only what changed ----------
+        if is_refresh and same_panel and selected_group in PATCHABLE:
+            delta = refresh_patch(state, snap, selected_group)
+            if delta is not None:
+                patch, new_state = delta
+                METRICS.inc("panel_updates_total", mode="patch")
+                METRICS.observe("payload_bytes", len(json.dumps(patch.to_plotly_json())),
+                                buckets=BYTES_BUCKETS, kind="patch")
+                return patch, True, new_state
+
+        # ---------- FULL RENDER (serialized once per panel version) ----------
+        def render():
+            children = worker.panel(selected_group)
+            frames = snap.frames.get(selected_group, {})
+            return children, panel_state(selected_group, version, children, frames)
+
+        if version is None:
+            children, new_state = render()
+        else:
+            children, new_state = FIGURE_CACHE.get_or_build((selected_group, version), render)
+        METRICS.inc("panel_updates_total", mode="full")
+        return children, True, new_state
+
+    # ---------- CLIENT-SIDE TABS ----------
+    @app.callback(
+        Output("market-store", "data"),
+        Output("market-store-version", "data"),
+
+        Input("refresh", "n_intervals"),
+        Input("snapshot-poll", "n_intervals"),
+        State("market-store-version", "data"),
+    )
+    @timed_callback("publish_store")
+    def publish_store(n, n_poll, client_version):
+        # one compact payload per data version; unchanged -> nothing sent
+        snap = worker.snapshot
+        if snap is None or snap.store is None or snap.store["version"] == client_version:
+            return no_update, no_update
+        return snap.store, snap.store["version"]
+
+    app.clientside_callback(
+        ClientsideFunction(namespace="panels", function_name="render"),
+        Output("client-levels", "figure"),
+        Output("client-zscores", "figure"),
+        Output("client-panel", "style"),
+        Output("panel-output", "style"),
+
         Input("tabs", "value"),
-        Input("refresh", "n_intervals")
+        Input("market-store", "data"),
+        State("client-tabs", "data"),
     )
-    def update_panel(selected_group, n):
-
-        # ---------- ALWAYS FETCH DATA FIRST ----------
-        raw = fetch_data(RISK_TICKERS)
-
-        # ---------- SIGNAL GUIDE ----------
-        if selected_group == "Signal Guide":
-            return html.Div([
-                dcc.Markdown(SIGNAL_GUIDE_TEXT, style={
-                    "padding": "20px",
-                    "whiteSpace": "pre-wrap",
-                    "overflowY": "scroll",
-                    "height": "800px"
-                })
-            ])
-        # ---------- FRED Macro ----------
-        if selected_group == "FRED Macro":
-            fred_cols = ["HY_OAS", "NFCI", "TOTALSL", "DGS2", "DGS10", "DGS30"]
-            existing = [c for c in fred_cols if c in raw.columns]
-
-            # df = raw[existing].dropna()
-            df = raw[existing].sort_index().asfreq("D").ffill()
-            # Normalize by max value per series for raw display
-            df_norm = df / df.abs().max()
-            # calculate z score
-            z = compute_zscore(df)
-            
-            return html.Div([
-                dcc.Graph(figure=make_timeseries_panel(df_norm, "Macro Levels")),
-                dcc.Graph(figure=make_timeseries_panel(z, "Macro Z-Scores"))
-            ])
-        # -----------------------------------------------------
-        # RECESSION PANEL
-        # -----------------------------------------------------
-        if selected_group == "Recession Risk":
-
-            p = compute_recession_probability()
-
-            # --- unpack the recession model results ---
-            prob = p["probability"]            # float
-            z_dict = p["z"]                    # dict of floats
-            raw_dict = p["raw"]                # dict of pd.Series
-
-            # =====================================================
-            # 1) PROBABILITY GAUGE
-            # =====================================================
-            gauge = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=prob * 100,
-                gauge={
-                    "axis": {"range": [0, 100]},
-                    "steps": [
-                        {"range": [0, 30], "color": "#2ca02c"},
-                        {"range": [30, 50], "color": "#1f77b4"},
-                        {"range": [50, 70], "color": "#ff7f0e"},
-                        {"range": [70, 100], "color": "#d62728"},
-                    ],
-                    "bar": {"color": "white"},
-                },
-                title={"text": "Recession Probability (2026–27)"}
-            ))
-            gauge.update_layout(template="plotly_dark", height=300)
-
-            # =====================================================
-            # 2) RAW COMPONENT PANEL (time series)
-            # =====================================================
-            # Convert raw dict to DataFrame for plotting
-            raw_df = pd.DataFrame(raw_dict)
-            raw_df = raw_df.sort_index().asfreq("D").ffill()
-
-            fig_raw = go.Figure()
-            for col in raw_df.columns:
-                fig_raw.add_trace(go.Scatter(
-                    x=raw_df.index,
-                    y=raw_df[col],
-                    mode="lines",
-                    name=col
-                ))
-            fig_raw.update_layout(
-                title="Recession Model Inputs — Raw Levels",
-                template="plotly_dark",
-                height=400
-            )
-
-            # =====================================================
-            # 3) Z-SCORE PANEL (bar chart)
-            # =====================================================
-            z_df = pd.DataFrame.from_dict(z_dict, orient="index", columns=["Z-Score"])
-
-            fig_z = go.Figure()
-            fig_z.add_trace(go.Bar(
-                x=z_df.index,
-                y=z_df["Z-Score"],
-                name="Z-Scores"
+
+    # ---------- INTRADAY STREAM ----------
+    app.clientside_callback(
+        ClientsideFunction(namespace="panels", function_name="intraday_poll"),
+        Output("intraday-poll", "disabled"),
+        Input("tabs", "value"),
+        State("intraday-tab", "data"),
+    )
+
+    @app.callback(
+        Output({"type": "intraday-graph", "name": ALL}, "extendData"),
+        Output({"type": "intraday-state", "name": ALL}, "data"),
+
+        Input("intraday-poll", "n_intervals"),
+        State({"type": "intraday-state", "name": ALL}, "data"),
+        prevent_initial_call=True,
+    )
+    @timed_callback("stream_intraday")
+    def stream_intraday(n, states):
+        # only bars newer than the browser's last one; maxPoints keeps the
+        # client figure as bounded as the server's ring buffers
+        graphs = ctx.outputs_list[0]
+        if intraday is None or not states or states[0]["version"] == intraday.version:
+            return [no_update] * len(graphs), [no_update] * len(states)
+
+        import numpy as np
+        import pandas as pd
+
+        state = states[0]
+        times, z, score = intraday.since(state["last"] * 1_000_000)
+        if len(times) == 0:
+            return [no_update] * len(graphs), [dict(state, version=intraday.version)]
+
+        x = [t.isoformat() for t in pd.to_datetime(times)]
+        columns = {
+            "stress": [score[:, 0]],
+            "zscores": [z[:, intraday.columns.index(c)] for c in state["zcols"]],
+        }
+        extend = []
+        for graph in graphs:
+            ys = columns[graph["id"]["name"]]
+            extend.append((
+                {"x": [x] * len(ys), "y": [np.where(np.isnan(y), None, y).tolist() for y in ys]},
+                list(range(len(ys))),
+                intraday.capacity,
             ))
-            fig_z.update_layout(
-                title="Component Z-Scores",
-                template="plotly_dark",
-                height=400
-            )
-
-            # Return three visual elements vertically stacked
-            return html.Div([
-                dcc.Graph(figure=gauge),
-                dcc.Graph(figure=fig_raw),
-                dcc.Graph(figure=fig_z),
-            ])
-
-
-
-        # ---------- STRESS SCORE PANEL ----------
-        if selected_group == "Stress Score":
-
-            raw = add_credit_ratio(raw)
-            z = compute_zscore(raw)
-            MSS = compute_stress_score(z)
-
-            if MSS.empty:
-                return html.Div([
-                    html.H3("Stress Score unavailable"),
-                    html.P(
-                        "Data for required indicators could not be fetched. "
-                        "If using Render, Yahoo may temporarily block rate-limited endpoints. "
-                        "Please refresh or wait a few seconds.",
-                        style={"color": "orange"}
-                    )
-                ])
-
-            gauge = make_stress_gauge(
-                MSS.iloc[-1]["Stress Score"],
-                MSS["Stress Score"].mean()
-            )
-            line = make_timeseries_panel(MSS, "Stress Score Trend")
-
-            return html.Div([dcc.Graph(figure=gauge), dcc.Graph(figure=line)])
-
-        # ---------- REGULAR PANELS ----------
-        raw = add_credit_ratio(raw)
-        cols = (
-            ["HYG", "JNK", "LQD", "HYG/LQD"]
-            if selected_group == "Credit Risk"
-            else RISK_TICKERS[selected_group]
-        )
-
-        # Keep only tickers that exist in yahooquery output
-        existing_cols = [c for c in cols if c in raw.columns]
-
-        if not existing_cols:
-            return html.Div([
-                html.H3(f"No data found for {selected_group}"),
-                html.P("Yahooquery did not return any valid tickers.",
-                       style={"color": "orange"})
-            ])
-
-        df = raw[existing_cols].dropna()
-        z = compute_zscore(df)
-
-        return html.Div([
-            dcc.Graph(figure=make_timeseries_panel(df, f"{selected_group} — Levels")),
-            dcc.Graph(figure=make_timeseries_panel(z, f"{selected_group} — Z-Scores"))
-        ])
+        METRICS.inc("panel_updates_total", mode="intraday")
+        return extend, [dict(state, version=intraday.version, last=int(times[-1] // 1_000_000))]
+
+    @app.callback(
+        Output({"type": "ts-graph", "title": MATCH}, "figure"),
+        Input({"type": "ts-graph", "title": MATCH}, "relayoutData"),
+        State({"type": "ts-graph", "title": MATCH}, "id"),
+        State("panel-state", "data"),
+        prevent_initial_call=True,
+    )
+    @timed_callback("zoom_timeseries")
+    def zoom_timeseries(relayout, graph_id, state):
+        # Re-render with full resolution inside the visible window only
+        from figures import make_timeseries_panel, relayout_x_range
+        from patches import held_frame
+
+        changed, x_range = relayout_x_range(relayout)
+        snap = worker.snapshot
+        source = snap.frame(graph_id["title"]) if snap is not None else None
+        if not changed or source is None:
+            return no_update
+
+        df, layout = source
+        # only the bars the panel state says the client holds: a newer
+        # snapshot's bars arrive with the next refresh patch, not twice
+        df = held_frame(df, state, graph_id["title"])
+        fig = make_timeseries_panel(df, graph_id["title"], x_range=x_range)
+        fig.update_layout(layout)
+        return fig
@@ -0,0 +1,40 @@
+# client_store.py
+import numpy as np
+import pandas as pd
+
+from figures import make_timeseries_panel
+
+# Decimal places kept in the payload (prices, yields and z-scores)
+PRECISION = 4
+
+
+def encode_frame(df):
+    """
+    Columnar encoding: one shared epoch-ms index array plus one value
+    array per column (NaN -> null). Much smaller than per-trace JSON.
+    """
+    index = pd.DatetimeIndex(df.index)
+    values = np.round(df.to_numpy(dtype="float64"), PRECISION)
+    return {
+        "index": index.as_unit("ms").asi8.tolist(),
+        "columns": {
+            str(col): [None if np.isnan(v) else float(v) for v in values[:, i]]
+            for i, col in enumerate(df.columns)
+        },
+    }
+
+
+def build_payload(version, group_frames):
+    """
+    group_frames: tab -> (levels, zscores).
+    `layout` is the server-side panel layout, so client figures match.
+    """
+    base = make_timeseries_panel(pd.DataFrame(), "").layout.to_plotly_json()
+    return {
+        "version": version,
+        "layout": base,
+        "groups": {
+            tab: {"levels": encode_frame(levels), "zscores": encode_frame(z)}
+            for tab, (levels, z) in group_frames.items()
+        },
+    }
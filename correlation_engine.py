@@ -0,0 +1,234 @@
+# correlation_engine.py
+import numpy as np
+import pandas as pd
+
+from zscore_engine import REVISION_DEPTH, first_revision
+
+# Trading days in the rolling window and before a pair's correlation is reported
+DEFAULT_WINDOW = 63
+DEFAULT_MIN_PERIODS = 20
+# Half-life (bars) of the correlation "norm" that regime shifts are measured against
+NORM_HALFLIFE = 126
+
+
+# ----------------------------------------------------------
+# 1) ROLLING PAIRWISE MOMENTS
+# ----------------------------------------------------------
+class RollingCorrelation:
+    """
+    Rolling-window covariance / correlation across every column pair,
+    NaN-aware (pairwise complete, like df.rolling().corr()).
+
+    State is the last `window` rows plus pairwise running sums
+        N[i, j]    rows where both i and j are present
+        Sx[i, j]   sum of x_i over those rows
+        Sxx[i, j]  sum of x_i^2 over those rows
+        P[i, j]    sum of x_i * x_j
+    so each new bar is one rank-2 update (oldest row out, new row in),
+    O(columns^2), instead of re-scanning the window. update(df) processes only rows
+    newer than the last one seen, and revised rows are undone and processed
+    again, like zscore_engine.RollingZScore.
+
+    Per bar it records the correlation-stress measures
+        Avg |ρ|       mean absolute off-diagonal correlation
+        Regime Shift  mean |ρ - norm| against an EWM of past matrices
+    (correlations converging, or pairs such as EEM / UUP flipping sign).
+    """
+
+    RESYNC_EVERY = 100   # windows; recompute sums from the tail to stop drift
+
+    def __init__(self, window=DEFAULT_WINDOW, min_periods=DEFAULT_MIN_PERIODS,
+                 norm_halflife=NORM_HALFLIFE):
+        self.window = window
+        self.min_periods = min(min_periods, window)
+        self.norm_alpha = 1 - np.exp(np.log(0.5) / norm_halflife)
+        self.reset()
+
+    def reset(self):
+        self.columns = None
+        self.last_index = None
+        self.history = None
+        self.seen = None
+
+    def _init_state(self, n_cols):
+        self.shift = None
+        # ring of the window rows plus REVISION_DEPTH older ones, so revised rows can be undone
+        self.tail = np.full((self.window + REVISION_DEPTH, n_cols), np.nan)
+        self.pos = 0                                    # ring position of the oldest row
+        self.saved = []                                 # norm before each of the last rows
+        self.N = np.zeros((n_cols, n_cols))
+        self.Sx = np.zeros((n_cols, n_cols))
+        self.Sxx = np.zeros((n_cols, n_cols))
+        self.P = np.zeros((n_cols, n_cols))
+        self.norm = None
+        self._off = ~np.eye(n_cols, dtype=bool)
+        self._since_resync = 0
+
+    # -------------------------------------------------------
+    # updates
+    # -------------------------------------------------------
+    def update(self, df):
+        """
+        {"corr": latest correlation frame, "cov": latest covariance frame,
+         "stress": Avg |ρ| / Regime Shift per bar, aligned to df.index}
+        """
+        df = df.sort_index()
+        if self.columns is None or list(df.columns) != self.columns:
+            self.reset()
+            self.columns = list(df.columns)
+            self._init_state(len(self.columns))
+
+        revised = first_revision(self.seen, df)
+        if revised is not None:
+            self._revise(revised)
+
+        new = df if self.last_index is None else df[df.index > self.last_index]
+        if not new.empty:
+            stress = pd.DataFrame(self._step(new.to_numpy(dtype="float64")), index=new.index,
+                                  columns=["Avg |ρ|", "Regime Shift"])
+            self.history = stress if self.history is None else pd.concat([self.history, stress])
+            self.seen = new if self.seen is None else pd.concat([self.seen, new])
+            self.last_index = new.index[-1]
+
+        if self.history is None:
+            stress = pd.DataFrame(index=df.index, columns=["Avg |ρ|", "Regime Shift"], dtype="float64")
+        else:
+            # bounded memory: keep only the span the caller still holds
+            self.history = self.history[self.history.index >= df.index[0]]
+            self.seen = self.seen[self.seen.index >= df.index[0]]
+            stress = self.history.reindex(df.index)
+
+        return {
+            "corr": pd.DataFrame(self.corr(), index=self.columns, columns=self.columns),
+            "cov": pd.DataFrame(self.cov(), index=self.columns, columns=self.columns),
+            "stress": stress,
+        }
+
+    def _revise(self, since):
+        """Forget rows from `since` on, so update() processes them again."""
+        keep = self.seen.index < since
+        if not keep.any() or not self._rewind(int((~keep).sum())):
+            columns = self.columns
+            self.reset()
+            self.columns = columns
+            self._init_state(len(columns))
+            return
+        self.seen = self.seen[keep]
+        self.history = self.history[self.history.index < since]
+        self.last_index = self.seen.index[-1]
+
+    def _step(self, x):
+        if self.shift is None:
+            first = pd.DataFrame(x).bfill().to_numpy()[0]
+            self.shift = np.nan_to_num(first)
+        x = x - self.shift
+
+        out = np.full((len(x), 2), np.nan)
+        sign = np.array([[-1.0], [1.0]])
+        size = len(self.tail)
+        for i, row in enumerate(x):
+            # the row `window` bars back leaves and the new one enters in one rank-2 update
+            leave = (self.pos + size - self.window) % size
+            self._add(np.vstack([self.tail[leave], row]), sign)
+            self.tail[self.pos] = row
+            self.pos = (self.pos + 1) % size
+            self.saved = (self.saved + [None if self.norm is None else self.norm.copy()])[-REVISION_DEPTH:]
+            out[i] = self._stress(self.corr())
+
+        self._since_resync += len(x)
+        if self._since_resync >= self.RESYNC_EVERY * self.window:
+            self._resync()
+        return out
+
+    def _add(self, rows, sign):
+        valid = ~np.isnan(rows)
+        v = valid.astype("float64")
+        r = np.where(valid, rows, 0.0)
+        sv, sr = sign * v, sign * r
+        self.N += sv.T @ v
+        self.Sx += sr.T @ v
+        self.Sxx += (sr * r).T @ v
+        self.P += sr.T @ r
+
+    def _rewind(self, rows):
+        """Undo the last `rows` processed rows; False if that is not possible."""
+        if rows > len(self.saved):
+            return False
+        if rows:
+            size = len(self.tail)
+            self.pos = (self.pos - rows) % size
+            self.tail[(self.pos + np.arange(rows)) % size] = np.nan
+            self.norm = self.saved[-rows]
+            del self.saved[-rows:]
+            self._resync()
+        return True
+
+    def _resync(self):
+        window = self.tail[(self.pos - self.window + np.arange(self.window)) % len(self.tail)]
+        valid = ~np.isnan(window)
+        v = valid.astype("float64")
+        t = np.where(valid, window, 0.0)
+        self.N, self.Sx, self.Sxx, self.P = v.T @ v, t.T @ v, (t * t).T @ v, t.T @ t
+        self._since_resync = 0
+
+    # -------------------------------------------------------
+    # matrices and stress measures
+    # -------------------------------------------------------
+    def cov(self):
+        """Pairwise covariance (ddof=1) over the current window."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            c = (self.P - self.Sx * self.Sx.T / self.N) / (self.N - 1)
+        c[self.N < self.min_periods] = np.nan
+        return c
+
+    def corr(self):
+        """Pairwise correlation over the current window."""
+        N, Sx = self.N, self.Sx
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vx = N * self.Sxx - Sx * Sx                 # variance of i on rows shared with j
+            c = (N * self.P - Sx * Sx.T) / np.sqrt(vx * vx.T)
+        c[(N < self.min_periods) | ~(vx > 0) | ~(vx.T > 0)] = np.nan
+        return np.clip(c, -1.0, 1.0)
+
+    def _stress(self, c):
+        off = c[self._off]
+        ok = ~np.isnan(off)
+        if not ok.any():
+            return np.nan, np.nan
+        avg = np.abs(off[ok]).mean()
+
+        if self.norm is None:
+            self.norm = c.copy()
+        shift = np.abs(c - self.norm)[self._off]
+        shift = shift[~np.isnan(shift)].mean() if (~np.isnan(shift)).any() else np.nan
+
+        # norm follows each pair once it has a correlation
+        seen = ~np.isnan(c)
+        self.norm = np.where(seen & np.isnan(self.norm), c, self.norm)
+        self.norm = np.where(seen, self.norm + self.norm_alpha * (c - self.norm), self.norm)
+        return avg, shift
+
+
+# ----------------------------------------------------------
+# 2) INPUTS: per-bar changes across groups
+# ----------------------------------------------------------
+def bar_changes(frames, diff_columns=()):
+    """
+    One dates x series frame of bar-to-bar changes: percent change for
+    prices, first difference for `diff_columns` (rates, spreads, indices
+    that can be <= 0). Each frame is differenced on its own dates before
+    the outer join, so a missing bar never spans two groups.
+    """
+    parts = []
+    for df in frames:
+        if df is None or df.empty:
+            continue
+        df = df.sort_index()
+        diffs = [c for c in df.columns if c in diff_columns]
+        pct = [c for c in df.columns if c not in diff_columns]
+        parts.append(pd.concat([df[pct].pct_change(fill_method=None), df[diffs].diff()], axis=1)[df.columns])
+    if not parts:
+        return pd.DataFrame()
+    out = pd.concat(parts, axis=1, sort=True)
+    out = out.loc[:, ~out.columns.duplicated()]
+    return out.replace([np.inf, -np.inf], np.nan).iloc[1:]
@@ -1,7 +1,13 @@
 # data_fetching.py
+import time
+
 import pandas as pd
-from yahooquery import Ticker
-from pandas_datareader import data as web
+from cache import RefreshMemo
+from price_store import PRICE_STORE, period_start, normalize_index
+from fred_client import FRED_CLIENT
+from yahoo_chart import YAHOO_CHART
+from singleflight import single_flight
+from metrics import METRICS, record_request
 
 # ----------------------------------------------------------
 # 1) FRED MACRO SERIES
@@ -15,32 +21,41 @@ FRED_SERIES = {
     "DGS30": "DGS30",             # 30Y Treasury yield
 }
 
+# History window for the macro panels
+FRED_PERIOD = "5y"
 
-def fetch_fred():
-    """Fetch FRED macro data with safe fallback."""
-    macro = pd.DataFrame()
 
-    for col, fred_code in FRED_SERIES.items():
-        try:
-            df = web.DataReader(fred_code, "fred")
+@single_flight
+def fetch_fred():
+    """
+    Fetch FRED macro data concurrently (incremental via PRICE_STORE).
+    Failed series are logged and listed in FRED_CLIENT.last_errors.
+    Each column keeps its native frequency (NaN between observations);
+    use alignment.asof_join to put them on a common calendar.
+    """
+    with METRICS.timer("stage_seconds", stage="fetch", node="fred"):
+        frames, errors = FRED_CLIENT.fetch_many(
+            FRED_SERIES.values(), start=period_start(FRED_PERIOD), store=PRICE_STORE
+        )
+
+    with METRICS.timer("stage_seconds", stage="merge", node="fred"):
+        macro = pd.DataFrame()
+        for col, fred_code in FRED_SERIES.items():
+            if fred_code not in frames:
+                continue
+            df = frames[fred_code].copy()
             df.columns = [col]
             macro = macro.join(df, how="outer")
-        except Exception:
-            continue
 
-    return macro.ffill()
+        return macro
 
 
 # ----------------------------------------------------------
 # 2) YAHOOQUERY MARKET PRICES
 # ----------------------------------------------------------
-def fetch_yahoo_prices(ticker_groups):
-    tickers = sum(ticker_groups.values(), [])
-
-    tq = Ticker(tickers, asynchronous=True, max_workers=8)
-    data = tq.history(period="1y", interval="1d")
-
-    if data is None or data.empty:
+def _close_frame(data, tickers):
+    """yahooquery history() output -> wide frame of closes, one column per ticker."""
+    if not isinstance(data, pd.DataFrame) or data.empty:
         return pd.DataFrame()
 
     # MultiIndex case: (ticker, date)
@@ -60,29 +75,135 @@ def fetch_yahoo_prices(ticker_groups):
             df = data[["close"]]
         else:
             return pd.DataFrame()
+        df.columns = tickers[:1]
 
-    df = df.ffill().dropna(how="all")
-    df = df[[c for c in df.columns if c in tickers]]
-    return df
+    return df[[c for c in df.columns if c in tickers]]
 
 
-# ----------------------------------------------------------
-# 3) MERGE YAHOO + FRED
-# ----------------------------------------------------------
-def fetch_data(ticker_groups):
+def _download_closes(tickers, interval, **window):
+    if YAHOO_CHART is not None:
+        data = YAHOO_CHART.history(tickers, interval=interval, **window)
+    else:
+        # imported here: yahooquery is slow to import and unused with YAHOO_BASE_URL
+        from yahooquery import Ticker
+
+        # one batched call: latency is recorded for the batch, not per symbol
+        started = time.perf_counter()
+        tq = Ticker(tickers, asynchronous=True, max_workers=8)
+        data = tq.history(interval=interval, **window)
+        record_request("yahooquery", "batch", started, "ok" if isinstance(data, pd.DataFrame) else "error")
+    return _close_frame(data, tickers)
+
+
+# Completed bars re-downloaded on every warm refresh to detect re-adjusted history
+ADJUST_OVERLAP = pd.Timedelta(days=7)
+# Relative difference in a completed adjusted close that means history was re-adjusted
+ADJUST_TOLERANCE = 1e-6
+
+
+def _adjustment_changed(stored, fresh):
     """
-    Unified fetcher:
-    - yahooquery market data (ETF, vol, FX)
-    - FRED macro data (credit, yields, liquidity)
+    True if a completed bar (before the last stored one, which may still
+    have been forming) differs between the store and upstream.
     """
-    yahoo_df = fetch_yahoo_prices(ticker_groups)
-    fred_df = fetch_fred()
+    stored = stored.dropna()
+    fresh = normalize_index(fresh.to_frame()).iloc[:, 0]
+    common = stored.index[:-1].intersection(fresh.index)
+    if common.empty:
+        return False
+    old, new = stored.loc[common].to_numpy(), fresh.loc[common].to_numpy()
+    return bool((abs(new - old) > ADJUST_TOLERANCE * abs(old)).any())
 
-    if yahoo_df.empty and fred_df.empty:
-        return pd.DataFrame()
 
-    # Merge on datetime index
-    full = yahoo_df.join(fred_df, how="outer")
+@single_flight
+def fetch_yahoo_prices(ticker_groups, period="1y", interval="1d", store=PRICE_STORE):
+    """
+    Closes for every ticker in ticker_groups, served from the local store.
+    Only bars after the last stored date are downloaded (plus a short
+    overlap; a symbol whose overlap was re-adjusted is rewritten in full);
+    symbols checked within store.min_refresh are not fetched at all.
+    """
+    tickers = list(dict.fromkeys(sum(ticker_groups.values(), [])))
+    namespace = f"yahoo_{interval}"
+    start = period_start(period)
+
+    stale = [t for t in tickers
+             if not (store.covers(namespace, t, start) and store.is_fresh(namespace, t))]
+    warm = [t for t in stale
+            if store.covers(namespace, t, start) and store.last_date(namespace, t) is not None]
+    cold = [t for t in stale if t not in warm]
+
+    # ---- full history for symbols never stored ----
+    if cold:
+        with METRICS.timer("stage_seconds", stage="fetch", node="yahoo_cold"):
+            df = _download_closes(cold, interval, period=period)
+        for t in cold:
+            if t in df.columns:
+                store.write(namespace, t, df[[t]].dropna(), start)
+
+    # ---- append-only refresh for stored symbols ----
+    rebase = []
+    if warm:
+        # re-read a few completed bars: adjusted closes change after a dividend / split
+        since = min(store.last_date(namespace, t) for t in warm) - ADJUST_OVERLAP
+        with METRICS.timer("stage_seconds", stage="fetch", node="yahoo_warm"):
+            df = _download_closes(warm, interval, start=since.strftime("%Y-%m-%d"))
+        for t in warm:
+            if t not in df.columns:
+                store.touch(namespace, t)
+            elif _adjustment_changed(store.read(namespace, t)[t], df[t].dropna()):
+                rebase.append(t)
+            else:
+                store.append(namespace, t, df[[t]].dropna())
+
+    # ---- full rewrite when the stored adjustment basis is out of date ----
+    if rebase:
+        METRICS.inc("price_store_rebases_total", len(rebase))
+        for t in rebase:
+            first = store.requested_start(namespace, t)
+            window = {"period": "max"} if first is None else {"start": first.strftime("%Y-%m-%d")}
+            with METRICS.timer("stage_seconds", stage="fetch", node="yahoo_rebase"):
+                df = _download_closes([t], interval, **window)
+            if t in df.columns:
+                store.write(namespace, t, df[[t]].dropna(), first)
+            else:
+                store.touch(namespace, t)
+
+    with METRICS.timer("stage_seconds", stage="merge", node="yahoo"):
+        frames = [store.read(namespace, t, start) for t in tickers]
+        frames = [f for f in frames if f is not None and not f.empty]
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, axis=1)
+        return df.ffill().dropna(how="all")
+
+
+def fetch_intraday_closes(tickers, interval="1m", period="1d"):
+    """Latest intraday closes straight from upstream (not stored), naive UTC index."""
+    df = _download_closes(list(tickers), interval, period=period)
+    return df if df.empty else normalize_index(df)
+
+
+# ----------------------------------------------------------
+# 3) PER-REFRESH MEMO FOR THE PANEL GRAPH
+# ----------------------------------------------------------
+DATA_CACHE = RefreshMemo()
+
+
+def get_yahoo_prices(tickers, period="1y", interval="1d"):
+    """Memoized fetch_yahoo_prices for a flat ticker list (one panel's inputs)."""
+    key = ("yahoo", tuple(sorted(set(tickers))), period, interval)
+
+    df = DATA_CACHE.get(
+        key,
+        lambda: fetch_yahoo_prices({"tickers": list(tickers)}, period, interval),
+        valid=lambda d: not d.empty,
+    )
+    return df.copy()
+
 
-    # Forward fill for daily alignment
-    return full.ffill()
+def get_fred():
+    """Memoized fetch_fred."""
+    df = DATA_CACHE.get(("fred",), fetch_fred, valid=lambda d: not d.empty)
+    return df.copy()
@@ -0,0 +1,92 @@
+# downsample.py
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------------------------------------
+# 1) SHAPE-PRESERVING REDUCERS
+# ----------------------------------------------------------
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets. Returns indices of the kept points
+    (first and last always kept). x must be numeric and increasing.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # average of the next bucket (or the last point)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
+
+
+def minmax(y, n_out):
+    """Min/max per bucket (2 points per bucket), fully vectorized."""
+    n = len(y)
+    n_buckets = max(1, n_out // 2)
+    if n <= n_out:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)[:-1]
+    lo = np.minimum.reduceat(y, edges)
+    hi = np.maximum.reduceat(y, edges)
+
+    # position of each bucket's min / max
+    bucket = np.repeat(np.arange(n_buckets), np.diff(np.append(edges, n)))
+    is_lo = y == lo[bucket]
+    is_hi = y == hi[bucket]
+    first_lo = np.unique(bucket[is_lo], return_index=True)[1]
+    first_hi = np.unique(bucket[is_hi], return_index=True)[1]
+
+    idx = np.concatenate([np.flatnonzero(is_lo)[first_lo], np.flatnonzero(is_hi)[first_hi]])
+    return np.unique(np.concatenate([[0, n - 1], idx]))
+
+
+# ----------------------------------------------------------
+# 2) SERIES HELPER
+# ----------------------------------------------------------
+def downsample_series(s, n_out, method="lttb"):
+    """Drop NaNs and reduce a time series to about n_out points."""
+    s = s.dropna()
+    if len(s) <= n_out:
+        return s
+
+    y = s.to_numpy(dtype="float64")
+    if method == "minmax":
+        idx = minmax(y, n_out)
+    else:
+        x = s.index.asi8 if isinstance(s.index, pd.DatetimeIndex) else np.arange(len(s))
+        idx = lttb(x.astype("float64"), y, n_out)
+    return s.iloc[idx]
+
+
+def window_series(s, n_out, x_range, method="lttb"):
+    """
+    Full resolution inside x_range (capped at 10x budget), downsampled
+    overview outside it, so zooming out still shows the whole history.
+    """
+    s = s.dropna()
+    x0, x1 = pd.Timestamp(x_range[0]), pd.Timestamp(x_range[1])
+    inside = s[(s.index >= x0) & (s.index <= x1)]
+    before, after = s[s.index < x0], s[s.index > x1]
+
+    return pd.concat([
+        downsample_series(before, n_out // 4, method),
+        downsample_series(inside, 10 * n_out, method),
+        downsample_series(after, n_out // 4, method),
+    ])
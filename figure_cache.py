@@ -0,0 +1,79 @@
+# figure_cache.py
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from plotly.io.json import to_json_plotly
+
+from metrics import METRICS, BYTES_BUCKETS
+
+# Upper bound on cached JSON, in bytes
+MAX_BYTES = int(os.environ.get("FIGURE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+class FigureCache:
+    """
+    LRU of already-serialized panel JSON keyed by (panel, data version),
+    evicting least recently used entries beyond `max_bytes`.
+    Each entry also keeps a small side value (the panel-state template).
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()       # key -> (json_str, extra)
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """
+        build() -> (component_or_figure, extra).
+        Returns (parsed JSON, extra); parsing cached JSON skips Plotly
+        validation and re-encoding of the figures.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        METRICS.inc("cache_requests_total", cache="figure", result="miss" if entry is None else "hit")
+
+        if entry is None:
+            with METRICS.timer("stage_seconds", stage="figure", node="build"):
+                obj, extra = build()
+            with METRICS.timer("stage_seconds", stage="figure", node="serialize"):
+                entry = (to_json_plotly(obj), extra)
+            self._put(key, entry)
+            with self._lock:
+                self.misses += 1
+
+        METRICS.observe("payload_bytes", len(entry[0]), buckets=BYTES_BUCKETS, kind="panel")
+        return json.loads(entry[0]), entry[1]
+
+    def _put(self, key, entry):
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old[0])
+            self._entries[key] = entry
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted[0])
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+FIGURE_CACHE = FigureCache()
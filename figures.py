@@ -1,12 +1,36 @@
 # figures.py
 import plotly.graph_objects as go
+from downsample import downsample_series, window_series
+
+# Target plot width; about two points per pixel are kept per trace
+DEFAULT_WIDTH_PX = 1200
+
+# Above this many points in a figure, traces are drawn with WebGL
+WEBGL_THRESHOLD = 5000
+
+
+def make_timeseries_panel(df, title, width_px=DEFAULT_WIDTH_PX, x_range=None):
+    """
+    Line panel, one trace per column.
+    Each series is LTTB-downsampled to ~2 points per pixel; with x_range
+    (the visible zoom window) that window keeps its original resolution.
+    """
+    budget = 2 * width_px
+    series = {
+        col: (window_series(df[col], budget, x_range) if x_range
+              else downsample_series(df[col], budget))
+        for col in df.columns
+    }
+
+    total_points = sum(len(s) for s in series.values())
+    Trace = go.Scattergl if total_points > WEBGL_THRESHOLD else go.Scatter
 
-def make_timeseries_panel(df, title):
     fig = go.Figure()
 
-    for col in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df[col], mode="lines", name=col
+    # plain lists (not typed arrays) so refreshes can extend traces via dash.Patch
+    for col, s in series.items():
+        fig.add_trace(Trace(
+            x=s.index.tolist(), y=s.tolist(), mode="lines", name=col
         ))
 
     fig.update_layout(
@@ -14,10 +38,27 @@ def make_timeseries_panel(df, title):
         template="plotly_dark",
         height=480,
         margin=dict(l=40, r=40, t=60, b=40),
-        legend=dict(orientation="h", y=-0.3)
+        legend=dict(orientation="h", y=-0.3),
+        uirevision=title,           # keep zoom / legend state across updates
     )
     return fig
 
+def relayout_x_range(relayout):
+    """
+    Visible x window from a dcc.Graph relayoutData event.
+    Returns (changed, x_range); x_range is None after an autorange reset.
+    """
+    if not relayout:
+        return False, None
+    if relayout.get("xaxis.autorange"):
+        return True, None
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        return True, (relayout["xaxis.range[0]"], relayout["xaxis.range[1]"])
+    if "xaxis.range" in relayout:
+        return True, tuple(relayout["xaxis.range"])
+    return False, None
+
+
 def make_stress_gauge(current, mean):
     fig = go.Figure(go.Indicator(
         mode="gauge+number+delta",
@@ -0,0 +1,219 @@
+# fred_client.py
+import io
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from singleflight import single_flight
+from metrics import METRICS, record_request
+
+log = logging.getLogger(__name__)
+
+FRED_BASE_URL = os.environ.get("FRED_BASE_URL", "https://fred.stlouisfed.org")
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class FredError(Exception):
+    pass
+
+
+class CircuitOpenError(FredError):
+    pass
+
+
+# ----------------------------------------------------------
+# 1) PER-SERIES CIRCUIT BREAKER
+# ----------------------------------------------------------
+class CircuitBreaker:
+    """
+    closed    -> requests pass, failures counted
+    open      -> requests rejected until reset_timeout has passed
+    half-open -> one trial request; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open":
+                return False
+            if self.state == "half-open":
+                # let exactly one trial through, keep others out
+                self.opened_at = time.monotonic()
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+# ----------------------------------------------------------
+# 2) POOLED, RETRYING FRED CLIENT
+# ----------------------------------------------------------
+class FredClient:
+    """
+    Concurrent FRED client.
+
+    - one pooled requests.Session shared by all worker threads
+    - per-request (connect, read) timeouts
+    - exponential backoff with jitter on network errors / 429 / 5xx
+    - circuit breaker per series
+    - fetch_many() has an overall deadline and reports per-series errors
+    """
+
+    def __init__(self, base_url=FRED_BASE_URL, max_workers=6, timeout=(3.05, 10),
+                 retries=3, backoff=0.5, deadline=20):
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.deadline = deadline
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fred")
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self.last_errors = {}
+
+    # -------------------------------------------------------
+    # single series
+    # -------------------------------------------------------
+    @single_flight
+    def fetch(self, series, start=None):
+        """One FRED series as a single-column frame, retried and circuit-broken."""
+        breaker = self._breaker(series)
+        if not breaker.allow():
+            METRICS.inc("upstream_requests_total", source="fred", outcome="circuit_open")
+            raise CircuitOpenError(f"{series}: circuit open after repeated failures")
+
+        try:
+            df = self._get_with_retries(series, start)
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        return df
+
+    def _get_with_retries(self, series, start):
+        params = {"id": series}
+        if start is not None:
+            params["cosd"] = pd.Timestamp(start).strftime("%Y-%m-%d")
+
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                resp = self.session.get(
+                    f"{self.base_url}/graph/fredgraph.csv",
+                    params=params, timeout=self.timeout,
+                )
+            except requests.RequestException as e:
+                error = e
+                record_request("fred", series, started, type(e).__name__)
+            else:
+                record_request("fred", series, started, resp.status_code)
+                if resp.status_code not in RETRY_STATUS:
+                    resp.raise_for_status()      # 4xx: not worth retrying
+                    return _parse_csv(resp.text, series)
+                error = FredError(f"{series}: HTTP {resp.status_code}")
+
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+
+        raise error
+
+    # -------------------------------------------------------
+    # many series in parallel
+    # -------------------------------------------------------
+    def fetch_many(self, series_list, start=None, store=None):
+        """
+        Fetch several series concurrently.
+
+        With a PriceStore the fetch is incremental (store.sync). Returns
+        (frames, errors): dicts keyed by series code. A series that is not
+        done by `deadline` seconds is reported as a timeout.
+        """
+        def job(series):
+            if store is None:
+                return self.fetch(series, start)
+            return store.sync("fred", series, lambda s: self.fetch(series, s), start)
+
+        futures = {self._pool.submit(job, s): s for s in dict.fromkeys(series_list)}
+        done, pending = wait(futures, timeout=self.deadline)
+
+        frames, errors = {}, {}
+        for fut in done:
+            series = futures[fut]
+            try:
+                frames[series] = fut.result()
+            except Exception as e:
+                errors[series] = f"{type(e).__name__}: {e}"
+        for fut in pending:
+            errors[futures[fut]] = f"TimeoutError: no response within {self.deadline}s"
+
+        for series, msg in errors.items():
+            log.warning("FRED fetch failed for %s (%s)", series, msg)
+
+        with self._lock:
+            for series in frames:
+                self.last_errors.pop(series, None)
+            self.last_errors.update(errors)
+
+        return frames, errors
+
+    def status(self):
+        """Breaker state and last error per series, for display / debugging."""
+        with self._lock:
+            breakers = dict(self._breakers)
+            errors = dict(self.last_errors)
+        return {
+            s: {"state": b.state, "error": errors.get(s)}
+            for s, b in breakers.items()
+        }
+
+    def _breaker(self, series):
+        with self._lock:
+            return self._breakers.setdefault(series, CircuitBreaker())
+
+
+def _parse_csv(text, series):
+    df = pd.read_csv(io.StringIO(text), index_col=0, parse_dates=True, na_values=".")
+    df.columns = [series]
+    df.index.name = "DATE"
+    return df
+
+
+FRED_CLIENT = FredClient()
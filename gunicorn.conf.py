@@ -0,0 +1,20 @@
+# gunicorn.conf.py
+# gunicorn -c gunicorn.conf.py app:server
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = 60
+
+# GUNICORN_PRELOAD=1: import the app and its pandas / figure stack once in
+# the master; forked workers share those pages and start their own threads.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "0") == "1"
+if preload_app:
+    os.environ["APP_PRELOAD"] = "1"
+
+
+def post_fork(server, worker):
+    if preload_app:
+        import app
+        app.start_background()
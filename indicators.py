@@ -1,29 +1,24 @@
 # indicators.py
 import pandas as pd
+from zscore_engine import make_engine
+from stress_engine import StressEngine, BASELINE_WEIGHTS
 
-def compute_zscore(df):
-    return (df - df.mean()) / df.std()
+def compute_zscore(df, window=None, halflife=None):
+    """
+    Full-sample z-score by default; rolling (`window` rows) or
+    exponentially weighted (`halflife` rows) when requested.
+    For repeated refreshes keep a zscore_engine instance instead.
+    """
+    if window is None and halflife is None:
+        return (df - df.mean()) / df.std()
+    return make_engine(window, halflife).update(df)
 
 def add_credit_ratio(df):
     if "HYG" in df.columns and "LQD" in df.columns:
         df["HYG/LQD"] = df["HYG"] / df["LQD"]
     return df
 
-def compute_stress_score(z):
-    z = z.copy()
-
-    needed = ["^VIX", "^VIX3M", "^VIX6M", "HYG/LQD", "^TNX", "UUP", "EEM"]
-    z = z[[c for c in needed if c in z.columns]].dropna()
-
-    MSS_raw = (
-        0.30 * z["^VIX"] +
-        0.15 * z["^VIX3M"] +
-        0.10 * z["^VIX6M"] +
-        0.25 * z["HYG/LQD"] +
-        0.15 * z["^TNX"] +
-        0.05 * z["UUP"] -
-        0.10 * z["EEM"]
-    )
-
-    MSS = 50 + 10 * MSS_raw
-    return MSS.to_frame("Stress Score")
+def compute_stress_score(z, weights=BASELINE_WEIGHTS):
+    """Single-scenario wrapper around StressEngine (missing components renormalized)."""
+    MSS = StressEngine({"Stress Score": weights}).compute(z)
+    return MSS.dropna()
@@ -0,0 +1,200 @@
+# intraday.py
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_fetching import fetch_intraday_closes
+from stress_engine import StressEngine, BASELINE_WEIGHTS
+from zscore_engine import RollingZScore
+from metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+# 1-minute bars polled from Yahoo; a bar is used once its minute has closed
+# and every symbol has reported it, or GRACE_SECONDS after the close at most
+POLL_SECONDS = float(os.environ.get("INTRADAY_POLL_SECONDS", 20))
+GRACE_SECONDS = float(os.environ.get("INTRADAY_GRACE_SECONDS", 120))
+
+BARS_PER_SESSION = 390
+CAPACITY = int(os.environ.get("INTRADAY_BARS", 5 * BARS_PER_SESSION))   # bars kept per symbol
+ZSCORE_WINDOW = BARS_PER_SESSION                                        # rolling one session
+BAR = pd.Timedelta(minutes=1)
+
+
+# ----------------------------------------------------------
+# 1) FIXED-SIZE RING BUFFER
+# ----------------------------------------------------------
+class RingBuffer:
+    """
+    Last `capacity` rows of (timestamp, values) in preallocated NumPy
+    arrays; appending overwrites the oldest rows, so memory never grows.
+    Timestamps are int64 epoch nanoseconds, strictly increasing.
+    """
+
+    def __init__(self, capacity, n_cols):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype="int64")
+        self.values = np.full((capacity, n_cols), np.nan)
+        self.start = 0
+        self.size = 0
+
+    def append(self, times, values):
+        times, values = times[-self.capacity:], values[-self.capacity:]
+        m = len(times)
+        if m == 0:
+            return
+        idx = (self.start + self.size + np.arange(m)) % self.capacity
+        self.times[idx] = times
+        self.values[idx] = values
+
+        overflow = max(0, self.size + m - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + m)
+
+    def last_time(self):
+        if self.size == 0:
+            return None
+        return int(self.times[(self.start + self.size - 1) % self.capacity])
+
+    def since(self, t=None):
+        """Rows with timestamp > t (all rows when t is None), oldest first."""
+        order = (self.start + np.arange(self.size)) % self.capacity
+        times = self.times[order]
+        k = 0 if t is None else np.searchsorted(times, t, side="right")
+        return times[k:], self.values[order[k:]]
+
+
+# ----------------------------------------------------------
+# 2) STREAM: bars -> z-scores -> stress score, per new bar
+# ----------------------------------------------------------
+class IntradayStream:
+    """
+    1-minute closes for the RISK_TICKERS universe (plus HYG/LQD).
+
+    Each poll appends only bars newer than the last one held. A closed
+    minute some symbol has not reported yet is held back until it does or
+    GRACE_SECONDS pass (then its last close is carried), because appended
+    rows are never revised and the late close would be lost. Z-scores
+    (RollingZScore over one session) and the baseline stress score are
+    computed for those rows alone from the engines' running state.
+    Prices, z-scores and scores live in ring buffers of CAPACITY bars.
+    """
+
+    def __init__(self, RISK_TICKERS, capacity=CAPACITY, interval=POLL_SECONDS):
+        self.tickers = list(dict.fromkeys(t for v in RISK_TICKERS.values() for t in v))
+        self.columns = self.tickers + (["HYG/LQD"] if {"HYG", "LQD"} <= set(self.tickers) else [])
+        self.capacity = capacity
+        self.interval = interval
+
+        n = len(self.columns)
+        self.prices = RingBuffer(capacity, n)
+        self.zscores = RingBuffer(capacity, n)
+        self.stress = RingBuffer(capacity, 1)
+
+        self.engine = RollingZScore(ZSCORE_WINDOW)
+        self.stress_engine = StressEngine({"Stress Score": BASELINE_WEIGHTS})
+        self._stress_cols = [self.columns.index(c) if c in self.columns else -1
+                             for c in self.stress_engine.components]
+        self._last_close = np.full(len(self.tickers), np.nan)
+
+        self.version = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -------------------------------------------------------
+    # polling
+    # -------------------------------------------------------
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="intraday", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll()
+            except Exception:
+                log.exception("intraday poll failed")
+            self._stop.wait(max(0, self.interval - (time.monotonic() - started)))
+
+    def poll(self):
+        with METRICS.timer("stage_seconds", stage="intraday", node="poll"):
+            bars = fetch_intraday_closes(self.tickers)
+        if not bars.empty:
+            self.ingest(bars)
+
+    # -------------------------------------------------------
+    # incremental update
+    # -------------------------------------------------------
+    def ingest(self, bars, now=None):
+        """Append closed bars newer than the last one held; returns rows added."""
+        now = pd.Timestamp.now(tz="UTC").tz_convert(None) if now is None else now
+        closed = now - BAR
+        bars = bars[bars.index <= closed].reindex(columns=self.tickers)
+
+        last = self.prices.last_time()
+        if last is not None:
+            bars = bars[bars.index.as_unit("ns").asi8 > last]
+
+        # stop at the first minute still waiting on a symbol (within the grace)
+        waiting = bars.isna().any(axis=1) & (bars.index > closed - pd.Timedelta(seconds=GRACE_SECONDS))
+        if waiting.any():
+            bars = bars.iloc[:int(waiting.to_numpy().argmax())]
+        if bars.empty:
+            return 0
+
+        # carry each symbol's last close across minutes it did not trade
+        x = bars.to_numpy(dtype="float64")
+        x = pd.DataFrame(np.vstack([self._last_close, x])).ffill().to_numpy()
+        self._last_close = x[-1].copy()
+        x = x[1:]
+
+        if len(self.columns) > len(self.tickers):
+            hyg, lqd = self.tickers.index("HYG"), self.tickers.index("LQD")
+            x = np.column_stack([x, x[:, hyg] / x[:, lqd]])
+
+        z = self.engine.push(x)
+        z_stress = np.column_stack([
+            z[:, i] if i >= 0 else np.full(len(z), np.nan) for i in self._stress_cols
+        ])
+        score = self.stress_engine.score_array(z_stress)
+
+        times = bars.index.as_unit("ns").asi8
+        with self._lock:
+            self.prices.append(times, x)
+            self.zscores.append(times, z)
+            self.stress.append(times, score)
+            self.version += 1
+
+        METRICS.inc("intraday_bars_total", len(times))
+        return len(times)
+
+    # -------------------------------------------------------
+    # reads
+    # -------------------------------------------------------
+    def since(self, t=None):
+        """
+        (times, zscores, stress) for bars newer than t (epoch ns), copied
+        under the lock so the poller can keep appending.
+        """
+        with self._lock:
+            times, z = self.zscores.since(t)
+            _, score = self.stress.since(t)
+            return times.copy(), z.copy(), score.copy()
+
+    def frames(self):
+        """Whole buffer as (z-score frame, stress score frame) for a full render."""
+        times, z, score = self.since(None)
+        index = pd.to_datetime(times)
+        return (pd.DataFrame(z, index=index, columns=self.columns),
+                pd.DataFrame(score, index=index, columns=["Stress Score"]))
@@ -1,19 +1,39 @@
 # layout.py
 from dash import html, dcc
-from signal_guide import SIGNAL_GUIDE_TEXT
+from settings import (CLIENT_TABS, CLIENTSIDE_ENABLED, INTRADAY_ENABLED, INTRADAY_TAB, PUSH_SECONDS,
+                      REFRESH_SECONDS)
 
 def build_layout(RISK_TICKERS):
+    tabs = list(RISK_TICKERS) + ([INTRADAY_TAB] if INTRADAY_ENABLED else [])
+
     return html.Div([
         html.H1("Market Risk Dashboard", style={"textAlign": "center"}),
 
-        dcc.Interval(id="refresh", interval=15 * 60 * 1000, n_intervals=0),
+        dcc.Interval(id="refresh", interval=REFRESH_SECONDS * 1000, n_intervals=0),
+        # short poll until the background worker publishes its first snapshot
+        dcc.Interval(id="snapshot-poll", interval=3 * 1000, n_intervals=0),
+        # intraday bars pushed while the Intraday tab is open (INTRADAY_MODE=1)
+        dcc.Interval(id="intraday-poll", interval=PUSH_SECONDS * 1000, n_intervals=0, disabled=True),
+        dcc.Store(id="intraday-tab", data=INTRADAY_TAB),
 
         dcc.Tabs(
             id="tabs",
             value="Volatility",
-            children=[dcc.Tab(label=k, value=k) for k in RISK_TICKERS],
+            children=[dcc.Tab(label=k, value=k) for k in tabs],
             colors={"border": "#444", "primary": "#00ccff", "background": "#222"},
         ),
 
-        html.Div(id="panel-output")
+        # server-rendered panels, plus what the client holds (for partial updates)
+        html.Div(id="panel-output"),
+        dcc.Store(id="panel-state"),
+
+        # client-rendered tabs (CLIENTSIDE_TABS=1): data arrives once per refresh
+        dcc.Store(id="market-store"),
+        dcc.Store(id="market-store-version"),
+        dcc.Store(id="client-tabs", data=CLIENT_TABS if CLIENTSIDE_ENABLED else []),
+        dcc.Store(id="server-tab"),
+        html.Div(id="client-panel", style={"display": "none"}, children=[
+            dcc.Graph(id="client-levels"),
+            dcc.Graph(id="client-zscores"),
+        ]),
     ], style={"backgroundColor": "#111111", "color": "white", "padding": "20px"})
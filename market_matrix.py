@@ -0,0 +1,209 @@
+# market_matrix.py
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:                 # Windows: no flock, every process refreshes
+    fcntl = None
+
+from data_fetching import FRED_SERIES, get_yahoo_prices, get_fred
+from recession_model import fetch_recession_inputs, compute_recession_probability, RECESSION_SERIES
+from settings import SHARED_DIR, RECESSION_DRAWS
+
+log = logging.getLogger(__name__)
+
+RECESSION_PREFIX = "recession:"
+
+MAGIC = b"MKTMAT01"
+HEADER = struct.Struct("<8sqdqqq")          # magic, version, created_at, rows, cols, names bytes
+HEADER_SIZE = 64
+
+
+# ----------------------------------------------------------
+# 1) DATA SOURCES FOR THE PANEL GRAPH
+# ----------------------------------------------------------
+class LiveSource:
+    """Raw inputs straight from the fetch layer (single-process default)."""
+
+    def __init__(self, period="1y"):
+        self.period = period
+
+    def prices(self, tickers):
+        return get_yahoo_prices(tickers, self.period)
+
+    def fred(self):
+        return get_fred()
+
+    def recession(self):
+        return compute_recession_probability(draws=RECESSION_DRAWS)
+
+
+class MatrixSource:
+    """Same inputs read from an attached MatrixView (set once per refresh)."""
+
+    def __init__(self):
+        self.view = None
+
+    def prices(self, tickers):
+        return self.view.frame(tickers).dropna(how="all").ffill()
+
+    def fred(self):
+        return self.view.frame(FRED_SERIES).dropna(how="all")
+
+    def recession(self):
+        inputs = {}
+        for code in RECESSION_SERIES:
+            col = RECESSION_PREFIX + code
+            if col in self.view.columns:
+                s = self.view.series(col).dropna()
+                inputs[code] = s.to_frame(code)
+        return compute_recession_probability(inputs, draws=RECESSION_DRAWS)
+
+
+def collect_matrix(RISK_TICKERS):
+    """
+    Every raw input the panels need as one dates x series frame, each
+    series left at its own observation dates (NaN elsewhere).
+    """
+    tickers = list(dict.fromkeys(t for v in RISK_TICKERS.values() for t in v))
+    parts = [get_yahoo_prices(tickers), get_fred()]
+
+    recession = fetch_recession_inputs()
+    parts += [df.rename(columns={code: RECESSION_PREFIX + code}) for code, df in recession.items()]
+
+    parts = [p for p in parts if p is not None and not p.empty]
+    return pd.concat(parts, axis=1).sort_index()
+
+
+# ----------------------------------------------------------
+# 2) MEMORY-MAPPED MATRIX
+# ----------------------------------------------------------
+class MatrixView:
+    """
+    Read-only, zero-copy view of one published matrix.
+    Values are column-major, so each series is one contiguous slice.
+    """
+
+    def __init__(self, mm, version, created_at, index, columns, data):
+        self._mm = mm                           # keeps the mapping alive
+        self.version = version
+        self.created_at = created_at
+        self.index = index
+        self.columns = columns
+        self.data = data
+        self._pos = {c: j for j, c in enumerate(columns)}
+
+    def series(self, column):
+        return pd.Series(self.data[:, self._pos[column]], index=self.index, name=column, copy=False)
+
+    def frame(self, columns=None):
+        columns = self.columns if columns is None else [c for c in columns if c in self._pos]
+        return pd.DataFrame({c: self.data[:, self._pos[c]] for c in columns},
+                            index=self.index, copy=False)
+
+
+class SharedMatrix:
+    """
+    Dates x series float64 matrix in a memory-mapped file (tmpfs under
+    /dev/shm when available), replaced atomically on every publish.
+
+    Layout: 64-byte header | column names (JSON) | int64 epoch-ns index |
+    float64 values, column-major. Readers re-map when the file changes.
+    """
+
+    def __init__(self, directory=SHARED_DIR, name="market"):
+        self.path = os.path.join(directory, f"{name}.mat")
+        self.lock_path = os.path.join(directory, f"{name}.lock")
+        self._lock_fd = None
+        self._view = None
+        self._stat = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    # -------------------------------------------------------
+    # refresher election
+    # -------------------------------------------------------
+    def try_lead(self):
+        """True if this process holds the refresher lock (kept until exit)."""
+        if self._lock_fd is not None:
+            return True
+        if fcntl is None:
+            return True
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._lock_fd = fd
+        log.info("pid %d is the market data refresher", os.getpid())
+        return True
+
+    # -------------------------------------------------------
+    # writer
+    # -------------------------------------------------------
+    def publish(self, df):
+        """Write df as the next version; returns the new version stamp."""
+        current = self.attach()
+        version = (current.version if current is not None else 0) + 1
+
+        index = pd.DatetimeIndex(df.index).as_unit("ns").asi8.astype("<i8")
+        values = np.asfortranarray(df.to_numpy(dtype="<f8"))
+        names = json.dumps([str(c) for c in df.columns]).encode()
+        names += b" " * (-len(names) % 8)
+
+        header = HEADER.pack(MAGIC, version, time.time(), len(index), values.shape[1], len(names))
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(names)
+            f.write(index.tobytes())
+            f.write(values.tobytes(order="F"))
+        os.replace(tmp, self.path)
+        return version
+
+    # -------------------------------------------------------
+    # readers
+    # -------------------------------------------------------
+    def attach(self):
+        """Current MatrixView, re-mapped only when a new file was published."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if self._view is None or stamp != self._stat:
+                self._view = self._map()
+                self._stat = stamp
+            return self._view
+
+    def _map(self):
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, created_at, n_rows, n_cols, names_len = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a market matrix")
+
+        offset = HEADER_SIZE
+        columns = json.loads(mm[offset:offset + names_len].decode())
+        offset += names_len
+        index = np.ndarray((n_rows,), dtype="<i8", buffer=mm, offset=offset)
+        offset += 8 * n_rows
+        data = np.ndarray((n_rows, n_cols), dtype="<f8", buffer=mm, offset=offset, order="F")
+
+        return MatrixView(mm, version, created_at, pd.DatetimeIndex(index.view("datetime64[ns]")),
+                          columns, data)
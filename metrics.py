@@ -0,0 +1,197 @@
+# metrics.py
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+slow_log = logging.getLogger("slow_callbacks")
+
+# Callbacks slower than this are logged as one JSON line (0 = off)
+SLOW_CALLBACK_SECONDS = float(os.environ.get("SLOW_CALLBACK_SECONDS", 0))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS = tuple(1024 * 4 ** i for i in range(9))          # 1 KB .. 64 MB
+
+
+class Registry:
+    """
+    In-process counters, gauges and histograms, rendered in the Prometheus
+    text format. Series are keyed by (name, sorted label items).
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}       # (name, labels) -> [bucket counts..., sum, count]
+        self._buckets = {}          # name -> bucket bounds
+        self._help = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------
+    # recording
+    # -------------------------------------------------------
+    def inc(self, name, value=1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            bounds = self._buckets.setdefault(name, buckets)
+            h = self._histograms.get(key)
+            if h is None:
+                h = self._histograms[key] = [0] * (len(bounds) + 2)
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    h[i] += 1
+            h[-2] += value
+            h[-1] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the duration of the block in `name` (seconds)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    # -------------------------------------------------------
+    # exposition
+    # -------------------------------------------------------
+    def render(self):
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+            buckets = dict(self._buckets)
+
+        lines = []
+        for kind, series in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({n for n, _ in series}):
+                lines += self._header(name, kind)
+                for (n, labels), value in sorted(series.items()):
+                    if n == name:
+                        lines.append(f"{name}{_fmt(labels)} {_num(value)}")
+
+        for name in sorted({n for n, _ in histograms}):
+            lines += self._header(name, "histogram")
+            for (n, labels), h in sorted(histograms.items()):
+                if n != name:
+                    continue
+                for bound, count in zip(buckets[name], h):
+                    lines.append(f"{name}_bucket{_fmt(labels + (('le', _num(bound)),))} {count}")
+                lines.append(f"{name}_bucket{_fmt(labels + (('le', '+Inf'),))} {h[-1]}")
+                lines.append(f"{name}_sum{_fmt(labels)} {_num(h[-2])}")
+                lines.append(f"{name}_count{_fmt(labels)} {h[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, name, kind):
+        lines = [f"# HELP {name} {self._help[name]}"] if name in self._help else []
+        return lines + [f"# TYPE {name} {kind}"]
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+def _labels(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt(labels):
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + body + "}"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+METRICS = Registry()
+
+METRICS.describe("stage_seconds", "Pipeline stage duration (fetch, compute, figure, serialize).")
+METRICS.describe("upstream_request_seconds", "Latency of one upstream HTTP request, per source and series.")
+METRICS.describe("upstream_requests_total", "Upstream HTTP requests by source and outcome.")
+METRICS.describe("cache_requests_total", "Cache lookups by cache and result (hit / miss).")
+METRICS.describe("payload_bytes", "Serialized size of data sent to the browser.")
+METRICS.describe("callback_seconds", "Dash callback duration.")
+METRICS.describe("price_store_rebases_total", "Stored Yahoo histories rewritten after a dividend / split re-adjustment.")
+METRICS.describe("price_store_revisions_total", "Stored FRED histories rewritten after upstream revised recent observations.")
+METRICS.describe("fred_series_failed", "1 if a FRED macro series is missing from the last refresh.")
+METRICS.describe("series_age_days", "Days since the last observation of a FRED series.")
+METRICS.describe("alerts_fired_total", "Threshold alerts fired, per rule.")
+METRICS.describe("alert_sink_failures_total", "Alert notifications a sink failed to deliver.")
+
+
+def record_request(source, series, started, outcome):
+    """One upstream HTTP attempt: latency since `started` (perf_counter) and outcome."""
+    METRICS.observe("upstream_request_seconds", time.perf_counter() - started,
+                    source=source, series=series)
+    METRICS.inc("upstream_requests_total", source=source, outcome=outcome)
+
+
+# ----------------------------------------------------------
+# Dash callbacks
+# ----------------------------------------------------------
+def timed_callback(name):
+    """
+    Decorator for Dash callbacks (apply below @app.callback): records
+    callback_seconds and logs calls over SLOW_CALLBACK_SECONDS as JSON.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                elapsed = time.perf_counter() - started
+                METRICS.observe("callback_seconds", elapsed, callback=name)
+                if SLOW_CALLBACK_SECONDS and elapsed >= SLOW_CALLBACK_SECONDS:
+                    slow_log.warning(json.dumps({
+                        "event": "slow_callback",
+                        "callback": name,
+                        "seconds": round(elapsed, 4),
+                        "trigger": _triggered(),
+                        "args": [_summary(a) for a in args],
+                    }, default=str))
+        return wrapper
+    return decorate
+
+
+def _triggered():
+    try:
+        from dash import ctx
+        return ctx.triggered_id
+    except Exception:
+        return None
+
+
+def _summary(value):
+    # keep the log line small: stores and figures are reduced to their keys
+    if isinstance(value, dict):
+        return {"keys": sorted(map(str, value))[:10]}
+    if isinstance(value, (list, tuple)):
+        return {"len": len(value)}
+    return value
@@ -0,0 +1,215 @@
+# panel_graph.py
+import threading
+
+import pandas as pd
+
+from indicators import add_credit_ratio, compute_stress_score
+from zscore_engine import RollingZScore
+from correlation_engine import RollingCorrelation, bar_changes
+from stress_engine import StressEngine
+from metrics import METRICS
+from market_matrix import LiveSource
+from data_fetching import FRED_SERIES
+from fred_client import FRED_CLIENT
+from alignment import asof_join, zscore_native, staleness_report, infer_frequency
+
+FRED_MACRO_COLS = ["HY_OAS", "NFCI", "TOTALSL", "DGS2", "DGS10", "DGS30"]
+
+# Rolling window (trading days) for group z-scores; exposes regime changes
+ZSCORE_WINDOW = 252
+
+# Rolling window (trading days) for cross-asset correlations; short enough to show breakdowns
+CORR_WINDOW = 63
+
+# Groups whose z-scores feed compute_stress_score
+STRESS_GROUPS = ["Volatility", "Credit Risk", "Treasury Yields", "Liquidity", "Global Risk"]
+
+
+# ----------------------------------------------------------
+# 1) DEPENDENCY GRAPH
+# ----------------------------------------------------------
+class DataGraph:
+    """Named nodes; each node is fn(*dependency_values)."""
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, name, fn, deps=()):
+        self.nodes[name] = (fn, list(deps))
+
+    def subgraph(self, targets):
+        """Topologically ordered node names needed for targets."""
+        order, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            for dep in self.nodes[name][1]:
+                visit(dep)
+            order.append(name)
+
+        for t in targets:
+            visit(t)
+        return order
+
+
+class Resolver:
+    """Computes nodes on demand, memoized for one refresh cycle (one instance per cycle)."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.values = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        if name in self.values:
+            return self.values[name]
+
+        # one computation per node even with concurrent callbacks
+        with self._node_lock(name):
+            if name not in self.values:
+                fn, deps = self.graph.nodes[name]
+                args = [self.get(d) for d in deps]
+                with METRICS.timer("stage_seconds", stage=name.split(":")[0], node=name):
+                    self.values[name] = fn(*args)
+        return self.values[name]
+
+    def resolve(self, targets):
+        for name in self.graph.subgraph(targets):
+            self.get(name)
+        return {t: self.values[t] for t in targets}
+
+    def _node_lock(self, name):
+        with self._lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+
+# ----------------------------------------------------------
+# 2) NODES AND PANEL DECLARATIONS
+# ----------------------------------------------------------
+def build_graph(RISK_TICKERS, source=None):
+    """
+    prices:<group>  -> levels:<group> -> zscore:<group>
+    zscore:<stress groups>  -> stress_z -> stress_score, stress_scenarios
+    fred_macro      -> fred_levels, fred_zscore, fred_staleness, fred_failures
+    levels:<group>, fred_macro  -> corr_changes -> correlation
+    recession
+
+    Raw inputs (prices, fred_macro, recession) come from `source`:
+    LiveSource fetches them, MatrixSource reads the shared matrix.
+    """
+    source = source or LiveSource()
+    g = DataGraph()
+
+    for group, tickers in RISK_TICKERS.items():
+        if not tickers:
+            continue
+        g.add(f"prices:{group}", lambda t=tuple(tickers): source.prices(t))
+        # engine outlives the per-cycle Resolver: refreshes only process new bars
+        engine = RollingZScore(ZSCORE_WINDOW)
+        g.add(f"zscore:{group}", engine.update, [f"levels:{group}"])
+
+        if group == "Credit Risk":
+            # HYG/LQD ratio computed once, shared by Credit Risk and Stress Score
+            g.add(f"levels:{group}", _credit_levels, [f"prices:{group}"])
+        else:
+            g.add(f"levels:{group}", lambda df: df.dropna(), [f"prices:{group}"])
+
+    stress_deps = [f"zscore:{grp}" for grp in STRESS_GROUPS if RISK_TICKERS.get(grp)]
+    g.add("stress_z", _stress_z, stress_deps)
+    g.add("stress_score", compute_stress_score, ["stress_z"])
+    g.add("stress_scenarios", lambda z: StressEngine().compute(z).dropna(how="all"), ["stress_z"])
+
+    g.add("fred_macro", source.fred)
+    g.add("fred_levels", _fred_levels, ["fred_macro"])
+    g.add("fred_zscore", _fred_zscore, ["fred_macro"])
+    g.add("fred_staleness", _fred_staleness, ["fred_macro"])
+    g.add("fred_failures", _fred_failures, ["fred_macro"])
+
+    level_nodes = [f"levels:{group}" for group, tickers in RISK_TICKERS.items() if tickers]
+    g.add("corr_changes", _corr_changes, level_nodes + ["fred_macro"])
+    # one engine across refreshes, like the group z-scores
+    g.add("correlation", RollingCorrelation(CORR_WINDOW).update, ["corr_changes"])
+
+    g.add("recession", source.recession)
+    return g
+
+
+def panel_inputs(RISK_TICKERS):
+    """Graph nodes each panel needs; Signal Guide needs none."""
+    inputs = {
+        "Signal Guide": [],
+        "FRED Macro": ["fred_levels", "fred_zscore", "fred_staleness", "fred_failures"],
+        "Recession Risk": ["recession"],
+        "Stress Score": ["stress_score", "stress_scenarios"],
+        "Correlation Regime": ["correlation"],
+    }
+    for group, tickers in RISK_TICKERS.items():
+        if tickers:
+            inputs[group] = [f"levels:{group}", f"zscore:{group}"]
+    return inputs
+
+
+def _credit_levels(prices):
+    df = add_credit_ratio(prices.copy())
+    return df[[c for c in ["HYG", "JNK", "LQD", "HYG/LQD"] if c in df.columns]].dropna()
+
+
+def _stress_z(*zscores):
+    return pd.concat(zscores, axis=1).sort_index().ffill()
+
+
+def _corr_changes(*frames):
+    *levels, macro = frames
+    # FRED levels (rates, spreads) change by difference, prices by percent
+    return bar_changes(levels + [_fred_daily(macro)], diff_columns=FRED_MACRO_COLS)
+
+
+def _fred_daily(macro):
+    """
+    Daily FRED series on trading days. Weekly / monthly ones (NFCI,
+    TOTALSL) are left out of the daily correlation: carried onto trading
+    days, their changes are zero on all but one day per release.
+    """
+    macro = _fred_macro_cols(macro)
+    daily = [c for c in macro.columns if infer_frequency(macro[c]) == "D"]
+    return asof_join(macro[daily]) if daily else None
+
+
+def _fred_macro_cols(macro):
+    return macro[[c for c in FRED_MACRO_COLS if c in macro.columns]]
+
+
+def _fred_levels(macro):
+    # native observations carried onto trading days only
+    return asof_join(_fred_macro_cols(macro))
+
+
+def _fred_zscore(macro):
+    # each series scored over its own observations, then aligned
+    return asof_join(zscore_native(_fred_macro_cols(macro)))
+
+
+def _fred_staleness(macro):
+    report = staleness_report(_fred_macro_cols(macro))
+    for series, age in report["age_days"].items():
+        METRICS.set("series_age_days", age, series=series)
+    return report
+
+
+def _fred_failures(macro):
+    """
+    Macro series missing from this refresh -> reason (last FredClient
+    error, or just "no data" when another process fetched them).
+    """
+    status = FRED_CLIENT.status()
+    failures = {}
+    for col in FRED_MACRO_COLS:
+        code = FRED_SERIES.get(col, col)
+        missing = col not in macro.columns or macro[col].dropna().empty
+        METRICS.set("fred_series_failed", int(missing), series=col)
+        if missing:
+            failures[col] = (status.get(code) or {}).get("error") or "no data"
+    return failures
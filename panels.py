@@ -0,0 +1,247 @@
+# panels.py
+import pandas as pd
+from dash import html, dcc
+import plotly.graph_objects as go
+from figures import make_timeseries_panel, make_stress_gauge
+from signal_guide import SIGNAL_GUIDE_TEXT
+from stress_engine import BASELINE_WEIGHTS
+
+
+def timeseries_graph(df, title, frames=None, layout=None):
+    """
+    dcc.Graph for a line panel. The source frame is registered in `frames`
+    so a zoom can re-render the visible window at full resolution.
+    """
+    layout = layout or {}
+    if frames is not None:
+        frames[title] = (df, layout)
+
+    fig = make_timeseries_panel(df, title)
+    fig.update_layout(layout)
+    return dcc.Graph(id={"type": "ts-graph", "title": title}, figure=fig)
+
+
+def build_panel(selected_group, data, frames=None):
+    """
+    Dash children for one tab.
+    `data` holds the resolved panel_graph nodes listed in panel_inputs().
+    """
+
+    # ---------- SIGNAL GUIDE ----------
+    if selected_group == "Signal Guide":
+        return html.Div([
+            dcc.Markdown(SIGNAL_GUIDE_TEXT, style={
+                "padding": "20px",
+                "whiteSpace": "pre-wrap",
+                "overflowY": "scroll",
+                "height": "800px"
+            })
+        ])
+
+    # ---------- FRED Macro ----------
+    if selected_group == "FRED Macro":
+        df = data["fred_levels"]
+        # Normalize by max value per series for raw display
+        df_norm = df / df.abs().max()
+        z = data["fred_zscore"]
+
+        report = data.get("fred_staleness")
+        stale = [] if report is None else [
+            f"{name} (last {row.last_observation:%Y-%m-%d}, {row.frequency})"
+            for name, row in report[report["stale"]].iterrows()
+            if pd.notna(row.last_observation)
+        ]
+        failed = [f"{name} ({error})" for name, error in (data.get("fred_failures") or {}).items()]
+        text = "; ".join(part for part in [
+            "Unavailable: " + ", ".join(failed) if failed else "",
+            "Stale: " + ", ".join(stale) if stale else "",
+        ] if part)
+        # always rendered, so graph positions stay fixed for partial updates
+        note = html.P(text, style={"color": "orange"})
+
+        return html.Div([
+            note,
+            timeseries_graph(df_norm, "Macro Levels", frames),
+            timeseries_graph(z, "Macro Z-Scores", frames)
+        ])
+    # -----------------------------------------------------
+    # RECESSION PANEL
+    # -----------------------------------------------------
+    if selected_group == "Recession Risk":
+
+        p = data["recession"]
+
+        # --- unpack the recession model results ---
+        prob = p["probability"]            # float
+        z_dict = p["z"]                    # dict of floats
+        raw_dict = p["raw"]                # dict of pd.Series
+
+        # =====================================================
+        # 1) PROBABILITY GAUGE
+        # =====================================================
+        # Bootstrap bands (5–95 and 25–75 percentiles) as inner arcs, median as the marker
+        bands = {q: v * 100 for q, v in p.get("bands", {}).items()}
+        band_steps, threshold, title = [], None, "Recession Probability (2026–27)"
+        if bands:
+            band_steps = [
+                {"range": [bands[5], bands[95]], "color": "rgba(255,255,255,0.25)", "thickness": 0.4},
+                {"range": [bands[25], bands[75]], "color": "rgba(255,255,255,0.55)", "thickness": 0.4},
+            ]
+            threshold = {"line": {"color": "black", "width": 3}, "thickness": 0.75, "value": bands[50]}
+            title += f"<br><sub>90% band {bands[5]:.0f}–{bands[95]:.0f}%, median {bands[50]:.0f}%</sub>"
+
+        gauge = go.Figure(go.Indicator(
+            mode="gauge+number",
+            value=prob * 100,
+            gauge={
+                "axis": {"range": [0, 100]},
+                "steps": [
+                    {"range": [0, 30], "color": "#2ca02c"},
+                    {"range": [30, 50], "color": "#1f77b4"},
+                    {"range": [50, 70], "color": "#ff7f0e"},
+                    {"range": [70, 100], "color": "#d62728"},
+                ] + band_steps,
+                "bar": {"color": "white"},
+                **({"threshold": threshold} if threshold else {}),
+            },
+            title={"text": title}
+        ))
+        gauge.update_layout(template="plotly_dark", height=300)
+
+        # =====================================================
+        # 1b) PROBABILITY PATH (batch prediction over history)
+        # =====================================================
+        history = (p["history"] * 100).to_frame("Recession Probability (%)")
+        path = timeseries_graph(history, "Recession Probability — History", frames,
+                                layout={"yaxis": {"range": [0, 100]}})
+
+        # =====================================================
+        # 2) RAW COMPONENT PANEL (time series)
+        # =====================================================
+        # Native frequencies (daily / monthly / annual); each trace drops its own gaps
+        raw_df = pd.DataFrame(raw_dict).sort_index()
+        raw = timeseries_graph(raw_df, "Recession Model Inputs — Raw Levels", frames,
+                               layout={"height": 400})
+
+        # =====================================================
+        # 3) Z-SCORE PANEL (bar chart)
+        # =====================================================
+        z_df = pd.DataFrame.from_dict(z_dict, orient="index", columns=["Z-Score"])
+
+        fig_z = go.Figure()
+        fig_z.add_trace(go.Bar(
+            x=z_df.index,
+            y=z_df["Z-Score"],
+            name="Z-Scores"
+        ))
+        fig_z.update_layout(
+            title="Component Z-Scores",
+            template="plotly_dark",
+            height=400
+        )
+
+        # Return the visual elements vertically stacked
+        return html.Div([
+            dcc.Graph(figure=gauge),
+            path,
+            raw,
+            dcc.Graph(figure=fig_z),
+        ])
+
+
+
+    # ---------- STRESS SCORE PANEL ----------
+    if selected_group == "Stress Score":
+
+        MSS = data["stress_score"]
+
+        if MSS.empty:
+            return html.Div([
+                html.H3("Stress Score unavailable"),
+                html.P(
+                    "Data for required indicators could not be fetched. "
+                    "If using Render, Yahoo may temporarily block rate-limited endpoints. "
+                    "Please refresh or wait a few seconds.",
+                    style={"color": "orange"}
+                )
+            ])
+
+        gauge = make_stress_gauge(
+            MSS.iloc[-1]["Stress Score"],
+            MSS["Stress Score"].mean()
+        )
+        line = timeseries_graph(MSS, "Stress Score Trend", frames)
+        scenarios = timeseries_graph(
+            data["stress_scenarios"], "Stress Score — Weighting Scenarios", frames
+        )
+
+        return html.Div([dcc.Graph(figure=gauge), line, scenarios])
+
+    # ---------- CORRELATION REGIME PANEL ----------
+    if selected_group == "Correlation Regime":
+
+        result = data["correlation"]
+        corr = result["corr"]
+
+        heatmap = go.Figure(go.Heatmap(
+            z=corr.to_numpy(),
+            x=list(corr.columns),
+            y=list(corr.index),
+            zmin=-1, zmax=1,
+            colorscale="RdBu_r",
+            colorbar={"title": "ρ"},
+        ))
+        heatmap.update_layout(
+            title="Rolling Correlation — Latest Window",
+            template="plotly_dark",
+            height=max(500, 18 * len(corr)),
+            yaxis={"autorange": "reversed"},
+        )
+        stress = timeseries_graph(result["stress"].dropna(how="all"), "Correlation Stress", frames)
+
+        return html.Div([dcc.Graph(figure=heatmap), stress])
+
+    # ---------- REGULAR PANELS ----------
+    df = data[f"levels:{selected_group}"]
+
+    if df.empty:
+        return html.Div([
+            html.H3(f"No data found for {selected_group}"),
+            html.P("Yahooquery did not return any valid tickers.",
+                   style={"color": "orange"})
+        ])
+
+    z = data[f"zscore:{selected_group}"]
+
+    return html.Div([
+        timeseries_graph(df, f"{selected_group} — Levels", frames),
+        timeseries_graph(z, f"{selected_group} — Z-Scores", frames)
+    ])
+
+
+def build_intraday_panel(z, score, version):
+    """
+    Intraday tab: 1-minute stress score and its component z-scores.
+    New bars arrive through the graphs' extendData; intraday-state tells
+    the stream callback which bar and trace order the browser holds.
+    """
+    if score.empty:
+        return html.Div([
+            html.H3("Intraday stream warming up"),
+            html.P("No closed 1-minute bars yet (market closed or first poll running).",
+                   style={"color": "orange"})
+        ])
+
+    z = z[[c for c in BASELINE_WEIGHTS if c in z.columns]]
+    state = {
+        "version": version,
+        "last": int(score.index[-1].value // 1_000_000),     # epoch ms: exact in JS
+        "zcols": list(z.columns),
+    }
+    return html.Div([
+        dcc.Store(id={"type": "intraday-state", "name": "stream"}, data=state),
+        dcc.Graph(id={"type": "intraday-graph", "name": "stress"},
+                  figure=make_timeseries_panel(score, "Intraday Stress Score (1m)")),
+        dcc.Graph(id={"type": "intraday-graph", "name": "zscores"},
+                  figure=make_timeseries_panel(z, "Intraday Z-Scores (rolling session)")),
+    ])
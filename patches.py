@@ -0,0 +1,119 @@
+# patches.py
+import pandas as pd
+from dash import Patch, dcc
+
+from precompute import fingerprint
+
+
+# ----------------------------------------------------------
+# 1) WHAT THE CLIENT CURRENTLY HOLDS
+# ----------------------------------------------------------
+def panel_state(name, version, children, frames):
+    """
+    Small description of a rendered panel, kept in a dcc.Store:
+    panel name, data version, and for each time-series graph its
+    position in the panel, the last x per trace and a fingerprint of the
+    trace's data before that x (the history the client already holds).
+    """
+    graphs, gauge = {}, None
+    for i, child in enumerate(getattr(children, "children", None) or []):
+        if not isinstance(child, dcc.Graph):
+            continue
+        graph_id = getattr(child, "id", None)
+        if isinstance(graph_id, dict) and graph_id.get("title") in frames:
+            df = frames[graph_id["title"]][0]
+            last = {str(c): _last_x(df[c]) for c in df.columns}
+            graphs[graph_id["title"]] = {
+                "child": i,
+                "last": last,
+                "held": {str(c): _held(df[c], last[str(c)]) for c in df.columns},
+            }
+        elif gauge is None and name == "Stress Score":
+            gauge = i
+
+    return {"panel": name, "version": version, "graphs": graphs, "gauge": gauge}
+
+
+def _last_x(s):
+    s = s.dropna()
+    return None if s.empty else pd.Timestamp(s.index[-1]).isoformat()
+
+
+def _held(s, last):
+    """Fingerprint of the points before `last` (the last one may still be partial)."""
+    if last is None:
+        return None
+    s = s.dropna()
+    return fingerprint(s[s.index < pd.Timestamp(last)])
+
+
+def held_frame(df, state, title):
+    """
+    df cut to what the client holds for graph `title` (values after each
+    trace's last x blanked), so a re-render keeps the panel state valid.
+    """
+    info = (state or {}).get("graphs", {}).get(title)
+    if info is None:
+        return df
+    df = df.copy()
+    for col in df.columns:
+        last = info["last"].get(str(col))
+        if last is not None:
+            df.loc[df.index > pd.Timestamp(last), col] = float("nan")
+    return df
+
+
+# ----------------------------------------------------------
+# 2) DELTA SINCE THAT STATE
+# ----------------------------------------------------------
+def refresh_patch(state, snapshot, name):
+    """
+    Patch for panel-output.children that brings the client from `state`
+    to the current snapshot: the last bar of each trace is overwritten
+    (it may have been partial) and newer bars are appended. Returns
+    (patch, new_state), or None when a full render is needed: the trace
+    layout changed, or the history the client holds was revised (its
+    fingerprint differs, or its last x is gone from the snapshot).
+    """
+    frames = snapshot.frames.get(name)
+    if not frames or set(frames) != set(state["graphs"]):
+        return None
+
+    patch = Patch()
+    graphs = {}
+    for title, info in state["graphs"].items():
+        df = frames[title][0]
+        if [str(c) for c in df.columns] != list(info["last"]):
+            return None                     # trace layout changed
+
+        data = patch["props"]["children"][info["child"]]["props"]["figure"]["data"]
+        last, held = {}, {}
+        for j, col in enumerate(df.columns):
+            s = df[col].dropna()
+            prev = info["last"][str(col)]
+            if prev is None or pd.Timestamp(prev) not in s.index:
+                return None
+            if _held(s, prev) != info.get("held", {}).get(str(col)):
+                return None                 # history revised (rebase, deep revision)
+            last[str(col)] = _last_x(s)
+            held[str(col)] = _held(s, last[str(col)])
+
+            # the client's last bar is replaced, newer bars are appended
+            tail = s[s.index >= pd.Timestamp(prev)]
+            data[j]["x"][-1] = tail.index[0].isoformat()
+            data[j]["y"][-1] = float(tail.iloc[0])
+            tail = tail.iloc[1:]
+            if not tail.empty:
+                data[j]["x"].extend([t.isoformat() for t in tail.index])
+                data[j]["y"].extend([float(v) for v in tail.values])
+
+        graphs[title] = {"child": info["child"], "last": last, "held": held}
+
+    if state.get("gauge") is not None and "Stress Score Trend" in frames:
+        mss = frames["Stress Score Trend"][0]["Stress Score"]
+        gauge = patch["props"]["children"][state["gauge"]]["props"]["figure"]["data"][0]
+        gauge["value"] = float(mss.iloc[-1])
+        gauge["delta"]["reference"] = float(mss.mean())
+
+    new_state = dict(state, version=snapshot.panel_versions.get(name), graphs=graphs)
+    return patch, new_state
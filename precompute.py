@@ -0,0 +1,259 @@
+# precompute.py
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from dash import html
+
+from metrics import METRICS, BYTES_BUCKETS
+from settings import (REFRESH_SECONDS, CLIENT_TABS, CLIENTSIDE_ENABLED,
+                      SHARED_ENABLED, SHARED_POLL_SECONDS, ALERTS_ENABLED)
+from startup import STARTUP
+
+# The data / figure stack (pandas, panel_graph, panels, ...) is imported by
+# the worker thread on its first run, not while the server is starting.
+
+log = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------
+# 1) IMMUTABLE SNAPSHOT
+# ----------------------------------------------------------
+class Snapshot:
+    """
+    One published refresh.
+    version         increments on every publish
+    panels          tab name -> Dash children
+    panel_versions  tab name -> fingerprint of that panel's input data
+    frames          tab name -> {graph title: (source frame, layout)}
+    store           columnar payload for client-side tabs (or None)
+    """
+
+    def __init__(self, version, created_at, panels, panel_versions, frames, errors,
+                 store=None):
+        self.version = version
+        self.created_at = created_at
+        self.panels = panels
+        self.panel_versions = panel_versions
+        self.frames = frames
+        self.errors = errors
+        self.store = store
+
+    def frame(self, title):
+        """Source frame and layout behind a time-series graph, by title."""
+        for panel_frames in self.frames.values():
+            if title in panel_frames:
+                return panel_frames[title]
+        return None
+
+
+def fingerprint(value):
+    """Stable hash of frames / series / dicts / scalars."""
+    import pandas as pd
+
+    h = hashlib.sha1()
+
+    def feed(v):
+        if isinstance(v, (pd.DataFrame, pd.Series)):
+            h.update(repr(v.columns if isinstance(v, pd.DataFrame) else v.name).encode())
+            h.update(pd.util.hash_pandas_object(v, index=True).values.tobytes())
+        elif isinstance(v, dict):
+            for k in sorted(v, key=str):
+                h.update(str(k).encode())
+                feed(v[k])
+        else:
+            h.update(repr(v).encode())
+
+    feed(value)
+    return h.hexdigest()[:16]
+
+
+# ----------------------------------------------------------
+# 2) BACKGROUND WORKER
+# ----------------------------------------------------------
+class SnapshotWorker:
+    """
+    Runs the whole pipeline off the request thread on the refresh cadence
+    and atomically swaps in a new Snapshot. Callbacks only read .snapshot.
+
+    With shared=True (SHARED_MATRIX=1, several server processes) one
+    process wins the refresher lock, fetches and publishes the market
+    matrix; every process builds its panels from read-only views of it.
+
+    With alerts=True the AlertEngine checks the freshly resolved graph
+    values after each refresh (only the refresher notifies).
+    """
+
+    def __init__(self, RISK_TICKERS, interval=REFRESH_SECONDS, clientside=CLIENTSIDE_ENABLED,
+                 shared=SHARED_ENABLED, alerts=ALERTS_ENABLED):
+        self.RISK_TICKERS = RISK_TICKERS
+        self.shared_mode = shared
+        self.alerts_mode = alerts
+        self.shared = self.source = self.graph = self.alerts = None     # set up on the first run
+        self.panel_names = list(RISK_TICKERS)
+        self.client_tabs = [t for t in CLIENT_TABS if RISK_TICKERS.get(t)] if clientside else []
+        self.interval = interval
+        self.snapshot = None
+        self._published_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="snapshot-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                with METRICS.timer("stage_seconds", stage="snapshot", node="run_once"):
+                    if self.run_once() is not None:
+                        STARTUP.mark("first_snapshot")
+            except Exception:
+                METRICS.inc("snapshot_failures_total")
+                log.exception("snapshot refresh failed")
+            # shared mode: followers poll for the refresher's next publish
+            cadence = min(self.interval, SHARED_POLL_SECONDS) if self.shared_mode else self.interval
+            self._stop.wait(max(0, cadence - (time.monotonic() - started)))
+
+    def _setup(self):
+        from panel_graph import build_graph, panel_inputs
+        from market_matrix import SharedMatrix, MatrixSource
+        from alerts import AlertEngine
+
+        if self.shared_mode:
+            self.shared, self.source = SharedMatrix(), MatrixSource()
+        if self.alerts_mode:
+            self.alerts = AlertEngine()
+        self.inputs = panel_inputs(self.RISK_TICKERS)
+        self.graph = build_graph(self.RISK_TICKERS, self.source)
+
+    def run_once(self):
+        from data_fetching import DATA_CACHE
+        from panel_graph import Resolver
+        from panels import build_panel
+
+        if self.graph is None:
+            self._setup()
+        previous = self.snapshot
+        if self.shared is not None and not self._attach(previous):
+            return previous
+
+        # each cycle loads current inputs once; nodes within it share them
+        DATA_CACHE.invalidate()
+        resolver = Resolver(self.graph)
+
+        panels, versions, frames, errors = {}, {}, {}, {}
+        for name in self.panel_names:
+            try:
+                data = resolver.resolve(self.inputs.get(name, []))
+                version = fingerprint(data)
+                if previous is not None and previous.panel_versions.get(name) == version:
+                    panels[name] = previous.panels[name]      # data unchanged
+                    frames[name] = previous.frames.get(name, {})
+                else:
+                    frames[name] = {}
+                    with METRICS.timer("stage_seconds", stage="figure", node=name):
+                        panels[name] = build_panel(name, data, frames[name])
+                versions[name] = version
+            except Exception as e:
+                METRICS.inc("panel_failures_total", panel=name)
+                log.exception("panel %s failed", name)
+                errors[name] = f"{type(e).__name__}: {e}"
+                if previous is not None and name in previous.panels:
+                    # keep serving the last good panel
+                    panels[name] = previous.panels[name]
+                    versions[name] = previous.panel_versions[name]
+                    frames[name] = previous.frames.get(name, {})
+
+        self._check_alerts(resolver)
+        self.snapshot = Snapshot(
+            version=(previous.version + 1) if previous else 1,
+            created_at=time.time(),
+            panels=panels,
+            panel_versions=versions,
+            frames=frames,
+            errors=errors,
+            store=self._client_store(resolver, versions, previous),
+        )
+        return self.snapshot
+
+    def _attach(self, previous):
+        """
+        Publish (refresher only, once per interval), then point the source
+        at the current matrix. False when there is nothing new to build.
+        """
+        from market_matrix import collect_matrix
+
+        due = self._published_at is None or time.monotonic() - self._published_at >= self.interval
+        if due and self.shared.try_lead():
+            self._published_at = time.monotonic()       # a failed fetch waits a full interval too
+            with METRICS.timer("stage_seconds", stage="shared", node="publish"):
+                version = self.shared.publish(collect_matrix(self.RISK_TICKERS))
+            METRICS.inc("shared_matrix_publishes_total")
+            log.info("published market matrix v%d", version)
+
+        view = self.shared.attach()
+        if view is None:
+            return False                                # refresher has not published yet
+        if previous is not None and self.source.view is not None \
+                and self.source.view.version == view.version:
+            return False
+        self.source.view = view
+        METRICS.set("shared_matrix_version", view.version)
+        METRICS.set("shared_matrix_bytes", view.data.nbytes)
+        return True
+
+    def _check_alerts(self, resolver):
+        """Alert rules over this refresh's values; followers never notify."""
+        if self.alerts is None or (self.shared is not None and not self.shared.try_lead()):
+            return
+        try:
+            self.alerts.update(resolver.values)
+        except Exception:
+            METRICS.inc("alert_failures_total")
+            log.exception("alert evaluation failed")
+
+    def _client_store(self, resolver, versions, previous):
+        """One versioned payload for all client-side tabs; reused if unchanged."""
+        if not self.client_tabs:
+            return None
+
+        store_version = fingerprint({t: versions.get(t) for t in self.client_tabs})
+        if previous is not None and previous.store is not None \
+                and previous.store["version"] == store_version:
+            return previous.store
+
+        from client_store import build_payload
+
+        group_frames = {
+            t: (resolver.values[f"levels:{t}"], resolver.values[f"zscore:{t}"])
+            for t in self.client_tabs
+            if f"levels:{t}" in resolver.values and f"zscore:{t}" in resolver.values
+        }
+        payload = build_payload(store_version, group_frames)
+        METRICS.observe("payload_bytes", len(json.dumps(payload)), buckets=BYTES_BUCKETS, kind="client_store")
+        return payload
+
+    def panel(self, name):
+        """Children for a tab, never blocking on the network."""
+        snap = self.snapshot
+        if snap is None:
+            return html.Div([
+                html.H3("Loading market data…"),
+                html.P("The first refresh is still running. This panel updates automatically.",
+                       style={"color": "orange"})
+            ])
+        if name not in snap.panels:
+            return html.Div([
+                html.H3(f"{name} unavailable"),
+                html.P(snap.errors.get(name, "No data."), style={"color": "orange"})
+            ])
+        return snap.panels[name]
@@ -0,0 +1,222 @@
+# price_store.py
+import json
+import os
+import threading
+import time
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from metrics import METRICS
+
+# ----------------------------------------------------------
+# Local columnar store: one Parquet file per symbol
+# ----------------------------------------------------------
+STORE_DIR = os.environ.get(
+    "PRICE_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_store"),
+)
+
+# A symbol checked within this window is served from disk, no network.
+# Kept below the 15-minute refresh cadence so every worker cycle sees new bars.
+MIN_REFRESH_SECONDS = float(os.environ.get("PRICE_STORE_MIN_REFRESH", 5 * 60))
+
+# Tolerance when deciding whether stored history reaches a requested start
+# (monthly series only have one observation per month)
+BACKFILL_SLACK = pd.Timedelta(days=35)
+
+# Trailing observations re-fetched by sync() on every refresh: FRED revises
+# recent values (UNRATE, TOTALSL, ...), and a changed one rewrites the history
+REVISION_OBSERVATIONS = int(os.environ.get("PRICE_STORE_REVISION_OBS", 12))
+# Relative difference in a stored value that counts as a revision
+REVISION_TOLERANCE = 1e-9
+
+
+def period_start(period, now=None):
+    """Translate a yahooquery period string ("5d", "6mo", "1y", "max") to a start date."""
+    now = pd.Timestamp.now().normalize() if now is None else now
+    if period is None or period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(now.year, 1, 1)
+    if period.endswith("mo"):
+        return now - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("y"):
+        return now - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith("d"):
+        return now - pd.Timedelta(days=int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def normalize_index(df):
+    """Date/Timestamp/tz-aware index -> naive DatetimeIndex (UTC)."""
+    df = df.copy()
+    df.index = pd.to_datetime(df.index, utc=True).tz_convert(None)
+    df.index.name = "date"
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+class PriceStore:
+    """
+    Append-only history per (namespace, symbol).
+
+    <root>/<namespace>/<symbol>.parquet   single-column frame
+    <root>/<namespace>/<symbol>.json      requested start + last check time
+    """
+
+    def __init__(self, root=STORE_DIR, min_refresh=MIN_REFRESH_SECONDS):
+        self.root = root
+        self.min_refresh = min_refresh
+
+    # -------------------------------------------------------
+    # reads
+    # -------------------------------------------------------
+    def read(self, namespace, symbol, start=None):
+        path = self._path(namespace, symbol, "parquet")
+        if not os.path.exists(path):
+            return None
+
+        df = pd.read_parquet(path)
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        return df
+
+    def last_date(self, namespace, symbol):
+        df = self.read(namespace, symbol)
+        if df is None or df.empty:
+            return None
+        return df.index[-1]
+
+    def covers(self, namespace, symbol, start):
+        """True if history from `start` onwards has already been requested."""
+        meta = self._meta(namespace, symbol)
+        if "requested_start" not in meta:
+            return False
+        if start is None:
+            return meta["requested_start"] is None
+        if meta["requested_start"] is None:
+            return True
+        return pd.Timestamp(meta["requested_start"]) <= pd.Timestamp(start) + BACKFILL_SLACK
+
+    def requested_start(self, namespace, symbol):
+        """Start of the history stored for symbol (None = full history)."""
+        start = self._meta(namespace, symbol).get("requested_start")
+        return None if start is None else pd.Timestamp(start)
+
+    def is_fresh(self, namespace, symbol):
+        checked_at = self._meta(namespace, symbol).get("checked_at")
+        return checked_at is not None and time.time() - checked_at < self.min_refresh
+
+    # -------------------------------------------------------
+    # writes
+    # -------------------------------------------------------
+    def write(self, namespace, symbol, df, requested_start):
+        """Replace stored history (cold load or backfill)."""
+        self._write_frame(namespace, symbol, normalize_index(df))
+        self._write_meta(namespace, symbol, requested_start=_iso(requested_start))
+
+    def append(self, namespace, symbol, df):
+        """Merge new bars; overlapping dates are overwritten by the new data."""
+        stored = self.read(namespace, symbol)
+        new = normalize_index(df)
+        if stored is not None:
+            new = pd.concat([stored, new])
+            new = new[~new.index.duplicated(keep="last")].sort_index()
+        self._write_frame(namespace, symbol, new)
+        self._write_meta(namespace, symbol)
+
+    def touch(self, namespace, symbol):
+        """Mark symbol as checked even when upstream had no new bars."""
+        self._write_meta(namespace, symbol)
+
+    # -------------------------------------------------------
+    # single-series sync (FRED style fetchers)
+    # -------------------------------------------------------
+    def sync(self, namespace, symbol, fetch, start=None):
+        """
+        Return history from `start`, fetching only what is missing plus the
+        last REVISION_OBSERVATIONS stored observations; if upstream revised
+        or removed any of those, the whole history is fetched again.
+        `fetch(start)` must return a one-column frame from `start` onwards.
+        """
+        if self.covers(namespace, symbol, start):
+            if not self.is_fresh(namespace, symbol):
+                stored = self.read(namespace, symbol)
+                since = (start if stored is None or stored.empty
+                         else stored.index[-min(REVISION_OBSERVATIONS, len(stored))])
+                new = fetch(since)
+                if new is None or new.empty:
+                    self.touch(namespace, symbol)
+                elif stored is not None and revised(stored.iloc[:, 0], normalize_index(new).iloc[:, 0]):
+                    METRICS.inc("price_store_revisions_total", namespace=namespace)
+                    first = self.requested_start(namespace, symbol)
+                    self.write(namespace, symbol, fetch(first), first)
+                else:
+                    self.append(namespace, symbol, new)
+        else:
+            self.write(namespace, symbol, fetch(start), start)
+
+        df = self.read(namespace, symbol, start)
+        if df is None:
+            return pd.DataFrame(columns=[symbol])
+        df.columns = [symbol]
+        return df
+
+    # -------------------------------------------------------
+    # internals
+    # -------------------------------------------------------
+    def _path(self, namespace, symbol, ext):
+        return os.path.join(self.root, namespace, f"{quote(symbol, safe='')}.{ext}")
+
+    def _meta(self, namespace, symbol):
+        path = self._path(namespace, symbol, "json")
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_meta(self, namespace, symbol, **updates):
+        meta = self._meta(namespace, symbol)
+        meta.update(updates)
+        meta["checked_at"] = time.time()
+        self._atomic_write(self._path(namespace, symbol, "json"),
+                           lambda tmp: _dump_json(meta, tmp))
+
+    def _write_frame(self, namespace, symbol, df):
+        self._atomic_write(self._path(namespace, symbol, "parquet"),
+                           lambda tmp: df.to_parquet(tmp))
+
+    @staticmethod
+    def _atomic_write(path, writer):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        writer(tmp)
+        os.replace(tmp, path)
+
+
+def revised(stored, fresh, tolerance=REVISION_TOLERANCE):
+    """
+    True if `fresh` changes or drops a stored observation it overlaps
+    (dates from fresh's first one up to the last stored one).
+    """
+    if fresh.empty:
+        return False
+    old = stored[stored.index >= fresh.index[0]]
+    if not old.index.isin(fresh.index).all():
+        return True
+    a, b = old.to_numpy(dtype="float64"), fresh.loc[old.index].to_numpy(dtype="float64")
+    same = (np.abs(a - b) <= tolerance * np.abs(a)) | (np.isnan(a) & np.isnan(b))
+    return not same.all()
+
+
+def _iso(ts):
+    return None if ts is None else pd.Timestamp(ts).isoformat()
+
+
+def _dump_json(obj, path):
+    with open(path, "w") as f:
+        json.dump(obj, f)
+
+
+PRICE_STORE = PriceStore()
@@ -0,0 +1,141 @@
+# recession_bands.py
+import atexit
+import hashlib
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# NumPy only: draw_batch works on plain arrays and its kernels (random
+# integers, gathers, sums) release the GIL, so batches run in parallel threads.
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Draws per task; each task is one vectorized batch in a pool thread
+BATCH_SIZE = 2500
+
+# Relative standard deviation of each beta perturbation (betas are hand-set)
+BETA_REL_SD = 0.20
+
+
+# ----------------------------------------------------------
+# 1) BLOCK BOOTSTRAP OF THE Z-SCORE MOMENTS
+# ----------------------------------------------------------
+def block_length(n):
+    """Moving-block length ~ n^(1/3): about a month of daily data, a half-year of monthly."""
+    return max(1, round(n ** (1 / 3)))
+
+
+def block_moments(values, current):
+    """
+    Sums and sums of squares of every window of block_length(n)
+    consecutive observations, so a resample is a sum over block starts.
+    """
+    x = np.asarray(values, dtype="float64")
+    L = block_length(len(x))
+    c1 = np.concatenate([[0.0], np.cumsum(x)])
+    c2 = np.concatenate([[0.0], np.cumsum(x * x)])
+    return {"s1": c1[L:] - c1[:-L], "s2": c2[L:] - c2[:-L], "n": len(x), "L": L,
+            "current": float(current)}
+
+
+def _draw_z(rng, comp, size):
+    """(current - bootstrap mean) / bootstrap std for `size` resampled histories."""
+    k = math.ceil(comp["n"] / comp["L"])
+    starts = rng.integers(0, len(comp["s1"]), size=(size, k))
+    m = k * comp["L"]
+    mean = comp["s1"][starts].sum(axis=1) / m
+    var = (comp["s2"][starts].sum(axis=1) - m * mean * mean) / (m - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (comp["current"] - mean) / np.sqrt(np.where(var > 0, var, np.nan))
+
+
+def draw_batch(task):
+    """
+    One batch of probabilities: resampled z-scores for every component,
+    betas scaled by (1 + BETA_REL_SD * N(0, 1)), logistic of the sum.
+    task = (seed, size, components, betas, z_fixed)
+    """
+    seed, size, components, betas, z_fixed = task
+    rng = np.random.default_rng(seed)
+
+    z = np.column_stack([np.ones(size)]
+                        + [_draw_z(rng, c, size) for c in components]
+                        + [np.full(size, v) for v in z_fixed])
+    b = np.asarray(betas) * (1 + BETA_REL_SD * rng.standard_normal((size, len(betas))))
+    x = (b * z).sum(axis=1)
+    return np.exp(-np.logaddexp(0.0, -x))              # stable logistic
+
+
+# ----------------------------------------------------------
+# 2) THREAD POOL
+# ----------------------------------------------------------
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """
+    Long-lived pool, started once. Threads rather than processes: forking
+    the threaded Dash server can deadlock, and spawn / forkserver workers
+    would re-import its __main__ (app.py starts the refresh threads).
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recession-bands")
+            _pool_workers = workers
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+atexit.register(_reset_pool)
+
+
+def input_seed(components, betas, z_fixed, draws):
+    """
+    Seed derived from everything the draws depend on: the same inputs give
+    the same bands (and panel fingerprint) on every refresh.
+    """
+    h = hashlib.sha256()
+    for c in components:
+        h.update(np.ascontiguousarray(c["s1"]).tobytes())
+        h.update(np.ascontiguousarray(c["s2"]).tobytes())
+        h.update(np.array([c["n"], c["L"]], dtype="int64").tobytes())
+        h.update(np.array([c["current"]], dtype="float64").tobytes())
+    h.update(np.asarray(list(betas) + list(z_fixed), dtype="float64").tobytes())
+    h.update(np.int64(draws).tobytes())
+    return int.from_bytes(h.digest()[:16], "little")
+
+
+def bootstrap_probabilities(components, betas, z_fixed, draws, workers=1, seed=None):
+    """
+    `draws` probabilities in BATCH_SIZE tasks, spread over `workers`
+    threads (inline when workers <= 1). seed=None derives it from the inputs.
+    """
+    if seed is None:
+        seed = input_seed(components, betas, z_fixed, draws)
+    sizes = [BATCH_SIZE] * (draws // BATCH_SIZE) + ([draws % BATCH_SIZE] if draws % BATCH_SIZE else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(s, n, components, betas, z_fixed) for s, n in zip(seeds, sizes)]
+
+    if workers > 1 and len(tasks) > 1:
+        return np.concatenate(list(_get_pool(workers).map(draw_batch, tasks)))
+    return np.concatenate([draw_batch(t) for t in tasks])
+
+
+def percentile_bands(probabilities):
+    """Percentile -> probability over the finite draws."""
+    p = probabilities[np.isfinite(probabilities)]
+    return dict(zip(PERCENTILES, np.percentile(p, PERCENTILES).tolist())) if len(p) else {}
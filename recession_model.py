@@ -2,14 +2,22 @@
 import math
 import pandas as pd
 import numpy as np
-from pandas_datareader import data as web
+from price_store import PRICE_STORE
+from fred_client import FRED_CLIENT
+from singleflight import single_flight
+from alignment import sample
+from settings import RECESSION_WORKERS
 
 # -----------------------------------------------------------
 # FRED fetch util
 # -----------------------------------------------------------
 
+@single_flight
 def fred(series, start="1990-01-01"):
-    df = web.DataReader(series, "fred", start)
+    # full history is stored once; later calls only fetch new observations
+    df = PRICE_STORE.sync(
+        "fred", series, lambda s: FRED_CLIENT.fetch(series, s), start
+    )
     df.columns = [series]
     return df.dropna()
 
@@ -22,6 +30,11 @@ def zscore(series, current):
     return (current - series.mean()) / series.std()
 
 
+def zscore_series(series):
+    """Every observation scored against the full-sample mean / std."""
+    return (series - series.mean()) / series.std()
+
+
 # -----------------------------------------------------------
 # Recession Model class
 # -----------------------------------------------------------
@@ -51,33 +64,123 @@ class RecessionRiskModel2026:
         )
         return self.logistic(x)
 
+    @staticmethod
+    def logistic_batch(x):
+        """Numerically stable logistic for arrays (no overflow for large |x|)."""
+        x = np.asarray(x, dtype="float64")
+        e = np.exp(-np.abs(x))
+        return np.where(x >= 0, 1 / (1 + e), e / (1 + e))
+
+    def predict_batch(self, z_yc, z_hy, z_u, z_cape, z_struct=1.0, z_ret=1.0):
+        """Vectorized predict: aligned arrays (scalars broadcast) -> probabilities."""
+        x = (
+            self.beta0
+            + self.beta_yc * np.asarray(z_yc, dtype="float64")
+            + self.beta_hy * np.asarray(z_hy, dtype="float64")
+            + self.beta_u * np.asarray(z_u, dtype="float64")
+            + self.beta_cape * np.asarray(z_cape, dtype="float64")
+            + self.beta_struct * np.asarray(z_struct, dtype="float64")
+            + self.beta_ret * np.asarray(z_ret, dtype="float64")
+        )
+        return self.logistic_batch(x)
+
+
+# -----------------------------------------------------------
+# Historical probability path
+# -----------------------------------------------------------
+
+def recession_probability_history(spread, hy, delta_u, cape, freq="ME"):
+    """
+    Probability time series from the component series.
+    Each input is z-scored at its native frequency, sampled as of each
+    `freq` period end, then scored in one predict_batch call.
+    CAPE is optional: before its first observation (the fallback proxy
+    only starts in 2019) it enters at a neutral z of 0.
+    """
+    z = sample(pd.concat({
+        "Yield Curve": zscore_series(spread),
+        "HY Spread": zscore_series(hy),
+        "Unemployment Δ12M": zscore_series(delta_u),
+        "CAPE": zscore_series(cape),
+    }, axis=1), freq)
+    z["CAPE"] = z["CAPE"].fillna(0.0)
+    z = z.dropna()
+
+    model = RecessionRiskModel2026()
+    p = model.predict_batch(
+        z["Yield Curve"], z["HY Spread"], z["Unemployment Δ12M"], z["CAPE"],
+        z_struct=1.0, z_ret=1.0,
+    )
+    return pd.Series(p, index=z.index, name="probability")
+
+
+# -----------------------------------------------------------
+# Uncertainty bands (block bootstrap + perturbed betas)
+# -----------------------------------------------------------
+
+def recession_bands(components, z_fixed, model, draws, workers=RECESSION_WORKERS, seed=None):
+    """
+    Percentile -> probability over `draws` scenarios. Each draw resamples
+    the history of every (series, current value) component in moving
+    blocks to re-estimate its z-score, and perturbs the model betas.
+    """
+    from recession_bands import block_moments, bootstrap_probabilities, percentile_bands
+
+    moments = [block_moments(s.dropna().to_numpy(), current) for s, current in components]
+    betas = [model.beta0, model.beta_yc, model.beta_hy, model.beta_u, model.beta_cape,
+             model.beta_struct, model.beta_ret]
+    draws_p = bootstrap_probabilities(moments, betas, z_fixed, draws, workers, seed)
+    return percentile_bands(draws_p)
+
 
 # -----------------------------------------------------------
 # Compute full recession probability
 # -----------------------------------------------------------
 
-def compute_recession_probability():
+RECESSION_SERIES = ["DGS10", "DGS3MO", "BAMLH0A0HYM2", "UNRATE"]
+
+# Shiller CAPE is not published on FRED, so it is never requested there:
+# this annual proxy stands in unless inputs["CAPE"] supplies a real series
+CAPE_PROXY = pd.Series([22, 25, 30, 35, 38, 40], name="CAPE",
+                       index=pd.date_range("2019-01-01", periods=6, freq="YS"))
+
+
+def fetch_recession_inputs(start="1990-01-01"):
+    """All FRED model inputs in one concurrent batch; raises if a series failed."""
+    frames, errors = FRED_CLIENT.fetch_many(RECESSION_SERIES, start=start, store=PRICE_STORE)
+
+    if errors:
+        raise RuntimeError(f"Recession model inputs unavailable: {errors}")
+
+    return {s: df.dropna() for s, df in frames.items()}
+
+
+def compute_recession_probability(inputs=None, freq="ME", draws=0):
+    # inputs: series code -> frame, as from fetch_recession_inputs (injectable offline)
+    # freq: sampling of the probability history ("B" for every business day)
+    # draws: bootstrap / beta-perturbation draws for percentile bands (0 = none)
+    if inputs is None:
+        inputs = fetch_recession_inputs()
+
     # Yield curve (10Y - 3M)
-    df10 = fred("DGS10")
-    df3m = fred("DGS3MO")
+    df10 = inputs["DGS10"]
+    df3m = inputs["DGS3MO"]
 
     yc = pd.concat([df10, df3m], axis=1).dropna()
     yc["spread"] = yc["DGS10"] - yc["DGS3MO"]
 
     # HY Spread
-    hy = fred("BAMLH0A0HYM2")
+    hy = inputs["BAMLH0A0HYM2"]
 
     # Unemployment
-    un = fred("UNRATE")
+    un = inputs["UNRATE"]
     delta_u = un["UNRATE"].iloc[-1] - un["UNRATE"].iloc[-13]
 
-    # CAPE (fallback)
-    try:
-        cape = fred("CAPE")
-    except:
-        cape_vals = pd.Series([22, 25, 30, 35, 38, 40],
-                              index=pd.date_range("2019-01-01", periods=6, freq="YS"))
-        cape = pd.DataFrame(cape_vals, columns=["CAPE"])
+    # CAPE (proxy unless supplied)
+    if "CAPE" in inputs and not inputs["CAPE"].empty:
+        cape = inputs["CAPE"]
+    else:
+        cape = CAPE_PROXY.to_frame()
 
     # Z-scores
     z_yc = zscore(yc["spread"], yc["spread"].iloc[-1])
@@ -91,8 +194,22 @@ def compute_recession_probability():
     model = RecessionRiskModel2026()
     p = model.predict(z_yc, z_hy, z_u, z_cape, z_struct, z_ret)
 
+    history = recession_probability_history(
+        yc["spread"], hy["BAMLH0A0HYM2"], un["UNRATE"].diff(12).dropna(), cape["CAPE"], freq
+    )
+
+    bands = recession_bands(
+        [(yc["spread"], yc["spread"].iloc[-1]),
+         (hy["BAMLH0A0HYM2"], hy["BAMLH0A0HYM2"].iloc[-1]),
+         (un["UNRATE"].diff(12).dropna(), delta_u),
+         (cape["CAPE"], cape["CAPE"].iloc[-1])],
+        (z_struct, z_ret), model, draws
+    ) if draws else {}
+
     return {
         "probability": p,
+        "history": history,
+        "bands": bands,
         "z": {
             "Yield Curve": z_yc,
             "HY Spread": z_hy,
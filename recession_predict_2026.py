@@ -6,7 +6,7 @@ Pulls macro data from FRED, computes z-scores, applies logistic model,
 and outputs a probability estimate.
 
 Dependencies:
-    pip install pandas pandas_datareader numpy python-dotenv requests
+    pip install pandas pyarrow numpy python-dotenv requests
 
 You may integrate this with your Telegram alert system easily.
 """
@@ -15,18 +15,25 @@ import math
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from pandas_datareader import data as web
+from price_store import PRICE_STORE
+from fred_client import FRED_CLIENT
+from singleflight import single_flight
+from alignment import sample
+from recession_model import CAPE_PROXY
 
 # ============================================================
 # 1️⃣ FRED DATA FETCHER
 # ============================================================
 
 class FredFetcher:
-    """Utility class for clean FRED data fetching."""
+    """Utility class for clean FRED data fetching (backed by the local price store)."""
 
     @staticmethod
+    @single_flight
     def fetch(series, start="1990-01-01"):
-        df = web.DataReader(series, "fred", start)
+        df = PRICE_STORE.sync(
+            "fred", series, lambda s: FRED_CLIENT.fetch(series, s), start
+        )
         df = df.dropna()
         df.columns = [series]
         return df
@@ -43,6 +50,11 @@ def zscore(series, current_value):
     return (current_value - mean) / std
 
 
+def zscore_series(series):
+    """Return z-score of every observation relative to the same series."""
+    return (series - np.mean(series)) / np.std(series)
+
+
 # ============================================================
 # 3️⃣ RECESSION RISK MODEL
 # ============================================================
@@ -77,6 +89,29 @@ class RecessionRiskModel2026:
         )
         return self.logistic(x)
 
+    @staticmethod
+    def logistic_batch(x):
+        """Numerically stable logistic: exp() only ever sees -|x|."""
+        x = np.asarray(x, dtype=float)
+        e = np.exp(-np.abs(x))
+        return np.where(x >= 0, 1 / (1 + e), e / (1 + e))
+
+    def predict_batch(self, z_yc, z_hy, z_u, z_cape, z_struct=1.0, z_ret=1.0):
+        """
+        Vectorized predict over aligned arrays of z-scores
+        (scalars are broadcast, e.g. the constant structural inputs).
+        """
+        x = (
+            self.beta0
+            + self.beta_yc * np.asarray(z_yc, dtype=float)
+            + self.beta_hy * np.asarray(z_hy, dtype=float)
+            + self.beta_u * np.asarray(z_u, dtype=float)
+            + self.beta_cape * np.asarray(z_cape, dtype=float)
+            + self.beta_struct * np.asarray(z_struct, dtype=float)
+            + self.beta_ret * np.asarray(z_ret, dtype=float)
+        )
+        return self.logistic_batch(x)
+
 
 # ============================================================
 # 4️⃣ MAIN FUNCTION
@@ -101,17 +136,8 @@ def compute_recession_probability():
     unrate = FredFetcher.fetch("UNRATE")
 
     # ---- Estimate Shiller CAPE ----
-    # (Simple proxy using long-term market multiples if data isn't available)
-    try:
-        cape = web.DataReader("CAPE", "fred", "1990-01-01")
-        cape = cape.dropna()
-    except:
-        # Fallback proxy dataset
-        cape_vals = pd.Series(
-            [22, 25, 30, 35, 38, 40],
-            index=pd.date_range("2019-01-01", periods=6, freq="YS")
-        )
-        cape = pd.DataFrame(cape_vals, columns=["CAPE"])
+    # (not on FRED: simple proxy using long-term market multiples)
+    cape = CAPE_PROXY.to_frame()
 
     # ---- Compute current values ----
     yc_latest = yc["spread_10y_3m"].iloc[-1]
@@ -144,7 +170,42 @@ def compute_recession_probability():
 
 
 # ============================================================
-# 5️⃣ RUN
+# 5️⃣ HISTORICAL PROBABILITY PATH
+# ============================================================
+
+def compute_recession_history(freq="MS"):
+    """
+    Monthly recession probability since 1990, one vectorized call.
+    Component z-scores use the same full-sample statistics as above,
+    sampled as of each period start (alignment.sample). CAPE enters at a
+    neutral z of 0 before its first observation.
+    """
+    df10 = FredFetcher.fetch("DGS10")
+    df3m = FredFetcher.fetch("DGS3MO")
+    yc = pd.concat([df10, df3m], axis=1).dropna()
+    spread = yc["DGS10"] - yc["DGS3MO"]
+
+    hy = FredFetcher.fetch("BAMLH0A0HYM2")["BAMLH0A0HYM2"]
+    delta_u = FredFetcher.fetch("UNRATE")["UNRATE"].diff(12).dropna()
+
+    cape = CAPE_PROXY                             # not on FRED
+
+    z = sample(pd.concat({
+        "yc": zscore_series(spread),
+        "hy": zscore_series(hy),
+        "u": zscore_series(delta_u),
+        "cape": zscore_series(cape),
+    }, axis=1), freq)
+    z["cape"] = z["cape"].fillna(0.0)
+    z = z.dropna()
+
+    model = RecessionRiskModel2026()
+    p = model.predict_batch(z["yc"], z["hy"], z["u"], z["cape"], 1.0, 1.0)
+    return pd.Series(p, index=z.index, name="probability")
+
+
+# ============================================================
+# 6️⃣ RUN
 # ============================================================
 
 # if __name__ == "__main__":
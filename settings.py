@@ -0,0 +1,39 @@
+# settings.py
+# Environment switches read while building the layout and wiring callbacks.
+# Standard library only: importing this must not pull in pandas.
+import os
+import tempfile
+
+# Snapshot worker cycle; also the dcc.Interval cadence in layout.py
+REFRESH_SECONDS = 15 * 60
+
+# Tabs rendered in the browser from the dcc.Store payload when enabled
+CLIENT_TABS = ["Volatility", "Credit Risk", "Treasury Yields", "Liquidity", "Global Risk"]
+CLIENTSIDE_ENABLED = os.environ.get("CLIENTSIDE_TABS", "0") == "1"
+
+INTRADAY_TAB = "Intraday"
+INTRADAY_ENABLED = os.environ.get("INTRADAY_MODE", "0") == "1"
+# Browser update cadence for the Intraday tab
+PUSH_SECONDS = float(os.environ.get("INTRADAY_PUSH_SECONDS", 10))
+
+# One refresher publishes, every gunicorn worker attaches (SHARED_MATRIX=1)
+SHARED_ENABLED = os.environ.get("SHARED_MATRIX", "0") == "1"
+SHARED_DIR = os.environ.get(
+    "SHARED_MATRIX_DIR",
+    "/dev/shm/market-risk" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "market-risk"),
+)
+# How often non-refreshing workers check for a newly published matrix
+SHARED_POLL_SECONDS = float(os.environ.get("SHARED_MATRIX_POLL", 15))
+
+# Cold start to first served layout, in seconds (0 = report only)
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", 0))
+# Longest wait for the first layout request before the data stack is imported anyway
+DEFER_IMPORT_SECONDS = float(os.environ.get("DEFER_IMPORT_SECONDS", 3))
+
+# Threshold alerts evaluated on every refresh (rules: alerts.DEFAULT_RULES or ALERT_RULES=<json>)
+ALERTS_ENABLED = os.environ.get("ALERTS", "1") == "1"
+
+# Recession Risk gauge: bootstrap draws for percentile bands (0 = point estimate only)
+RECESSION_DRAWS = int(os.environ.get("RECESSION_DRAWS", 10000))
+# Threads drawing them (1 = in the worker thread)
+RECESSION_WORKERS = int(os.environ.get("RECESSION_WORKERS", min(4, os.cpu_count() or 1)))
@@ -94,6 +94,8 @@ Together, they describe the true macroeconomic environment behind markets.
 
 # 🧭 Using the Z-Score Panel
 Z-scores standardize indicators with different units onto a comparable scale.
+Market group panels and the Stress Score use a rolling 1-year (252 trading day) window,
+so a reading is measured against the recent regime rather than the whole history.
 
 - **Z > +1** → stressed  
 - **Z < −1** → very easy conditions  
@@ -237,6 +239,14 @@ Weighted mix of:
 - yields  
 - global risk  
 
+If a component is missing on a given day, the remaining weights are rescaled.
+The scenario chart shows alternative weightings (volatility-led, credit-led,
+rates & dollar, equal weight) next to the baseline.
+
+The **Intraday** tab (when enabled) applies the same baseline weights to
+1-minute bars, with z-scores over a rolling one-session window, so an
+intraday VIX spike or HYG sell-off shows up within a minute or two.
+
 ---
 
 # 🧭 Interpretation Framework
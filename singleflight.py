@@ -0,0 +1,100 @@
+# singleflight.py
+import functools
+import inspect
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls: the first caller for a key runs
+    fn(), concurrent callers with the same key wait and share its result
+    (or its exception). Nothing is cached once the call has finished.
+    The shared result is never handed out itself: when anyone waited,
+    every caller, the leader included, gets a private copy.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _private_copy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # no follower can join once the key is removed
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        return _private_copy(call.result) if shared else call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+def _private_copy(value):
+    # each caller gets its own frame so in-place edits don't leak between callers
+    return value.copy() if hasattr(value, "copy") else value
+
+
+def _freeze(value):
+    """Hashable key for call arguments (dicts of ticker lists, timestamps, ...)."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+_GROUP = SingleFlight()
+
+
+def single_flight(fn):
+    """
+    Decorator: identical concurrent calls of fn share one upstream call.
+    Arguments are bound to fn's signature (defaults applied) before keying,
+    so f(x, y), f(x, y=y) and f(x) with y's default are the same call.
+    """
+    name = f"{fn.__module__}.{fn.__qualname__}"
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (name, _freeze(bound.arguments))
+        return _GROUP.do(key, lambda: fn(*args, **kwargs))
+
+    return wrapper
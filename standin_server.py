@@ -0,0 +1,370 @@
+# standin_server.py
+"""
+Local stand-in for the Yahoo chart API and FRED CSV endpoint.
+
+    python standin_server.py --mode synthetic --latency 0.2 --error-rate 0.05
+    FRED_BASE_URL=http://127.0.0.1:8765 YAHOO_BASE_URL=http://127.0.0.1:8765 python app.py
+
+Modes
+  synthetic  deterministic generated series for any symbol / series id
+  record     proxy to the real endpoints and save each response
+  replay     serve saved responses only (404 for anything not recorded)
+
+Faults (every mode): fixed + random latency, 5xx error rate, 429 rate,
+and a requests-per-second cap answered with 429 + Retry-After.
+They can be changed while running: GET /__config?error_rate=0.3
+Counters by route and status: GET /__stats
+
+Telegram Bot API stand-in for alert sinks (TELEGRAM_BASE_URL=http://127.0.0.1:8765):
+POST /bot<token>/sendMessage is recorded; GET /__messages lists what was sent.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+import numpy as np
+import pandas as pd
+import requests
+
+from price_store import period_start
+
+log = logging.getLogger("standin")
+
+UPSTREAM = {
+    "yahoo": "https://query2.finance.yahoo.com",
+    "fred": "https://fred.stlouisfed.org",
+}
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+# Bar spacing for intraday chart intervals; US session 13:30-20:00 UTC
+INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+SESSION_OPEN = pd.Timedelta(hours=13, minutes=30)
+SESSION_CLOSE = pd.Timedelta(hours=20)
+
+
+def _env(name, default, cast=float):
+    return cast(os.environ.get(f"STANDIN_{name.upper()}", default))
+
+
+# ----------------------------------------------------------
+# 1) FAULT INJECTION
+# ----------------------------------------------------------
+class Faults:
+    """Latency, random 5xx / 429 responses and a global rate limit."""
+
+    FIELDS = ("latency", "jitter", "error_rate", "throttle_rate", "rate_limit")
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0,
+                 rate_limit=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit            # requests / second, 0 = unlimited
+        self._rng = random.Random(seed)
+        self._tokens = rate_limit
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                if name in self.FIELDS:
+                    setattr(self, name, float(value))
+            self._tokens = min(self._tokens, self.rate_limit)
+
+    def config(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def apply(self):
+        """Sleep, then return an injected status code or None to serve normally."""
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            roll = self._rng.random()
+            limited = self._take_token()
+
+        if delay > 0:
+            time.sleep(delay)
+        if limited or roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return self._rng.choice((500, 502, 503))
+        return None
+
+    def _take_token(self):
+        if self.rate_limit <= 0:
+            return False
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+        self._refilled = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+
+# ----------------------------------------------------------
+# 2) SYNTHETIC DATA
+# ----------------------------------------------------------
+def synthetic_values(name, index):
+    """
+    Deterministic level series: a function of (name, timestamp) only, so
+    overlapping and incremental requests always agree on shared bars.
+    """
+    seed = zlib.crc32(name.encode())
+    rng = np.random.default_rng(seed)
+    level = 5 + seed % 200
+    t = index.as_unit("s").asi8 / 86_400          # days since epoch
+    periods = np.array([3.7, 23.0, 97.0, 410.0])
+    amps = np.array([0.004, 0.02, 0.06, 0.15])
+    phases = rng.uniform(0, 2 * np.pi, len(periods))
+    wave = (amps * np.sin(2 * np.pi * t[:, None] / periods + phases)).sum(axis=1)
+    return level * np.exp(wave)
+
+
+def bar_times(start, end, interval):
+    days = pd.bdate_range(start.normalize(), end.normalize())
+    minutes = INTRADAY_MINUTES.get(interval)
+    if minutes is None:
+        return days
+    offsets = pd.timedelta_range(SESSION_OPEN, SESSION_CLOSE, freq=f"{minutes}min", closed="left")
+    times = pd.DatetimeIndex((days.values[:, None] + offsets.values[None, :]).ravel())
+    return times[(times >= start) & (times <= end)]
+
+
+def synthetic_chart(symbol, query):
+    interval = query.get("interval", "1d")
+    end = pd.Timestamp.now()
+    if "period1" in query:
+        start = pd.Timestamp(int(query["period1"]), unit="s")
+        end = min(end, pd.Timestamp(int(query.get("period2", end.timestamp())), unit="s"))
+    else:
+        start = period_start(query.get("range", "1y"), now=end) or pd.Timestamp("1990-01-01")
+
+    idx = bar_times(start, end, interval)
+    close = synthetic_values(symbol, idx)
+    spread = close * 0.004
+    quote_ = {
+        "open": (close - spread / 2).round(4).tolist(),
+        "high": (close + spread).round(4).tolist(),
+        "low": (close - spread).round(4).tolist(),
+        "close": close.round(4).tolist(),
+        "volume": [1_000_000] * len(idx),
+    }
+    return {"chart": {"result": [{
+        "meta": {"symbol": symbol, "dataGranularity": interval, "currency": "USD"},
+        "timestamp": idx.as_unit("s").asi8.tolist(),
+        "indicators": {"quote": [quote_], "adjclose": [{"adjclose": quote_["close"]}]},
+    }], "error": None}}
+
+
+def synthetic_fred_csv(series, query):
+    start = pd.Timestamp(query.get("cosd", "1990-01-01"))
+    idx = pd.bdate_range(start, pd.Timestamp.now().normalize())
+    values = synthetic_values(series, idx)
+    rows = [f"{d:%Y-%m-%d},{v:.2f}" for d, v in zip(idx, values)]
+    return "\n".join([f"DATE,{series}"] + rows) + "\n"
+
+
+# ----------------------------------------------------------
+# 3) RECORD / REPLAY
+# ----------------------------------------------------------
+class Recordings:
+    """
+    One JSON file per (endpoint, symbol or series, interval). The request
+    window is not part of the key: replay serves the latest recording and
+    the app's store de-duplicates overlapping bars.
+    """
+
+    def __init__(self, root=RECORDINGS_DIR):
+        self.root = root
+
+    def path(self, kind, name, interval=""):
+        key = f"{name}@{interval}" if interval else name
+        return os.path.join(self.root, kind, f"{quote(key, safe='')}.json")
+
+    def load(self, kind, name, interval=""):
+        path = self.path(kind, name, interval)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save(self, kind, name, interval, status, content_type, body, url):
+        path = self.path(kind, name, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {"status": status, "content_type": content_type, "body": body,
+                  "url": url, "recorded_at": time.time()}
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+
+
+# ----------------------------------------------------------
+# 4) HTTP SERVER
+# ----------------------------------------------------------
+class StandIn:
+    def __init__(self, mode="synthetic", faults=None, recordings=None, upstream_timeout=15):
+        self.mode = mode
+        self.faults = faults or Faults()
+        self.recordings = recordings or Recordings()
+        self.upstream_timeout = upstream_timeout
+        self.stats = Counter()
+        self.messages = []
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": "Mozilla/5.0"})
+
+    def count(self, route, status):
+        with self._lock:
+            self.stats[f"{route} {status}"] += 1
+
+    def handle(self, path, query, raw_query):
+        """-> (status, content_type, body, route)"""
+        if path.startswith("/v8/finance/chart/"):
+            kind, name = "yahoo", unquote(path.rsplit("/", 1)[-1])
+            interval = query.get("interval", "1d")
+        elif path == "/graph/fredgraph.csv" and "id" in query:
+            kind, name, interval = "fred", query["id"], ""
+        else:
+            return 404, "text/plain", "not found", "other"
+
+        injected = self.faults.apply()
+        if injected is not None:
+            return injected, "text/plain", f"injected HTTP {injected}", kind
+
+        if self.mode == "replay":
+            rec = self.recordings.load(kind, name, interval)
+            if rec is None:
+                return 404, "text/plain", f"no recording for {name}", kind
+            return rec["status"], rec["content_type"], rec["body"], kind
+
+        if self.mode == "record":
+            url = f"{UPSTREAM[kind]}{path}?{raw_query}"
+            resp = self._session.get(url, timeout=self.upstream_timeout)
+            content_type = resp.headers.get("Content-Type", "text/plain")
+            if resp.ok:
+                self.recordings.save(kind, name, interval, resp.status_code,
+                                     content_type, resp.text, url)
+            return resp.status_code, content_type, resp.text, kind
+
+        if kind == "yahoo":
+            return 200, "application/json", json.dumps(synthetic_chart(name, query)), kind
+        return 200, "text/csv", synthetic_fred_csv(name, query), kind
+
+    def make_handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+                if url.path == "/__stats":
+                    with standin._lock:
+                        body = dict(standin.stats)
+                    return self._send(200, "application/json", json.dumps(body))
+                if url.path == "/__messages":
+                    with standin._lock:
+                        body = list(standin.messages)
+                    return self._send(200, "application/json", json.dumps(body))
+                if url.path == "/__config":
+                    standin.faults.update(**query)
+                    return self._send(200, "application/json",
+                                      json.dumps(dict(standin.faults.config(), mode=standin.mode)))
+
+                try:
+                    status, content_type, body, route = standin.handle(url.path, query, url.query)
+                except requests.RequestException as e:
+                    status, content_type, body, route = 502, "text/plain", f"upstream: {e}", "upstream"
+                standin.count(route, status)
+                self._send(status, content_type, body)
+
+            def _send(self, status, content_type, body):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, fmt, *args):
+                log.debug("%s " + fmt, self.address_string(), *args)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length).decode() if length else ""
+                if not (url.path.startswith("/bot") and url.path.endswith("/sendMessage")):
+                    standin.count("other", 404)
+                    return self._send(404, "text/plain", "not found")
+
+                injected = standin.faults.apply()
+                if injected is not None:
+                    standin.count("telegram", injected)
+                    return self._send(injected, "text/plain", f"injected HTTP {injected}")
+                try:
+                    message = json.loads(body or "{}")
+                except ValueError:
+                    standin.count("telegram", 400)
+                    return self._send(400, "application/json", json.dumps({"ok": False}))
+                with standin._lock:
+                    standin.messages.append(message)
+                    message_id = len(standin.messages)
+                standin.count("telegram", 200)
+                self._send(200, "application/json",
+                           json.dumps({"ok": True, "result": {"message_id": message_id}}))
+
+        return Handler
+
+    def serve(self, host="127.0.0.1", port=8765):
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        server.daemon_threads = True
+        return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.environ.get("STANDIN_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=_env("port", 8765, int))
+    parser.add_argument("--mode", choices=["synthetic", "record", "replay"],
+                        default=os.environ.get("STANDIN_MODE", "synthetic"))
+    parser.add_argument("--recordings", default=os.environ.get("STANDIN_RECORDINGS", RECORDINGS_DIR))
+    parser.add_argument("--latency", type=float, default=_env("latency", 0), help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=_env("jitter", 0), help="extra uniform random seconds")
+    parser.add_argument("--error-rate", type=float, default=_env("error_rate", 0), help="fraction answered 5xx")
+    parser.add_argument("--throttle-rate", type=float, default=_env("throttle_rate", 0), help="fraction answered 429")
+    parser.add_argument("--rate-limit", type=float, default=_env("rate_limit", 0), help="max requests/s, excess gets 429")
+    parser.add_argument("--seed", type=int, default=None, help="seed for injected faults")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.throttle_rate,
+                    args.rate_limit, seed=args.seed)
+    standin = StandIn(args.mode, faults, Recordings(args.recordings))
+    server = standin.serve(args.host, args.port)
+    log.info("serving %s on http://%s:%d %s", args.mode, args.host, args.port, faults.config())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# startup.py
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+
+from metrics import METRICS
+from settings import STARTUP_BUDGET_SECONDS
+
+log = logging.getLogger("startup")
+
+
+def process_started_at():
+    """Wall-clock start of this process (Linux /proc, 10 ms resolution), else now."""
+    try:
+        with open("/proc/self/stat") as f:
+            ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - (uptime - ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return time.time()
+
+
+class StartupClock:
+    """
+    Seconds from process start to each cold-start phase, recorded once:
+    imports, app_ready, first_layout (first /_dash-layout served),
+    first_snapshot. Exported as startup_seconds{phase} and logged as JSON.
+    """
+
+    def __init__(self, started_at=None, budget=STARTUP_BUDGET_SECONDS):
+        self.started_at = process_started_at() if started_at is None else started_at
+        self.budget = budget
+        self.phases = {}
+        self._marked = threading.Condition()
+
+    def mark(self, phase):
+        with self._marked:
+            if phase in self.phases:
+                return self.phases[phase]
+            seconds = round(time.time() - self.started_at, 3)
+            self.phases[phase] = seconds
+            self._marked.notify_all()
+
+        METRICS.set("startup_seconds", seconds, phase=phase)
+        log.info(json.dumps({"startup_phase": phase, "seconds": seconds, "pid": os.getpid()}))
+        if phase == "first_layout" and self.budget > 0:
+            over = seconds > self.budget
+            METRICS.set("startup_budget_exceeded", int(over))
+            if over:
+                log.warning("cold start %.2fs exceeds budget %.2fs: %s", seconds, self.budget, self.phases)
+        return seconds
+
+    def wait(self, phase, timeout=None):
+        """Block until `phase` has been marked (or timeout); True if it was."""
+        with self._marked:
+            return self._marked.wait_for(lambda: phase in self.phases, timeout)
+
+
+# ----------------------------------------------------------
+# DEFERRED IMPORTS
+# ----------------------------------------------------------
+class ImportGate:
+    """
+    Imports slow modules once, off the request path, without any request
+    thread seeing a half-imported module (plotly's JSON encoder picks up
+    pandas from sys.modules). Requests already in flight finish first;
+    requests arriving while the import runs wait until it is done.
+    """
+
+    def __init__(self, modules):
+        self.modules = modules
+        self.ready = threading.Event()
+        self._active = 0
+        self._loading = False
+        self._idle = threading.Condition()
+
+    def enter(self):
+        """Call before handling a request; True if leave() must follow."""
+        if self.ready.is_set():
+            return False
+        with self._idle:
+            if not self._loading:
+                self._active += 1
+                return True
+        self.ready.wait()
+        return False
+
+    def leave(self):
+        with self._idle:
+            self._active -= 1
+            self._idle.notify_all()
+
+    def load(self):
+        with self._idle:
+            if self._loading:
+                return
+            self._loading = True
+            self._idle.wait_for(lambda: self._active == 0)
+        try:
+            for name in self.modules:
+                importlib.import_module(name)
+        finally:
+            self.ready.set()
+
+
+STARTUP = StartupClock()
+
+METRICS.describe("startup_seconds", "Seconds from process start to each cold-start phase.")
@@ -0,0 +1,70 @@
+# stress_engine.py
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------------
+# 1) WEIGHT SCENARIOS  (name -> {z-score column: weight})
+# ----------------------------------------------------------
+BASELINE_WEIGHTS = {
+    "^VIX": 0.30,
+    "^VIX3M": 0.15,
+    "^VIX6M": 0.10,
+    "HYG/LQD": 0.25,
+    "^TNX": 0.15,
+    "UUP": 0.05,
+    "EEM": -0.10,
+}
+
+STRESS_SCENARIOS = {
+    "Baseline": BASELINE_WEIGHTS,
+    "Volatility-led": {"^VIX": 0.40, "^VIX3M": 0.20, "^VIX6M": 0.10, "HYG/LQD": 0.15,
+                       "^TNX": 0.05, "UUP": 0.05, "EEM": -0.05},
+    "Credit-led": {"^VIX": 0.15, "^VIX3M": 0.05, "HYG/LQD": 0.45, "^TNX": 0.15,
+                   "UUP": 0.05, "EEM": -0.15},
+    "Rates & Dollar": {"^VIX": 0.15, "HYG/LQD": 0.15, "^TNX": 0.35, "UUP": 0.25,
+                       "EEM": -0.10},
+    "Equal weight": {"^VIX": 1 / 7, "^VIX3M": 1 / 7, "^VIX6M": 1 / 7, "HYG/LQD": 1 / 7,
+                     "^TNX": 1 / 7, "UUP": 1 / 7, "EEM": -1 / 7},
+}
+
+
+# ----------------------------------------------------------
+# 2) MATRIX ENGINE
+# ----------------------------------------------------------
+class StressEngine:
+    """
+    All scenarios at once: scores = 50 + 10 * (Z @ W.T).
+
+    Missing components are dropped row by row and the remaining weights
+    are renormalized to the scenario's total absolute weight. Rows where
+    less than `min_coverage` of that weight is available are NaN.
+    """
+
+    def __init__(self, scenarios=STRESS_SCENARIOS, min_coverage=0.5):
+        self.scenarios = list(scenarios)
+        self.components = list(dict.fromkeys(c for w in scenarios.values() for c in w))
+        self.min_coverage = min_coverage
+
+        self.W = np.array([
+            [scenarios[s].get(c, 0.0) for c in self.components]
+            for s in self.scenarios
+        ])                                          # scenarios x components
+        self.absW = np.abs(self.W)
+        self.total = self.absW.sum(axis=1)
+
+    def compute(self, z):
+        """z: frame of z-scores (dates x columns) -> frame (dates x scenarios)."""
+        X = z.reindex(columns=self.components).to_numpy(dtype="float64")
+        return pd.DataFrame(self.score_array(X), index=z.index, columns=self.scenarios)
+
+    def score_array(self, X):
+        """X: rows x self.components array of z-scores -> rows x scenarios array."""
+        available = ~np.isnan(X)
+
+        raw = np.where(available, X, 0.0) @ self.W.T
+        covered = available.astype("float64") @ self.absW.T
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = 50 + 10 * raw * (self.total / covered)
+        scores[covered < self.min_coverage * self.total] = np.nan
+        return scores
@@ -0,0 +1,25 @@
+# tests/conftest.py
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the modules under test live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def random_frame(n=300, cols=3, seed=1, walk=False, start="2024-01-01"):
+    """Business-day frame of N(0, 1) draws (walk=True: a price-like random walk around 100)."""
+    rng = np.random.default_rng(seed)
+    values = rng.standard_normal((n, cols))
+    if walk:
+        values = 100 + values.cumsum(axis=0)
+    index = pd.bdate_range(start, periods=n, name="date")
+    return pd.DataFrame(values, index=index, columns=[f"s{i}" for i in range(cols)])
+
+
+@pytest.fixture
+def make_frame():
+    return random_frame
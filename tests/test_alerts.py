@@ -0,0 +1,52 @@
+# tests/test_alerts.py
+import numpy as np
+import pandas as pd
+
+from alerts import AlertEngine, ListSink
+
+RULES = [
+    {"name": "VIX stressed", "source": "zscore", "series": "^VIX", "op": ">", "threshold": 1.0},
+    {"name": "HY OAS above 5%", "source": "level", "series": "HY_OAS", "op": ">", "threshold": 5.0},
+]
+
+
+def frame(values, n, column):
+    """Alternating above / below threshold history, so a replay would fire repeatedly."""
+    index = pd.bdate_range("2025-01-01", periods=n, name="date")
+    return pd.DataFrame({column: np.resize(values, n)}, index=index)
+
+
+def engine():
+    return AlertEngine(rules=RULES, sinks=[ListSink()])
+
+
+def test_first_update_only_primes():
+    e = engine()
+    assert e.update({"zscore:Volatility": frame([0.0, 2.0], 60, "^VIX")}) == []
+
+
+def test_new_column_keeps_state():
+    e = engine()
+    z = frame([0.0, 2.0, 0.0], 60, "^VIX")
+    e.update({"zscore:Volatility": z})
+
+    # a column appears on the same node: no replay of history
+    z = frame([0.0, 2.0, 0.0], 61, "^VIX")
+    z["^VVIX"] = 0.0
+    z.iloc[-1, 0] = 2.0
+    alerts = e.update({"zscore:Volatility": z})
+    assert [a["time"][:10] for a in alerts] == [str(z.index[-1].date())]
+
+
+def test_missing_series_is_skipped_then_bound():
+    e = engine()
+    e.update({"zscore:Volatility": frame([0.0], 60, "^VIX")})
+
+    # fred_levels appears later: bound and primed, not replayed
+    levels = frame([6.0, 4.0], 60, "HY_OAS")
+    assert e.update({"zscore:Volatility": frame([0.0], 60, "^VIX"), "fred_levels": levels}) == []
+
+    levels = frame([6.0, 4.0], 61, "HY_OAS")
+    levels.iloc[-1, 0] = 6.0
+    alerts = e.update({"zscore:Volatility": frame([0.0], 61, "^VIX"), "fred_levels": levels})
+    assert [a["rule"] for a in alerts] == ["HY OAS above 5%"]
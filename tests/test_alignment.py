@@ -0,0 +1,41 @@
+# tests/test_alignment.py
+import numpy as np
+import pandas as pd
+
+from alignment import asof_join, sample, infer_frequency, trading_days
+
+
+def test_asof_join_uses_latest_observation():
+    monthly = pd.DataFrame({"m": [1.0, 2.0]}, index=pd.to_datetime(["2025-01-01", "2025-02-01"]))
+    calendar = pd.to_datetime(["2024-12-31", "2025-01-01", "2025-01-31", "2025-02-03"])
+    out = asof_join(monthly, calendar)
+    assert out["m"].tolist()[1:] == [1.0, 1.0, 2.0]
+    assert np.isnan(out["m"].iloc[0])             # before the series starts
+
+
+def test_asof_join_per_column_observations():
+    index = pd.to_datetime(["2025-01-02", "2025-01-03", "2025-01-06"])
+    frame = pd.DataFrame({"d": [1.0, 2.0, 3.0], "w": [10.0, np.nan, np.nan]}, index=index)
+    out = asof_join(frame, index)
+    assert out["w"].tolist() == [10.0, 10.0, 10.0]
+
+
+def test_asof_join_max_age():
+    frame = pd.DataFrame({"m": [1.0]}, index=pd.to_datetime(["2025-01-01"]))
+    out = asof_join(frame, pd.to_datetime(["2025-01-05", "2025-03-01"]), max_age="30D")
+    assert out["m"].iloc[0] == 1.0 and np.isnan(out["m"].iloc[1])
+
+
+def test_sample_never_labels_before_observation():
+    daily = pd.Series(np.arange(40.0), index=pd.bdate_range("2025-01-01", periods=40)).to_frame("d")
+    out = sample(daily, "ME")
+    for date, value in out["d"].items():
+        assert daily["d"][daily.index <= date].iloc[-1] == value
+    assert out.index[-1] == daily.index[-1]
+
+
+def test_trading_days_and_frequency():
+    days = trading_days("2025-07-01", "2025-07-08")
+    assert pd.Timestamp("2025-07-04") not in days and len(days) == 5
+    monthly = pd.Series(1.0, index=pd.date_range("2020-01-01", periods=24, freq="MS"))
+    assert infer_frequency(monthly) == "M"
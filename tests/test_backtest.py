@@ -0,0 +1,48 @@
+# tests/test_backtest.py
+import numpy as np
+import pandas as pd
+
+from backtest import expanding_zscore, recession_signal, crossing_events, evaluate
+
+
+def test_expanding_zscore_matches_pandas(make_frame):
+    df = make_frame(walk=True)
+    df.iloc[:30, 1] = np.nan
+    e = df.expanding(min_periods=20)
+    expected = (df - e.mean()) / e.std()
+    pd.testing.assert_frame_equal(expanding_zscore(df, 20), expected, check_freq=False, atol=1e-9)
+
+
+def test_expanding_zscore_has_no_lookahead(make_frame):
+    df = make_frame(walk=True)
+    shocked = df.copy()
+    shocked.iloc[200:] *= 3.0                        # the future changes
+    pd.testing.assert_frame_equal(expanding_zscore(df).iloc[:200], expanding_zscore(shocked).iloc[:200])
+
+
+def test_recession_signal_has_no_lookahead(make_frame):
+    daily = make_frame(n=2000, cols=3, walk=True, start="1995-01-01")
+    monthly = daily.resample("MS").first()
+    inputs = {"spread": daily["s0"].rename("spread"), "hy": daily["s1"].rename("hy"),
+              "delta_u": monthly["s2"].rename("delta_u"),
+              "cape": monthly["s0"].iloc[-24:].rename("cape")}      # CAPE starts late
+    p = recession_signal(**inputs)
+    assert p.index[0] < inputs["cape"].index[0]      # scored before CAPE history exists
+
+    cut = daily.index[1500]
+    early = recession_signal(**{k: s[s.index <= cut] for k, s in inputs.items()})
+    common = early.index[early.index < cut]
+    pd.testing.assert_series_equal(p.loc[common], early.loc[common], check_freq=False)
+
+
+def test_crossings_and_lead_time():
+    index = pd.date_range("2000-01-31", periods=6, freq="ME")
+    signals = pd.DataFrame({"s": [0.1, 0.6, 0.2, 0.7, 0.8, 0.1]}, index=index)
+    events = crossing_events(signals, [0.5])
+    assert list(events["date"]) == [index[1], index[3]]
+
+    usrec = pd.Series([0, 0, 0, 0, 1, 1], index=index)       # recession starts at index[4]
+    stats = evaluate(signals, [0.5], usrec, horizon=pd.Timedelta(days=60))
+    row = stats.iloc[0]
+    assert row["crossings"] == 2 and row["hit_rate"] == 0.5 and row["recall"] == 1.0
+    assert row["mean_lead_days"] == (index[4] - index[3]).days
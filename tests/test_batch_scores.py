@@ -0,0 +1,59 @@
+# tests/test_batch_scores.py
+import pandas as pd
+import pytest
+
+import batch_scores
+
+SUNDAY = pd.Timestamp("2026-10-18")
+
+
+@pytest.fixture
+def calls(monkeypatch, make_frame):
+    """Stub the panel graph and recession model; record which path ran."""
+    calls = {}
+    stress = make_frame(n=600, cols=1, start="2024-06-03").set_axis(["Stress Score"], axis=1)
+    recession = stress["Stress Score"].abs().rename("Recession Probability")
+
+    class Resolver:
+        def __init__(self, graph):
+            pass
+
+        def get(self, name):
+            return stress
+
+    def live_source(period):
+        calls["period"] = period
+
+    def full_sample(freq):
+        calls["recession"] = "full-sample"
+        return {"history": recession}
+
+    def point_in_time():
+        calls["recession"] = "point-in-time"
+        return recession
+
+    monkeypatch.setattr(batch_scores, "Resolver", Resolver)
+    monkeypatch.setattr(batch_scores, "build_graph", lambda tickers, source: None)
+    monkeypatch.setattr(batch_scores, "LiveSource", live_source)
+    monkeypatch.setattr(batch_scores, "compute_recession_probability", full_sample)
+    monkeypatch.setattr(batch_scores, "point_in_time_recession", point_in_time)
+    return calls
+
+
+def test_default_is_latest_trading_day(calls):
+    scores = batch_scores.compute_scores(now=SUNDAY)
+    assert scores.index.tolist() == [pd.Timestamp("2026-10-16")]
+    assert calls == {"period": "1y", "recession": "full-sample"}
+
+
+def test_end_alone_is_scored_point_in_time(calls):
+    scores = batch_scores.compute_scores(end="2025-01-20", now=SUNDAY)   # MLK day
+    assert scores.index.tolist() == [pd.Timestamp("2025-01-17")]
+    assert calls["recession"] == "point-in-time"
+    assert calls["period"] != "1y"                # warm-up reaches back before end
+
+
+def test_range_uses_trading_days(calls):
+    scores = batch_scores.compute_scores("2025-06-30", "2025-07-07", now=SUNDAY)
+    assert len(scores) == 5                       # July 4th and the weekend dropped
+    assert calls["recession"] == "point-in-time"
@@ -0,0 +1,47 @@
+# tests/test_cache.py
+import threading
+import time
+
+from cache import RefreshMemo
+
+
+def test_loads_once_until_invalidated():
+    memo, calls = RefreshMemo(), []
+    load = lambda: calls.append(1) or len(calls)
+    assert memo.get("k", load) == 1
+    assert memo.get("k", load) == 1
+    memo.invalidate()
+    assert memo.get("k", load) == 2
+
+
+def test_invalid_value_is_not_kept():
+    memo, calls = RefreshMemo(), []
+    load = lambda: calls.append(1) or ""
+    memo.get("k", load, valid=bool)
+    memo.get("k", load, valid=bool)
+    assert len(calls) == 2
+
+
+def test_concurrent_callers_share_one_load():
+    memo, calls = RefreshMemo(), []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(memo.get("k", load))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["value"] * 5 and len(calls) == 1
+
+
+def test_invalidate_single_key():
+    memo = RefreshMemo()
+    memo.get("a", lambda: 1)
+    memo.get("b", lambda: 2)
+    memo.invalidate("a")
+    assert memo.get("a", lambda: 3) == 3 and memo.get("b", lambda: 4) == 2
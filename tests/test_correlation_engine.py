@@ -0,0 +1,46 @@
+# tests/test_correlation_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation_engine import RollingCorrelation, DEFAULT_WINDOW, DEFAULT_MIN_PERIODS
+from zscore_engine import REVISION_DEPTH
+
+
+@pytest.fixture
+def changes(make_frame):
+    df = make_frame(cols=4, seed=3)
+    df.iloc[5:40, 2] = np.nan                     # a series starting late
+    return df
+
+
+def assert_same(result, expected):
+    for key in ("corr", "cov", "stress"):
+        pd.testing.assert_frame_equal(result[key], expected[key], check_freq=False, atol=1e-9, rtol=0)
+
+
+def test_incremental_matches_rolling_corr(changes):
+    engine = RollingCorrelation()
+    engine.update(changes.iloc[:200])
+    corr = engine.update(changes)["corr"]
+    expected = changes.iloc[-DEFAULT_WINDOW:].corr(min_periods=DEFAULT_MIN_PERIODS)
+    np.testing.assert_allclose(corr.to_numpy(), expected.to_numpy(), atol=1e-9)
+
+
+@pytest.mark.parametrize("back", [1, REVISION_DEPTH, REVISION_DEPTH + 1, 40])
+def test_revised_bar_reprocessed(changes, back):
+    engine = RollingCorrelation()
+    engine.update(changes.iloc[:260])
+
+    revised = changes.iloc[:262].copy()
+    revised.iloc[-back] *= 1.5
+    assert_same(engine.update(revised), RollingCorrelation().update(revised))
+
+
+def test_partial_bars_replaced(changes):
+    engine = RollingCorrelation()
+    for n in range(200, 230):
+        partial = changes.iloc[:n].copy()
+        partial.iloc[-1] += 0.7                   # bar still forming
+        engine.update(partial)
+    assert_same(engine.update(changes.iloc[:230]), RollingCorrelation().update(changes.iloc[:230]))
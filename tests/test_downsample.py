@@ -0,0 +1,43 @@
+# tests/test_downsample.py
+import numpy as np
+import pandas as pd
+
+from downsample import lttb, minmax, downsample_series, window_series
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000, dtype="float64")
+    y = np.zeros(1000)
+    y[437] = 50.0
+    keep = lttb(x, y, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 999
+    assert 437 in keep
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_small_input_unchanged():
+    assert lttb(np.arange(5.0), np.arange(5.0), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_minmax_keeps_bucket_extremes():
+    y = np.sin(np.linspace(0, 20, 1000))
+    idx = minmax(y, 50)
+    assert y[idx].max() == y.max() and y[idx].min() == y.min()
+
+
+def test_downsample_series_drops_nans(make_frame):
+    s = make_frame(n=5000, cols=1)["s0"]
+    s.iloc[::7] = np.nan
+    out = downsample_series(s, 400)
+    assert len(out) == 400 and not out.isna().any()
+    assert out.index[0] == s.dropna().index[0] and out.index[-1] == s.index[-1]
+
+
+def test_window_series_full_resolution_inside(make_frame):
+    s = make_frame(n=5000, cols=1)["s0"]
+    x0, x1 = s.index[2000], s.index[2100]
+    out = window_series(s, 400, (x0, x1))
+    inside = s[(s.index >= x0) & (s.index <= x1)]
+    pd.testing.assert_series_equal(out.loc[x0:x1], inside, check_freq=False)
+    assert out.index[0] == s.index[0] and out.index[-1] == s.index[-1]
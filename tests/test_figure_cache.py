@@ -0,0 +1,34 @@
+# tests/test_figure_cache.py
+from figure_cache import FigureCache
+
+
+def build(payload):
+    return lambda: ({"data": payload}, {"extra": payload})
+
+
+def test_hit_returns_parsed_copy():
+    cache = FigureCache()
+    first, extra = cache.get_or_build(("p", 1), build("a"))
+    first["data"] = "mutated"
+    again, _ = cache.get_or_build(("p", 1), build("b"))
+    assert again == {"data": "a"} and extra == {"extra": "a"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    entry = len('{"data":"xxxx"}')
+    cache = FigureCache(max_bytes=2 * entry)
+    cache.get_or_build(("p", 1), build("aaaa"))
+    cache.get_or_build(("p", 2), build("bbbb"))
+    cache.get_or_build(("p", 1), build("aaaa"))   # 1 is now the most recent
+    cache.get_or_build(("p", 3), build("cccc"))
+
+    assert len(cache) == 2 and cache.bytes == 2 * entry
+    cache.get_or_build(("p", 2), build("BBBB"))   # evicted: rebuilt
+    assert cache.misses == 4
+
+
+def test_oversized_entry_not_cached():
+    cache = FigureCache(max_bytes=5)
+    cache.get_or_build(("p", 1), build("too large"))
+    assert len(cache) == 0 and cache.bytes == 0
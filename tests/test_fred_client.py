@@ -0,0 +1,97 @@
+# tests/test_fred_client.py
+import pytest
+import requests
+
+from fred_client import FredClient, CircuitBreaker, CircuitOpenError
+
+CSV = "DATE,UNRATE\n2025-01-01,4.0\n2025-02-01,4.1\n2025-03-01,.\n"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Returns the queued responses (or raises queued exceptions) in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        r = self.responses.pop(0)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+
+def client(*responses, retries=3):
+    c = FredClient(base_url="http://fred.test", retries=retries, backoff=0.0)
+    c.session = FakeSession(*responses)
+    return c
+
+
+def test_parses_csv_with_missing_values():
+    df = client(FakeResponse(200, CSV)).fetch("UNRATE")
+    assert list(df.columns) == ["UNRATE"]
+    assert df["UNRATE"].tolist()[:2] == [4.0, 4.1]
+    assert df["UNRATE"].isna().iloc[-1]
+
+
+def test_retries_5xx_and_network_errors():
+    c = client(FakeResponse(503), requests.ConnectionError("reset"), FakeResponse(200, CSV))
+    assert len(c.fetch("UNRATE")) == 3
+    assert c.session.calls == 3
+
+
+def test_4xx_is_not_retried():
+    c = client(FakeResponse(404), FakeResponse(200, CSV))
+    with pytest.raises(requests.HTTPError):
+        c.fetch("CAPE")
+    assert c.session.calls == 1
+
+
+def test_breaker_opens_after_repeated_failures():
+    c = client(*[FakeResponse(404)] * 3)
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            c.fetch("CAPE")
+
+    with pytest.raises(CircuitOpenError):
+        c.fetch("CAPE")
+    assert c.session.calls == 3                   # rejected without a request
+
+
+def test_breaker_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    breaker.opened_at -= 60                       # reset timeout elapsed
+    assert breaker.state == "half-open"
+    assert breaker.allow()                        # one trial request
+    assert not breaker.allow()                    # the others wait for it
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_fetch_many_reports_errors_per_series():
+    def fetch(series, start=None):
+        if series == "CAPE":
+            raise ValueError("bad")
+        return f"frame:{series}"
+
+    c = client()
+    c.fetch = fetch
+    frames, errors = c.fetch_many(["UNRATE", "CAPE"])
+    assert frames == {"UNRATE": "frame:UNRATE"}
+    assert errors["CAPE"].startswith("ValueError")
+    assert c.last_errors == errors
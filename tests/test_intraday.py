@@ -0,0 +1,47 @@
+# tests/test_intraday.py
+import numpy as np
+import pandas as pd
+
+from intraday import IntradayStream, GRACE_SECONDS
+
+TICKERS = {"Equity": ["SPY", "QQQ"]}
+NOW = pd.Timestamp("2026-10-16 15:00:30")
+
+
+def minutes(values):
+    """1-minute closes ending at the last closed minute before NOW."""
+    index = pd.date_range(end=NOW.floor("min") - pd.Timedelta(minutes=1), periods=len(values), freq="min")
+    return pd.DataFrame(values, index=index, columns=["SPY", "QQQ"], dtype="float64")
+
+
+def held(stream):
+    _, x = stream.prices.since(None)
+    return x
+
+
+def test_late_symbol_close_is_kept():
+    stream = IntradayStream(TICKERS)
+    bars = minutes([[1.0, 10.0], [1.1, 10.1], [1.2, np.nan]])
+    assert stream.ingest(bars, now=NOW) == 2      # newest minute waits for QQQ
+
+    bars.iloc[-1, 1] = 10.5                       # QQQ reports on the next poll
+    assert stream.ingest(bars, now=NOW + pd.Timedelta(seconds=20)) == 1
+    assert held(stream)[-1].tolist() == [1.2, 10.5]
+
+
+def test_missing_symbol_carried_after_grace():
+    stream = IntradayStream(TICKERS)
+    bars = minutes([[1.0, 10.0], [1.1, np.nan]])
+    assert stream.ingest(bars, now=NOW) == 1
+
+    later = NOW + pd.Timedelta(seconds=GRACE_SECONDS)
+    assert stream.ingest(bars, now=later) == 1
+    assert held(stream)[-1].tolist() == [1.1, 10.0]
+
+
+def test_open_minute_not_ingested():
+    stream = IntradayStream(TICKERS)
+    bars = minutes([[1.0, 10.0]])
+    bars.loc[NOW.floor("min")] = [1.1, 10.1]      # still forming
+    assert stream.ingest(bars, now=NOW) == 1
+    assert stream.ingest(bars, now=NOW) == 0
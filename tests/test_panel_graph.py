@@ -0,0 +1,16 @@
+# tests/test_panel_graph.py
+import pandas as pd
+
+from panel_graph import _corr_changes
+
+
+def test_corr_changes_keep_only_daily_fred(make_frame):
+    prices = make_frame(n=300, cols=2, walk=True)
+    daily = make_frame(n=300, cols=1, seed=2, walk=True).set_axis(["DGS10"], axis=1)
+    weekly = pd.DataFrame({"NFCI": -0.4}, index=pd.date_range("2024-01-05", periods=60, freq="W-FRI"))
+    monthly = pd.DataFrame({"TOTALSL": 4500.0}, index=pd.date_range("2024-01-01", periods=14, freq="MS"))
+    macro = pd.concat([daily, weekly, monthly], axis=1, sort=True)  # outer-joined, not filled
+
+    changes = _corr_changes(prices, macro)
+    assert list(changes.columns) == ["s0", "s1", "DGS10"]
+    assert (changes["DGS10"].dropna() != 0).all()
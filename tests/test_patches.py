@@ -0,0 +1,82 @@
+# tests/test_patches.py
+import time
+
+import numpy as np
+import pytest
+from dash import dcc, html
+
+from patches import panel_state, refresh_patch, held_frame
+from precompute import Snapshot
+
+TITLE = "Stress Score Trend"
+
+
+def snapshot(df, version):
+    frames = {"Stress Score": {TITLE: (df, {})}}
+    return Snapshot(version, time.time(), {}, {"Stress Score": version}, frames, {})
+
+
+def rendered(df):
+    """State of a client that rendered df in full."""
+    children = html.Div([dcc.Graph(id={"type": "ts-graph", "title": TITLE})])
+    return panel_state("Stress Score", "v1", children, {TITLE: (df, {})})
+
+
+def operations(patch):
+    return [(op["operation"], op["location"][-1], op["params"]["value"])
+            for op in patch.to_plotly_json()["operations"]]
+
+
+@pytest.fixture
+def scores(make_frame):
+    df = make_frame(n=100, cols=1)
+    df.columns = ["Stress Score"]
+    return 50 + 10 * df
+
+
+def test_unchanged_only_reasserts_last_bar(scores):
+    patch, state = refresh_patch(rendered(scores), snapshot(scores, "v1"), "Stress Score")
+    assert [op[:2] for op in operations(patch)] == [("Assign", -1), ("Assign", -1)]
+    assert state["graphs"] == rendered(scores)["graphs"]
+
+
+def test_new_bar_is_appended(scores):
+    state = rendered(scores.iloc[:-1])
+    patch, new_state = refresh_patch(state, snapshot(scores, "v2"), "Stress Score")
+    ops = operations(patch)
+    assert ("Extend", "x", [scores.index[-1].isoformat()]) in ops
+    assert ("Extend", "y", [float(scores.iloc[-1, 0])]) in ops
+    assert new_state == dict(rendered(scores), version="v2")
+
+
+def test_revised_last_bar_is_overwritten(scores):
+    partial = scores.copy()
+    partial.iloc[-1, 0] += 5.0                    # bar still forming
+    patch, _ = refresh_patch(rendered(partial), snapshot(scores, "v2"), "Stress Score")
+    assert ("Assign", -1, float(scores.iloc[-1, 0])) in operations(patch)
+    assert not any(op[0] == "Extend" for op in operations(patch))
+
+
+def test_rewritten_history_needs_full_render(scores):
+    state = rendered(scores.iloc[:-1])
+    rewritten = scores.copy()
+    rewritten.iloc[:50, 0] += 30.0                # e.g. adjusted-close rebase
+    assert refresh_patch(state, snapshot(rewritten, "v2"), "Stress Score") is None
+
+
+def test_missing_last_x_needs_full_render(scores):
+    state = rendered(scores)
+    assert refresh_patch(state, snapshot(scores.drop(scores.index[-1]), "v2"), "Stress Score") is None
+
+
+def test_held_frame_blanks_bars_the_client_lacks(scores):
+    state = rendered(scores.iloc[:-3])
+    held = held_frame(scores, state, TITLE)
+    assert held["Stress Score"].isna().sum() == 3
+    assert held_frame(scores, None, TITLE) is scores
+
+    # after a zoom re-render from the newer frame, the next patch appends each bar once
+    patch, _ = refresh_patch(state, snapshot(scores, "v2"), "Stress Score")
+    extended = [v for op, loc, v in operations(patch) if op == "Extend" and loc == "x"]
+    assert extended == [[t.isoformat() for t in scores.index[-3:]]]
+    assert not np.isnan(held["Stress Score"].iloc[-4])
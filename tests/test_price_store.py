@@ -0,0 +1,80 @@
+# tests/test_price_store.py
+import pandas as pd
+import pytest
+
+from price_store import PriceStore, REVISION_OBSERVATIONS
+
+
+class Source:
+    """Upstream series; records the start of every fetch."""
+
+    def __init__(self, n=60):
+        index = pd.date_range("2020-01-01", periods=n, freq="MS", name="DATE")
+        self.df = pd.DataFrame({"UNRATE": [4.0 + i / 100 for i in range(n)]}, index=index)
+        self.starts = []
+
+    def __call__(self, start):
+        self.starts.append(start)
+        return self.df if start is None else self.df[self.df.index >= pd.Timestamp(start)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceStore(root=str(tmp_path), min_refresh=0)
+
+
+def sync(store, source, start="2020-01-01"):
+    return store.sync("fred", "UNRATE", source, start)
+
+
+def test_cold_sync_writes_history(store):
+    source = Source()
+    df = sync(store, source)
+    assert df["UNRATE"].tolist() == source.df["UNRATE"].tolist()
+    assert source.starts == ["2020-01-01"]
+    assert store.requested_start("fred", "UNRATE") == pd.Timestamp("2020-01-01")
+
+
+def test_warm_sync_appends_from_revision_window(store):
+    source = Source()
+    sync(store, source)
+    source.df.loc[pd.Timestamp("2025-01-01"), "UNRATE"] = 5.5      # new release
+
+    df = sync(store, source)
+    assert df["UNRATE"].iloc[-1] == 5.5 and len(df) == 61
+    assert source.starts[-1] == source.df.index[-1 - REVISION_OBSERVATIONS]
+    assert len(source.starts) == 2                                  # no rewrite
+
+
+def test_revised_observation_rewrites_history(store):
+    source = Source()
+    sync(store, source)
+    source.df.iloc[-3, 0] += 0.2                                    # FRED revision
+
+    df = sync(store, source)
+    assert source.starts[-1] == pd.Timestamp("2020-01-01")          # full re-fetch
+    assert df["UNRATE"].iloc[-3] == pytest.approx(source.df["UNRATE"].iloc[-3])
+
+
+def test_removed_observation_rewrites_history(store):
+    source = Source()
+    sync(store, source)
+    source.df = source.df.drop(source.df.index[-2])
+
+    df = sync(store, source)
+    assert len(df) == 59
+
+
+def test_fresh_symbol_is_not_fetched(tmp_path):
+    store = PriceStore(root=str(tmp_path), min_refresh=300)
+    source = Source()
+    sync(store, source)
+    sync(store, source)
+    assert len(source.starts) == 1
+
+
+def test_empty_update_only_touches(store):
+    source = Source()
+    sync(store, source)
+    source.df = source.df.iloc[:0]
+    assert len(sync(store, source)) == 60
@@ -0,0 +1,36 @@
+# tests/test_recession_bands.py
+import numpy as np
+
+from recession_bands import block_moments, bootstrap_probabilities, input_seed, percentile_bands
+
+BETAS = [-1.0, -0.45, 0.35, 0.30, 0.25, 0.20, 0.20]
+
+
+def components(seed=0):
+    rng = np.random.default_rng(seed)
+    return [block_moments(rng.standard_normal(500), 1.0) for _ in range(4)]
+
+
+def test_input_seed_is_deterministic():
+    assert input_seed(components(), BETAS, (1.0, 1.0), 1000) == input_seed(components(), BETAS, (1.0, 1.0), 1000)
+    assert input_seed(components(), BETAS, (1.0, 1.0), 1000) != input_seed(components(1), BETAS, (1.0, 1.0), 1000)
+    assert input_seed(components(), BETAS, (1.0, 1.0), 1000) != input_seed(components(), BETAS, (1.0, 1.0), 2000)
+
+
+def test_same_inputs_same_bands():
+    a = bootstrap_probabilities(components(), BETAS, (1.0, 1.0), 6000)
+    b = bootstrap_probabilities(components(), BETAS, (1.0, 1.0), 6000)
+    assert len(a) == 6000
+    np.testing.assert_array_equal(a, b)
+
+
+def test_threads_match_inline():
+    inline = bootstrap_probabilities(components(), BETAS, (1.0, 1.0), 6000, workers=1)
+    threaded = bootstrap_probabilities(components(), BETAS, (1.0, 1.0), 6000, workers=3)
+    np.testing.assert_array_equal(inline, threaded)
+
+
+def test_bands_are_ordered_probabilities():
+    bands = percentile_bands(bootstrap_probabilities(components(), BETAS, (1.0, 1.0), 3000))
+    values = list(bands.values())
+    assert values == sorted(values) and 0 < values[0] and values[-1] < 1
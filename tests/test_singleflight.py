@@ -0,0 +1,80 @@
+# tests/test_singleflight.py
+import threading
+import time
+
+import pandas as pd
+
+from singleflight import SingleFlight, single_flight, _GROUP
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run(fn, results, key):
+    t = threading.Thread(target=lambda: results.__setitem__(key, fn()), daemon=True)
+    t.start()
+    return t
+
+
+def test_leader_and_follower_get_private_copies():
+    group, go = SingleFlight(), threading.Event()
+    shared = pd.DataFrame({"x": [1.0, 2.0]})
+
+    def load():
+        go.wait()
+        return shared
+
+    results = {}
+    leader = run(lambda: group.do("k", load), results, "leader")
+    wait_until(lambda: group.in_flight() == 1)
+    follower = run(lambda: group.do("k", load), results, "follower")
+    wait_until(lambda: group._calls["k"].waiters == 1)
+    go.set()
+    leader.join()
+    follower.join()
+
+    assert results["leader"] is not shared and results["follower"] is not shared
+    results["leader"].loc[0, "x"] = 99.0          # the leader's caller edits its frame
+    assert results["follower"]["x"].tolist() == [1.0, 2.0]
+    assert shared["x"].tolist() == [1.0, 2.0]
+
+
+def test_lone_caller_gets_the_result_itself():
+    value = pd.DataFrame({"x": [1.0]})
+    assert SingleFlight().do("k", lambda: value) is value
+
+
+def test_errors_are_shared():
+    group = SingleFlight()
+    try:
+        group.do("k", lambda: 1 / 0)
+    except ZeroDivisionError:
+        pass
+    assert group.in_flight() == 0
+
+
+def test_positional_and_keyword_arguments_coalesce():
+    go, calls = threading.Event(), []
+
+    @single_flight
+    def fetch(series, start=None):
+        calls.append((series, start))
+        go.wait()
+        return pd.DataFrame({series: [1.0]})
+
+    results = {}
+    first = run(lambda: fetch("UNRATE", None), results, "a")
+    wait_until(lambda: _GROUP.in_flight() == 1)
+    second = run(lambda: fetch("UNRATE", start=None), results, "b")
+    third = run(lambda: fetch(series="UNRATE"), results, "c")
+    wait_until(lambda: sum(c.waiters for c in _GROUP._calls.values()) == 2)
+    go.set()
+    for t in (first, second, third):
+        t.join()
+
+    assert calls == [("UNRATE", None)]
+    assert all(r.equals(results["a"]) for r in results.values())
@@ -0,0 +1,36 @@
+# tests/test_stress_engine.py
+import numpy as np
+import pandas as pd
+
+from stress_engine import StressEngine
+
+SCENARIOS = {"A": {"x": 0.5, "y": 0.3, "z": -0.2}, "B": {"x": 1.0}}
+
+
+def scores(rows):
+    z = pd.DataFrame(rows, columns=["x", "y", "z"], dtype="float64")
+    return StressEngine(SCENARIOS).compute(z)
+
+
+def test_matches_weighted_sum_when_complete():
+    out = scores([[1.0, 2.0, -1.0]])
+    assert np.isclose(out.loc[0, "A"], 50 + 10 * (0.5 * 1.0 + 0.3 * 2.0 - 0.2 * -1.0))
+    assert np.isclose(out.loc[0, "B"], 60.0)
+
+
+def test_missing_component_renormalized():
+    out = scores([[1.0, np.nan, -1.0]])
+    # x and z cover 0.7 of the total absolute weight 1.0
+    assert np.isclose(out.loc[0, "A"], 50 + 10 * (0.5 * 1.0 + 0.2) / 0.7)
+
+
+def test_low_coverage_is_nan():
+    out = scores([[np.nan, 1.0, 1.0], [np.nan, 1.0, np.nan]])
+    assert out["A"].isna().tolist() == [False, True]      # 0.5 of the weight is enough, 0.3 is not
+    assert out["B"].isna().all()
+
+
+def test_unknown_columns_are_ignored():
+    z = pd.DataFrame({"x": [1.0], "other": [9.0]})
+    out = StressEngine(SCENARIOS).compute(z)
+    assert np.isclose(out.loc[0, "B"], 60.0)
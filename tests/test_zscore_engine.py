@@ -0,0 +1,67 @@
+# tests/test_zscore_engine.py
+import pandas as pd
+import pytest
+
+from zscore_engine import RollingZScore, EWMZScore, REVISION_DEPTH
+
+WINDOW = 60
+MIN_PERIODS = 20
+
+
+@pytest.fixture
+def prices(make_frame):
+    return make_frame(walk=True)
+
+
+def rolling_reference(df):
+    r = df.rolling(WINDOW, min_periods=MIN_PERIODS)
+    return (df - r.mean()) / r.std()
+
+
+def assert_matches(z, expected):
+    pd.testing.assert_frame_equal(z, expected, check_freq=False, atol=1e-9, rtol=0)
+
+
+def test_incremental_matches_rolling(prices):
+    engine = RollingZScore(WINDOW, MIN_PERIODS)
+    engine.update(prices.iloc[:200])
+    assert_matches(engine.update(prices), rolling_reference(prices))
+
+
+def test_partial_last_bar_is_replaced(prices):
+    partial = prices.iloc[:250].copy()
+    partial.iloc[-1] += 3.0                       # bar still forming
+
+    engine = RollingZScore(WINDOW, MIN_PERIODS)
+    engine.update(partial)
+    # the completed bar replaces the partial one, then the next bar arrives
+    assert_matches(engine.update(prices.iloc[:250]), rolling_reference(prices.iloc[:250]))
+    assert_matches(engine.update(prices.iloc[:251]), rolling_reference(prices.iloc[:251]))
+
+
+@pytest.mark.parametrize("back", [2, REVISION_DEPTH, REVISION_DEPTH + 1, 40])
+def test_revised_bar_reprocessed(prices, back):
+    engine = RollingZScore(WINDOW, MIN_PERIODS)
+    engine.update(prices.iloc[:260])
+
+    revised = prices.iloc[:262].copy()
+    revised.iloc[-back] *= 1.05                   # e.g. re-adjusted close
+    assert_matches(engine.update(revised), rolling_reference(revised))
+
+
+def test_removed_bar(prices):
+    engine = RollingZScore(WINDOW, MIN_PERIODS)
+    engine.update(prices.iloc[:260])
+
+    dropped = prices.iloc[:262].drop(prices.index[258])
+    assert_matches(engine.update(dropped), rolling_reference(dropped))
+
+
+def test_ewm_revision_matches_fresh_engine(prices):
+    partial = prices.iloc[:250].copy()
+    partial.iloc[-1] -= 2.0
+
+    engine = EWMZScore(halflife=20, min_periods=MIN_PERIODS)
+    engine.update(partial)
+    fresh = EWMZScore(halflife=20, min_periods=MIN_PERIODS).update(prices.iloc[:252])
+    assert_matches(engine.update(prices.iloc[:252]), fresh)
@@ -0,0 +1,14 @@
+# tickers.py
+# Working tickers only
+RISK_TICKERS = {
+    "Signal Guide": [],
+    "FRED Macro": [],
+    "Recession Risk": [],  
+    "Volatility": ["^VIX", "^VIX3M", "^VIX6M", "^VXN", "^SKEW"],
+    "Credit Risk": ["HYG", "JNK", "LQD"],
+    "Treasury Yields": ["^FVX", "^TNX", "^TYX"],
+    "Liquidity": ["UUP", "SHY", "IEI"],
+    "Global Risk": ["EEM"],
+    "Stress Score": [],
+    "Correlation Regime": [],
+}
@@ -0,0 +1,114 @@
+# yahoo_chart.py
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from fred_client import RETRY_STATUS
+from metrics import record_request
+
+log = logging.getLogger(__name__)
+
+# When set (e.g. http://127.0.0.1:8765 for standin_server.py), Yahoo
+# prices are read from {YAHOO_BASE_URL}/v8/finance/chart/... instead of
+# going through yahooquery.
+YAHOO_BASE_URL = os.environ.get("YAHOO_BASE_URL", "")
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+class YahooChartClient:
+    """
+    Minimal Yahoo v8 chart client returning yahooquery-shaped history:
+    MultiIndex (symbol, date) with open / high / low / close / volume /
+    adjclose columns. Same pooling and retry policy as FredClient.
+    """
+
+    def __init__(self, base_url, max_workers=8, timeout=(3.05, 10), retries=3, backoff=0.5):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yahoo")
+
+    def history(self, tickers, interval="1d", period=None, start=None):
+        """Like yahooquery Ticker.history(); symbols that fail are logged and left out."""
+        params = {"interval": interval, "events": "div,split"}
+        if start is not None:
+            params["period1"] = int(pd.Timestamp(start).timestamp())
+            params["period2"] = int(time.time())
+        else:
+            params["range"] = period or "1y"
+
+        results = self._pool.map(lambda t: self._symbol_history(t, params), tickers)
+        frames = [df for df in results if df is not None and not df.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames)
+
+    def _symbol_history(self, symbol, params):
+        try:
+            payload = self._get_with_retries(symbol, params)
+            return _parse_chart(payload, symbol, params["interval"])
+        except Exception as e:
+            log.warning("Yahoo chart fetch failed for %s (%s: %s)", symbol, type(e).__name__, e)
+            return None
+
+    def _get_with_retries(self, symbol, params):
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                resp = self.session.get(
+                    f"{self.base_url}/v8/finance/chart/{quote(symbol, safe='')}",
+                    params=params, timeout=self.timeout,
+                )
+            except requests.RequestException as e:
+                error = e
+                record_request("yahoo", symbol, started, type(e).__name__)
+            else:
+                record_request("yahoo", symbol, started, resp.status_code)
+                if resp.status_code not in RETRY_STATUS:
+                    resp.raise_for_status()      # 4xx: not worth retrying
+                    return resp.json()
+                error = requests.HTTPError(f"{symbol}: HTTP {resp.status_code}")
+
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+
+        raise error
+
+
+def _parse_chart(payload, symbol, interval):
+    result = (payload.get("chart", {}).get("result") or [None])[0]
+    if not result or not result.get("timestamp"):
+        return None
+
+    bars = result["indicators"]["quote"][0]
+    df = pd.DataFrame({
+        col: bars.get(col) for col in ("open", "high", "low", "close", "volume")
+    })
+    adj = result["indicators"].get("adjclose")
+    df["adjclose"] = adj[0]["adjclose"] if adj else df["close"]
+
+    dates = pd.to_datetime(result["timestamp"], unit="s")
+    if interval.endswith(("d", "wk", "mo")):
+        dates = dates.normalize()
+    df.index = pd.MultiIndex.from_arrays([[symbol] * len(df), dates], names=["symbol", "date"])
+    # the live bar can repeat the last daily timestamp
+    return df[~df.index.duplicated(keep="last")]
+
+
+YAHOO_CHART = YahooChartClient(YAHOO_BASE_URL) if YAHOO_BASE_URL else None
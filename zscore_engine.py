@@ -0,0 +1,265 @@
+# zscore_engine.py
+import numpy as np
+import pandas as pd
+
+# Trading days in the default rolling window and before a z-score is reported
+DEFAULT_WINDOW = 252
+DEFAULT_MIN_PERIODS = 20
+
+
+# Most recent rows that can be undone and replayed when a bar is revised
+# (a partial last bar that later completes); older revisions reprocess all
+REVISION_DEPTH = 5
+
+
+def first_revision(seen, df):
+    """
+    First timestamp among the rows already processed (`seen`) that `df`
+    changed, removed, or preceded with an inserted row; None if the
+    overlap is unchanged.
+    """
+    if seen is None or seen.empty or df.empty or df.index[0] > seen.index[-1]:
+        return None
+    lo = max(seen.index[0], df.index[0])
+    old = seen[seen.index >= lo]
+    new = df[(df.index >= lo) & (df.index <= seen.index[-1])]
+
+    candidates = []
+    common = old.index.intersection(new.index)
+    if len(common):
+        a = old.loc[common].to_numpy(dtype="float64")
+        b = new.loc[common].to_numpy(dtype="float64")
+        changed = ~((a == b) | (np.isnan(a) & np.isnan(b))).all(axis=1)
+        if changed.any():
+            candidates.append(common[np.argmax(changed)])
+    moved = old.index.symmetric_difference(new.index)
+    if len(moved):
+        candidates.append(moved[0])
+    return min(candidates) if candidates else None
+
+
+# ----------------------------------------------------------
+# 1) BASE: incremental update over new rows only
+# ----------------------------------------------------------
+class _StreamingZScore:
+    """
+    Keeps per-column state so that update(df) only processes rows newer
+    than the last one seen. Returns z-scores aligned to df.index.
+
+    Processed rows are kept next to their z-scores: when df revises one
+    of the last REVISION_DEPTH rows, the state is rewound to just before
+    it and the rows from there on are processed again; an older revision
+    (e.g. re-adjusted history) reprocesses df from the start.
+    """
+
+    def __init__(self, min_periods=DEFAULT_MIN_PERIODS):
+        self.min_periods = min_periods
+        self.reset()
+
+    def reset(self):
+        self.columns = None
+        self.last_index = None
+        self.history = None
+        self.seen = None
+
+    def update(self, df):
+        df = df.sort_index()
+        if self.columns is None or list(df.columns) != self.columns:
+            self.reset()
+            self.columns = list(df.columns)
+            self._init_state(len(self.columns))
+
+        revised = first_revision(self.seen, df)
+        if revised is not None:
+            self._revise(revised)
+
+        new = df if self.last_index is None else df[df.index > self.last_index]
+        if not new.empty:
+            x = new.to_numpy(dtype="float64")
+            z = pd.DataFrame(self._step(x), index=new.index, columns=self.columns)
+            self.history = z if self.history is None else pd.concat([self.history, z])
+            self.seen = new if self.seen is None else pd.concat([self.seen, new])
+            self.last_index = new.index[-1]
+
+        if self.history is None:
+            return pd.DataFrame(index=df.index, columns=df.columns, dtype="float64")
+
+        # bounded memory: keep only the span the caller still holds
+        self.history = self.history[self.history.index >= df.index[0]]
+        self.seen = self.seen[self.seen.index >= df.index[0]]
+        return self.history.reindex(df.index)
+
+    def _revise(self, since):
+        """Forget rows from `since` on, so update() processes them again."""
+        keep = self.seen.index < since
+        if not keep.any() or not self._rewind(int((~keep).sum())):
+            columns = self.columns
+            self.reset()
+            self.columns = columns
+            self._init_state(len(columns))
+            return
+        self.seen = self.seen[keep]
+        self.history = self.history[self.history.index < since]
+        self.last_index = self.seen.index[-1]
+
+    def push(self, rows):
+        """
+        Z-scores for new rows only (array, one column per series), continuing
+        from the current state. Nothing is kept beyond the engine state.
+        """
+        x = np.atleast_2d(np.asarray(rows, dtype="float64"))
+        if self.columns is None:
+            self.columns = list(range(x.shape[1]))
+            self._init_state(x.shape[1])
+        return self._step(x)
+
+    def _init_state(self, n_cols):
+        raise NotImplementedError
+
+    def _step(self, x):
+        raise NotImplementedError
+
+    def _rewind(self, rows):
+        """Undo the last `rows` processed rows; False if that is not possible."""
+        raise NotImplementedError
+
+
+# ----------------------------------------------------------
+# 2) ROLLING WINDOW (running sums over a fixed tail)
+# ----------------------------------------------------------
+class RollingZScore(_StreamingZScore):
+    """
+    Rolling-window z-score (ddof=1), NaN-aware per column.
+
+    State is the last `window` rows plus running sum / sum of squares /
+    count, so a batch of m new rows costs O(m) vectorized work.
+    Values are shifted by a per-column constant for numerical stability.
+    """
+
+    RESYNC_EVERY = 100   # windows; recompute sums from the tail to stop drift
+
+    def __init__(self, window=DEFAULT_WINDOW, min_periods=DEFAULT_MIN_PERIODS):
+        self.window = window
+        super().__init__(min(min_periods, window))
+
+    def _init_state(self, n_cols):
+        self.shift = None
+        # window rows plus REVISION_DEPTH older ones, so revised rows can be undone
+        self.tail = np.full((self.window + REVISION_DEPTH, n_cols), np.nan)
+        self.s = np.zeros(n_cols)
+        self.q = np.zeros(n_cols)
+        self.n = np.zeros(n_cols)
+        self._since_resync = 0
+
+    def _step(self, x):
+        if self.shift is None:
+            first = pd.DataFrame(x).bfill().to_numpy()[0]
+            self.shift = np.nan_to_num(first)
+        x = x - self.shift
+        m = len(x)
+
+        # rows entering and leaving the window, in order
+        ext = np.vstack([self.tail, x])
+        start = len(self.tail) - self.window
+        enter, leave = x, ext[start:start + m]
+
+        valid_in, valid_out = ~np.isnan(enter), ~np.isnan(leave)
+        xin, xout = np.where(valid_in, enter, 0.0), np.where(valid_out, leave, 0.0)
+
+        s = self.s + np.cumsum(xin, axis=0) - np.cumsum(xout, axis=0)
+        q = self.q + np.cumsum(xin ** 2, axis=0) - np.cumsum(xout ** 2, axis=0)
+        n = self.n + np.cumsum(valid_in, axis=0) - np.cumsum(valid_out, axis=0)
+
+        z = _zscore_from_sums(enter, s, q, n, self.min_periods)
+
+        self.tail = ext[-(self.window + REVISION_DEPTH):]
+        self.s, self.q, self.n = s[-1], q[-1], n[-1]
+
+        self._since_resync += m
+        if self._since_resync >= self.RESYNC_EVERY * self.window:
+            self._resync()
+        return z
+
+    def _rewind(self, rows):
+        if rows > REVISION_DEPTH:
+            return False
+        if rows:
+            pad = np.full((rows, self.tail.shape[1]), np.nan)
+            self.tail = np.vstack([pad, self.tail[:-rows]])
+            self._resync()
+        return True
+
+    def _resync(self):
+        window = self.tail[-self.window:]
+        valid = ~np.isnan(window)
+        t = np.where(valid, window, 0.0)
+        self.s, self.q, self.n = t.sum(axis=0), (t ** 2).sum(axis=0), valid.sum(axis=0)
+        self._since_resync = 0
+
+
+def _zscore_from_sums(x, s, q, n, min_periods):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s / n
+        var = (q - s * mean) / (n - 1)
+        std = np.sqrt(np.maximum(var, 0.0))
+        z = (x - mean) / std
+    z[(n < min_periods) | (std == 0) | np.isnan(x)] = np.nan
+    return z
+
+
+# ----------------------------------------------------------
+# 3) EXPONENTIALLY WEIGHTED (Welford-style recursion)
+# ----------------------------------------------------------
+class EWMZScore(_StreamingZScore):
+    """
+    Exponentially weighted z-score. State is one mean and one variance
+    per column; each new row is an O(columns) vectorized update.
+    """
+
+    def __init__(self, halflife=63, min_periods=DEFAULT_MIN_PERIODS):
+        self.alpha = 1 - np.exp(np.log(0.5) / halflife)
+        super().__init__(min_periods)
+
+    def _init_state(self, n_cols):
+        self.mean = np.full(n_cols, np.nan)
+        self.var = np.zeros(n_cols)
+        self.n = np.zeros(n_cols)
+        self.saved = []             # state before each of the last REVISION_DEPTH rows
+
+    def _step(self, x):
+        a = self.alpha
+        z = np.full(x.shape, np.nan)
+
+        for i, row in enumerate(x):
+            self.saved = self.saved[-(REVISION_DEPTH - 1):] + [(self.mean.copy(), self.var, self.n.copy())]
+            ok = ~np.isnan(row)
+            first = ok & np.isnan(self.mean)
+            self.mean[first] = row[first]
+
+            delta = np.where(ok, row - self.mean, 0.0)
+            self.mean = np.where(ok, self.mean + a * delta, self.mean)
+            self.var = np.where(ok, (1 - a) * (self.var + a * delta ** 2), self.var)
+            self.n += ok
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                zi = (row - self.mean) / np.sqrt(self.var)
+            zi[(self.n < self.min_periods) | (self.var == 0) | ~ok] = np.nan
+            z[i] = zi
+
+        return z
+
+    def _rewind(self, rows):
+        if rows > len(self.saved):
+            return False
+        if rows:
+            self.mean, self.var, self.n = self.saved[-rows]
+            self.saved = self.saved[:-rows]
+        return True
+
+
+def make_engine(window=None, halflife=None, min_periods=DEFAULT_MIN_PERIODS):
+    if window is not None and halflife is not None:
+        raise ValueError("Pass either window or halflife, not both")
+    if halflife is not None:
+        return EWMZScore(halflife, min_periods)
+    return RollingZScore(window or DEFAULT_WINDOW, min_periods)